@@ -1,86 +1,216 @@
-from game_manager.game import Game
+from game_manager.jobs import get_job_runner
+from game_manager.registry import GameRegistry
+from game_manager.store import MemoryGameStore, SQLiteGameStore, VersionConflict
+from models.metrics import metrics
+from models.scheduler import DeadlineExceeded, SchedulerOverloaded
 from players_manager.ai_player import AIPlayer
 from players_manager.human_player import HumanPlayer
-from flask import Flask, request, jsonify
+from profiler import RequestProfiler
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
+from functools import lru_cache, wraps
 from io import BytesIO
 import qrcode
+import qrcode.image.svg
 import base64
+import hashlib
+import hmac
+import json
+import os
+import time
 
 app = Flask(__name__)
 CORS(app)
 
-game = None  # Global game instance
+# Set GAME_STORE_PATH to log games to SQLite, so they survive restarts and
+# every worker process can serve them.
+GAME_STORE_PATH = os.getenv("GAME_STORE_PATH")
+
+games = GameRegistry(
+    max_games=int(os.getenv("MAX_GAMES", 1000)),
+    idle_ttl=int(os.getenv("GAME_IDLE_TTL", 3600)),
+    store=SQLiteGameStore(
+        GAME_STORE_PATH, snapshot_every=int(os.getenv("GAME_SNAPSHOT_EVERY", 100))
+    ) if GAME_STORE_PATH else MemoryGameStore(),
+)
+
+jobs = get_job_runner()
+
+# Bearer token of the admin endpoints, which are off without it.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Set PROFILING to profile requests sent by an admin with `X-Profile: 1`, plus
+# a PROFILE_SAMPLE_RATE fraction of all requests. PROFILE_ROUTES limits it to
+# some endpoints, e.g. `game_state,game_qr`. Without PROFILING no route is
+# wrapped at all.
+profiler = RequestProfiler(
+    sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+) if os.getenv("PROFILING", "").lower() in ("1", "true", "yes") else None
+PROFILE_ROUTES = os.getenv("PROFILE_ROUTES")
+
+
+SSE_KEEPALIVE = 15  # Seconds between keep-alive comments on idle event streams
+STORE_POLL_INTERVAL = 1  # Seconds between checks of the store for other workers' events, per game
+JOB_MAX_WAIT = 30  # Longest `wait` accepted by /jobs/<job_id>
+
+QR_MIMETYPES = {
+    "json": "application/json",
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+
+def with_game(view=None, locked=True):
+    """
+    Resolve the `game_id` of the request and run the view under that game's lock.
+
+    Read-only views use `@with_game(locked=False)` and run without the lock,
+    so they never wait behind a request changing the game.
+    """
+    if view is None:
+        return lambda view: with_game(view, locked)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True) or {}
+        game_id = request.args.get('game_id') or data.get('game_id')
+        game = games.get_game(game_id)
+        if not game:
+            return jsonify({"error": "Game session not found."}), 404
+        if not locked:
+            return view(game, *args, **kwargs)
+        with game.lock:
+            return view(game, *args, **kwargs)
+    return wrapper
+
+
+@app.errorhandler(SchedulerOverloaded)
+def llm_overloaded(e):
+    response = jsonify({"error": f"The game server is overloaded. {e}"})
+    response.headers["Retry-After"] = "5"
+    return response, 503
+
+@app.errorhandler(DeadlineExceeded)
+def llm_deadline_exceeded(e):
+    return jsonify({"error": f"The language model did not answer in time. {e}"}), 504
+
+@app.errorhandler(VersionConflict)
+def game_version_conflict(e):
+    # The local copy missed a concurrent update, reload it on the next request.
+    games.forget(e.game_id)
+    response = jsonify({"error": "The game was updated by another request, try again."})
+    response.headers["Retry-After"] = "1"
+    return response, 409
+
+
+def submit_job(game, kind, operation):
+    """
+    Run a slow game operation in the background and answer 202 with its job.
+
+    The `Idempotency-Key` header (or `idempotency_key` field) makes a retried
+    request return the job of the first one instead of running it again.
+    """
+    data = request.get_json(silent=True) or {}
+    key = request.headers.get('Idempotency-Key') or data.get('idempotency_key')
+    if profiler is not None and g.get("profiling"):
+        operation = profiler.wrap(f"{request.endpoint} (job)", operation)
+    job, _ = jobs.submit(game, kind, operation, key=key)
+    response = jsonify(job.to_dict())
+    response.headers["Location"] = f"/jobs/{job.id}?game_id={game.id}"
+    return response, 202
 
 @app.route('/create_game', methods=['POST'])
 def create_game():
     """
     Create a new game.
     """
-    global game  # Declare that we're using the global 'game' variable
-
     data = request.get_json() or {}
     min_players = data.get('min_players', 2)
     answer_timeout = data.get('answer_timeout', 60)
-
-    game = Game(min_players=min_players, answer_timeout=answer_timeout)
+    ai_concurrency = data.get('ai_concurrency', 8)
+    prefetch_questions = data.get('prefetch_questions', 2)
+    ai_answer_mode = data.get('ai_answer_mode', 'parallel')
+    batch_ranking = data.get('batch_ranking', False)
+    enforce_deadline = data.get('enforce_deadline', True)
+    auto_advance = data.get('auto_advance', False)
+    speculative_answers = data.get('speculative_answers', True)
+
+    game = games.create_game(
+        min_players=min_players,
+        answer_timeout=answer_timeout,
+        ai_concurrency=ai_concurrency,
+        prefetch_questions=prefetch_questions,
+        ai_answer_mode=ai_answer_mode,
+        batch_ranking=batch_ranking,
+        enforce_deadline=enforce_deadline,
+        auto_advance=auto_advance,
+        speculative_answers=speculative_answers,
+    )
 
     return jsonify({
+        "game_id": game.id,
         "min_players": min_players,
         "answer_timeout": answer_timeout,
         "message": "Game session created successfully."
     })
 
 @app.route("/start_game", methods=["POST"])
-def start_game():
+@with_game
+def start_game(game):
     """
     Start the game session.
     """
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
-
     if game.status == "waiting":
         game.start_game()
         return jsonify({"message": "Game started successfully."})
     else:
         return jsonify({"error": "Game is already in progress or finished."}), 400
 
-@app.route("/next_turn", methods=["POST"])
-def next_turn():
+@app.route("/end_game", methods=["POST"])
+@with_game
+def end_game(game):
     """
-    Move to the next turn in the game.
+    End the game session and release its resources.
     """
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
+    games.remove_game(game.id)
+    return jsonify({"message": "Game ended successfully."})
 
+@app.route("/next_turn", methods=["POST"])
+@with_game
+def next_turn(game):
+    """
+    Move to the next turn in the game, as a background job.
+    """
     if game.status != "in_progress":
         return jsonify({"error": "Game is not in progress."}), 400
 
-    game.play_turn()
-    return jsonify({"message": "Moved to the next turn."})
+    def operation():
+        game.play_turn()
+        return {"turn": game.turn, "question": game.current_question}
+
+    return submit_job(game, "next_turn", operation)
 
 @app.route('/play_turn_ai', methods=['POST'])
-def play_turn_ai():
+@with_game
+def play_turn_ai(game):
     """
-    AI plays the turn.
+    AI plays the turn, as a background job.
     """
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
-
     if game.status != "in_progress":
         return jsonify({"error": "Game is not in progress."}), 400
 
-    game.play_turn_ai()
-    return jsonify({"message": "AI played the turn."})
+    def operation():
+        game.play_turn_ai()
+        return {"turn": game.turn, "answers": len(game.answers)}
+
+    return submit_job(game, "play_turn_ai", operation)
 
 @app.route('/active_players', methods=['GET'])
-def active_players():
+@with_game(locked=False)
+def active_players(game):
     """
     Get the list of active players in a game session.
     """
-    if not game:
-        return jsonify({"error": "Game not found."}), 404
-
     active_players = game.get_active_players()
     return jsonify({
         "active_player_ids": active_players["ids"],
@@ -89,14 +219,12 @@ def active_players():
     })
 
 @app.route('/add_player', methods=['POST'])
-def add_player():
+@with_game
+def add_player(game):
     data = request.get_json()
     player_name = data.get('player_name')
     is_ai = data.get('is_ai', False)
 
-    if not game:
-        return jsonify({"error": "Game not found."}), 404
-
     player = AIPlayer(player_name) if is_ai else HumanPlayer(player_name)
     player_id = game.add_player(player, is_ai)
 
@@ -106,7 +234,8 @@ def add_player():
     })
 
 @app.route('/submit_answer', methods=['POST'])
-def submit_answer():
+@with_game
+def submit_answer(game):
     if game.status != "in_progress":
         return jsonify({"error": "Game is not in progress."}), 400
 
@@ -114,14 +243,16 @@ def submit_answer():
     player_id = data.get('player_id')
     answer = data.get('answer')
 
+    if not isinstance(answer, str):
+        return jsonify({"error": "The answer must be a string."}), 400
+
     player = game.find_player(player_id)
     if not player:
         return jsonify({"error": "Player not found."}), 404
-    if player["is_ai"] or player["eliminated"]:
+    if player.is_ai or player.eliminated:
         return jsonify({"error": "This player cannot submit answers."}), 400
-
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
+    if game.answers_closed:
+        return jsonify({"error": "Answers are closed for this turn."}), 409
 
     try:
         game.submit_answer(player_id, answer)
@@ -130,22 +261,85 @@ def submit_answer():
         return jsonify({"error": f"Failed to submit answer. Message {e}"}), 400
 
 @app.route('/game_state', methods=['GET'])
-def game_state():
+@with_game(locked=False)
+def game_state(game):
     """
     Get the current state of a game session.
+
+    With `since=<version>` only the events after that version are returned,
+    or 304 if nothing changed. The full state is returned when the version is
+    too old to be resumed.
     """
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
+    since = request.args.get('since', type=int)
+    if since is not None:
+        if since == game.events.version:
+            return Response(status=304)
+        events = game.events.since(since)
+        if events is not None:
+            return jsonify({"version": game.events.version, "events": events})
 
     state = game.get_state()
     return jsonify(state)
 
-@app.route('/game_qr', methods=['GET'])
-def game_qr():
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
+@app.route('/game_events', methods=['GET'])
+@with_game(locked=False)
+def game_events(game):
+    """
+    Stream the events of a game session as Server-Sent Events.
 
-    join_url = f"http://localhost:5000/join_game"
+    Clients resume from the `Last-Event-ID` header or the `since` parameter.
+    A `state` event with the full state is sent when resuming is impossible.
+    """
+    version = request.headers.get('Last-Event-ID', type=int)
+    if version is None:
+        version = request.args.get('since', game.events.version, type=int)
+
+    persistent = games.store.persistent
+    poll = STORE_POLL_INTERVAL if persistent else SSE_KEEPALIVE
+
+    def stream(version):
+        yield "retry: 3000\n\n"
+        last_sent = time.monotonic()
+        while True:
+            events = game.events.wait(version, timeout=poll)
+            if events == [] and persistent:
+                # Other workers' events, read from the store once per game.
+                if not game.refresh(STORE_POLL_INTERVAL):
+                    return
+                events = game.events.since(version)
+            if events is None:
+                state = game.get_state()
+                version = state["version"]
+                yield f"id: {version}\nevent: state\ndata: {json.dumps(state)}\n\n"
+                continue
+            if not events:
+                if game.status == "finished":
+                    return
+                if not persistent or time.monotonic() - last_sent >= SSE_KEEPALIVE:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+                continue
+            last_sent = time.monotonic()
+            for event in events:
+                yield f"id: {event['version']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            version = events[-1]["version"]
+            if events[-1]["type"] == "game_ended":
+                return
+
+    return Response(
+        stream(version),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@lru_cache(maxsize=1024)
+def render_qr(join_url, image_format="json"):
+    """
+    Render the QR code of a join URL once, later calls hit the cache.
+
+    Returns:
+        tuple: The response body and its ETag.
+    """
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -154,40 +348,91 @@ def game_qr():
     )
     qr.add_data(join_url)
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
 
     buffered = BytesIO()
-    img.save(buffered, format="PNG")
-    img_base64 = base64.b64encode(buffered.getvalue()).decode('utf-8')
+    if image_format == "svg":
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+        img.save(buffered)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+        img.save(buffered, format="PNG")
+    body = buffered.getvalue()
+
+    if image_format == "json":
+        img_base64 = base64.b64encode(body).decode('utf-8')
+        body = json.dumps({
+            "qr_code": f"data:image/png;base64,{img_base64}",
+            "join_url": join_url
+        }).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
 
-    qr_data_uri = f"data:image/png;base64,{img_base64}"
-    return jsonify({
-        "qr_code": qr_data_uri,
-        "join_url": join_url
-    })
+@app.route('/game_qr', methods=['GET'])
+@with_game(locked=False)
+def game_qr(game):
+    """
+    Get the QR code to join a game.
+
+    `format` selects `json` (default, base64 data URI), `png` or `svg`.
+    """
+    image_format = request.args.get('format', 'json')
+    if image_format not in QR_MIMETYPES:
+        return jsonify({"error": f"Unsupported format {image_format}."}), 400
+
+    join_url = f"http://localhost:5000/join_game?game_id={game.id}"
+    body, etag = render_qr(join_url, image_format)
+
+    response = Response(body, mimetype=QR_MIMETYPES[image_format])
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
 
 @app.route('/rank_answers', methods=['POST'])
-def rank_answers():
+@with_game
+def rank_answers(game):
     """
-    Rank the answers of players.
+    Rank the answers of players, as a background job whose result is the ranking.
     """
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
-
     if game.status != "in_progress":
         return jsonify({"error": "Game is not in progress."}), 400
 
-    ranking = game.ranking()
-    return jsonify(ranking)
+    return submit_job(game, "rank_answers", game.ranking)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Get the status and result of a background job.
+
+    With `wait=<seconds>` the request blocks until the job finishes or the
+    time runs out. Jobs run by other workers are found through `game_id`,
+    the game only keeps their summary and the result of a ranking is read
+    back from the last ranking of the game.
+    """
+    wait = min(request.args.get('wait', 0, type=float), JOB_MAX_WAIT)
+    job = jobs.get(job_id)
+    if job is not None:
+        if wait > 0:
+            job.wait(wait)
+        return jsonify(job.to_dict())
+
+    game = games.get_game(request.args.get('game_id'))
+    if game:
+        finished = game.jobs.get(job_id)
+        if finished:
+            job = {**finished, "game_id": game.id, "result": None}
+            ranking = game.last_ranking
+            if (finished["kind"] == "rank_answers" and ranking is not None
+                    and finished.get("summary", {}).get("turn") == ranking["turn"]):
+                job["result"] = ranking
+            return jsonify(job)
+    return jsonify({"error": "Job not found."}), 404
 
 @app.route('/eliminate_player', methods=['POST'])
-def eliminate_player():
+@with_game
+def eliminate_player(game):
     """
     Eliminate a player from the game.
     """
-    if not game:
-        return jsonify({"error": "Game session not found."}), 404
-
     data = request.get_json()
     player_id = data.get('player_id')
 
@@ -197,5 +442,61 @@ def eliminate_player():
     game.eliminate_player(player_id)
     return jsonify({"message": "Player eliminated successfully."})
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """
+    Expose LLM call and game step metrics in the Prometheus text format.
+    """
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+def is_admin():
+    auth = request.headers.get('Authorization', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(auth.encode(), f"Bearer {ADMIN_TOKEN}".encode())
+
+
+@app.route('/admin/profiles', methods=['GET', 'DELETE'])
+def admin_profiles():
+    """
+    Serve the profiled stacks of this worker, admin only.
+
+    By default every endpoint is returned in the folded stack format, ready
+    for flamegraph.pl or speedscope. `endpoint=<name>` keeps one endpoint,
+    `format=json` returns how many requests and stacks each endpoint has.
+    DELETE clears the stacks.
+    """
+    if not is_admin():
+        return jsonify({"error": "Admin token required."}), 403
+    if profiler is None:
+        return jsonify({"error": "Profiling is disabled."}), 404
+    if request.method == 'DELETE':
+        profiler.reset()
+        return jsonify({"message": "Profiles cleared."})
+    if request.args.get('format') == 'json':
+        return jsonify(profiler.summary())
+    return Response(profiler.render(request.args.get('endpoint')), mimetype="text/plain")
+
+
+def profile_view(endpoint, view):
+    """
+    Profile the requests to a view that ask for it or are sampled.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Reading the environ is about twice as fast as request.headers.
+        if not ((request.environ.get('HTTP_X_PROFILE') == '1' and is_admin()) or profiler.sampled()):
+            return view(*args, **kwargs)
+        g.profiling = True
+        return profiler.run(endpoint, view, *args, **kwargs)
+    return wrapper
+
+
+if profiler is not None:
+    routes = set(PROFILE_ROUTES.split(",")) if PROFILE_ROUTES else None
+    for endpoint, view in list(app.view_functions.items()):
+        if endpoint in ("static", "admin_profiles") or (routes and endpoint not in routes):
+            continue
+        app.view_functions[endpoint] = profile_view(endpoint, view)
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,21 @@
+"""
+Benchmarks of the optimizations made to the game server, re-runnable offline
+with the fake LLM of `simulation`. Each module is run on its own:
+
+    python -m benchmarks.ai_answers       Turn latency of sequential vs concurrent AI answers
+    python -m benchmarks.game_store       Answer throughput and restore time of the game stores
+    python -m benchmarks.llm_client       TTFT and latency of plain, streamed and async LLM calls
+    python -m benchmarks.local_scorer     Cost of the local scorer from 10 to 10k answers
+    python -m benchmarks.metrics_overhead Cost of recording metrics per LLM call
+    python -m benchmarks.players          Answer and ranking bookkeeping in rooms of 5,000 players
+    python -m benchmarks.profiling_overhead Cost of the request profiler when off, idle and on
+    python -m benchmarks.qr               Requests per second of /game_qr with and without the cache
+    python -m benchmarks.question_index   Lookup cost of the question index up to 20k questions
+    python -m benchmarks.question_prefetch Turn start latency with and without prefetched questions
+    python -m benchmarks.rank_parsing     Extra rank calls caused by messy outputs
+    python -m benchmarks.rooms            Throughput of hundreds of concurrent rooms
+    python -m benchmarks.sharded_ranking  Single prompt vs sharded ranking of large rooms
+    python -m benchmarks.startup          Import time of the app and cost of creating games
+    python -m benchmarks.subscribers      Requests of spectators polling vs subscribing to events
+    python -m benchmarks.turn_deadlines   Lateness of turn deadlines with thousands of games
+"""
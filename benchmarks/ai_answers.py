@@ -0,0 +1,70 @@
+"""
+Time how long AI players take to answer a turn, one after another versus
+concurrently, against a fake LLM with a fixed latency.
+
+    python -m benchmarks.ai_answers --latency 0.5 --players 1 2 4 8 16
+
+Answering one after another takes the sum of the calls, concurrently it
+takes about the slowest one.
+"""
+import argparse
+import time
+
+
+def time_turn(players, ai_concurrency, turns):
+    """
+    Play `turns` turns of a game with `players` AI players.
+
+    Returns:
+        float: Mean seconds `play_turn_ai` took per turn.
+    """
+    from game_manager.game import Game
+    from players_manager.ai_player import AIPlayer
+
+    game = Game(
+        ai_concurrency=ai_concurrency,
+        enforce_deadline=False,
+        speculative_answers=False,
+        prefetch_questions=0,
+        answer_timeout=600,
+    )
+    for i in range(players):
+        game.add_player(AIPlayer(f"ai-{i}"), is_ai=True)
+    game.start_game()
+    total = 0
+    for _ in range(turns):
+        game.play_turn()
+        started = time.perf_counter()
+        game.play_turn_ai()
+        total += time.perf_counter() - started
+    game.end_game()
+    return total / turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn latency of sequential vs concurrent AI answers.")
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="AI players per game, one run each.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean LLM latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative spread of the LLM latency.")
+    parser.add_argument("--turns", type=int, default=3, help="Turns timed per run.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    install_fake_llm(latency=args.latency, jitter=args.jitter, seed=args.seed)
+
+    rows = []
+    for players in args.players:
+        sequential = time_turn(players, 1, args.turns)
+        concurrent = time_turn(players, players, args.turns)
+        rows.append((players, sequential, concurrent))
+
+    print(f"{'players':>8}{'sequential s':>14}{'concurrent s':>14}{'speedup':>9}")
+    for players, sequential, concurrent in rows:
+        print(f"{players:>8}{sequential:>14.3f}{concurrent:>14.3f}{sequential / concurrent:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
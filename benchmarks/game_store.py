@@ -0,0 +1,160 @@
+"""
+Measure what logging games to a store costs: the throughput of
+/submit_answer with games in memory and in SQLite, and how long a game of
+10k events takes to restore from its snapshot or by replaying every event.
+
+    python -m benchmarks.game_store --submits 5000 --threads 8 --events 10000
+
+Requests go through the Flask test client against the fake LLM. The SQLite
+files live in a temporary directory removed at the end.
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation.harness import percentile
+
+
+def run_job(client, endpoint, game_id):
+    job = client.post(endpoint, json={"game_id": game_id}).get_json()
+    while job["status"] not in ("done", "failed"):
+        job = client.get(f"/jobs/{job['job_id']}", query_string={"game_id": game_id, "wait": 10}).get_json()
+    return job
+
+
+def time_submits(app, games, store, submits, threads, players):
+    """
+    Open a turn of a game logged to `store` and submit `submits` answers to
+    it from `threads` threads.
+
+    Returns:
+        dict: Requests per second and latency percentiles, in milliseconds.
+    """
+    games.store = store
+    client = app.test_client()
+    game_id = client.post("/create_game", json={
+        "prefetch_questions": 0, "answer_timeout": 3600, "speculative_answers": False,
+    }).get_json()["game_id"]
+    player_ids = [
+        client.post("/add_player", json={"game_id": game_id, "player_name": f"human-{i}"})
+        .get_json()["player_id"]
+        for i in range(players)
+    ]
+    client.post("/start_game", json={"game_id": game_id})
+    run_job(client, "/next_turn", game_id)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def submit(k):
+        thread_client = app.test_client()
+        for i in range(k, submits, threads):
+            payload = {"game_id": game_id, "player_id": player_ids[i % players], "answer": f"Câu trả lời {i}"}
+            started = time.perf_counter()
+            response = thread_client.post("/submit_answer", json=payload)
+            seconds = time.perf_counter() - started
+            if response.status_code != 200:
+                raise RuntimeError(response.get_json())
+            with lock:
+                latencies.append(seconds)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(submit, range(threads)))
+    elapsed = time.perf_counter() - started
+    games.remove_game(game_id)
+    return {
+        "requests_per_second": submits / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+    }
+
+
+def time_restore(store, events, restores, players=20):
+    """
+    Log a game of `events` events to `store`, then restore it `restores` times.
+
+    Returns:
+        tuple: Events written per second, and the seconds of each restore.
+    """
+    from game_manager.game import Game
+    from players_manager.human_player import HumanPlayer
+
+    game = Game(store=store, prefetch_questions=0)
+    ids = [game.add_player(HumanPlayer(f"human-{i}")) for i in range(players)]
+    started = time.perf_counter()
+    i = 0
+    while game.events.version < events:
+        game.submit_answer(ids[i % players], f"Câu trả lời {i}")
+        i += 1
+    written = i / (time.perf_counter() - started)
+
+    seconds = []
+    for _ in range(restores):
+        started = time.perf_counter()
+        restored = Game.restore(game.id, store)
+        seconds.append(time.perf_counter() - started)
+        if restored.answers != game.answers or restored.events.version != game.events.version:
+            raise RuntimeError("The restored game differs from the original.")
+        restored.release()
+    game.release()
+    return written, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of logging games to a store.")
+    parser.add_argument("--submits", type=int, default=5000, help="Answers submitted per store.")
+    parser.add_argument("--threads", type=int, default=8, help="Threads submitting answers.")
+    parser.add_argument("--players", type=int, default=50, help="Human players of the game.")
+    parser.add_argument("--events", type=int, default=10000, help="Events of the restored game.")
+    parser.add_argument("--restores", type=int, default=5, help="Restores of that game.")
+    parser.add_argument("--snapshot-every", type=int, default=100,
+                        help="Events between two snapshots of the SQLite store.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    install_fake_llm(latency=0)
+    from app import app, games
+    from game_manager.store import MemoryGameStore, SQLiteGameStore
+
+    with tempfile.TemporaryDirectory() as directory, \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        memory = games.store
+        submits = [
+            ("memory", time_submits(app, games, MemoryGameStore(), args.submits, args.threads, args.players)),
+            ("sqlite", time_submits(
+                app, games, SQLiteGameStore(os.path.join(directory, "submits.db"), args.snapshot_every),
+                args.submits, args.threads, args.players,
+            )),
+        ]
+        games.store = memory
+        restores = [
+            (f"snapshot every {args.snapshot_every}", *time_restore(
+                SQLiteGameStore(os.path.join(directory, "snapshots.db"), args.snapshot_every),
+                args.events, args.restores,
+            )),
+            ("replay only", *time_restore(
+                SQLiteGameStore(os.path.join(directory, "replay.db"), snapshot_every=0),
+                args.events, args.restores,
+            )),
+        ]
+
+    print(f"/submit_answer, {args.threads} threads, {args.submits} answers")
+    print(f"{'store':<8}{'requests/s':>12}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, r in submits:
+        print(f"{name:<8}{r['requests_per_second']:>12.0f}{r['p50']:>9.2f}{r['p99']:>9.2f}")
+    print(f"\nRestoring a game of {args.events} events, {args.restores} times")
+    print(f"{'sqlite':<20}{'events written/s':>18}{'restore median ms':>19}{'restore max ms':>16}")
+    for name, written, seconds in restores:
+        print(f"{name:<20}{written:>18.0f}{statistics.median(seconds) * 1000:>19.1f}"
+              f"{max(seconds) * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Time the LLM clients against a local OpenAI-compatible stand-in server:
+time to first token and total latency of plain, streamed and async pooled
+calls, and the cost of a fresh client per call.
+
+    python -m benchmarks.llm_client --latency 0.3 --chunk-delay 0.05 --concurrency 50
+
+The server is simulation/fake_server.py, run in process. It waits
+`--latency` before the first chunk and `--chunk-delay` between chunks, so a
+streamed question shows its first characters well before the full reply.
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from simulation.harness import percentile
+
+MODEL_NAME = "fake-model"
+
+
+def start_server(latency, chunk_delay, seed=0):
+    """
+    Serve the fake LLM on a free local port.
+
+    Returns:
+        tuple: The server and its base URL.
+    """
+    from simulation.fake_llm import FakeCompletions
+    from simulation.fake_server import FakeServer, make_handler
+
+    completions = FakeCompletions(latency=latency, jitter=0, seed=seed)
+    server = FakeServer(("127.0.0.1", 0), make_handler(completions, chunk_delay))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def time_stream(chunks):
+    """
+    Consume a stream of text chunks.
+
+    Returns:
+        tuple: Seconds to the first chunk and to the end of the stream.
+    """
+    started = time.perf_counter()
+    first = None
+    for _ in chunks:
+        if first is None:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+
+def run_sync(calls, stream=False, fresh_client=False):
+    """
+    Ask `calls` questions one after another.
+
+    Returns:
+        tuple: Lists of the seconds to first token and total seconds.
+    """
+    from groq import Groq
+
+    from models import config
+    from models.groq_model import GroqModel
+    from prompts.admin import admin_ask
+
+    model = GroqModel(MODEL_NAME, system_prompt=admin_ask)
+    ttft, total = [], []
+    for _ in range(calls):
+        if fresh_client:
+            # Like before the shared client: a new client and connection per model.
+            model.client = Groq(api_key=config.GROQ_API_KEY, base_url=config.GROQ_BASE_URL, max_retries=0)
+        if stream:
+            first, seconds = time_stream(model.stream_plain_text("Hãy đặt một câu hỏi."))
+        else:
+            started = time.perf_counter()
+            model.generate_plain_text("Hãy đặt một câu hỏi.", use_cache=False)
+            first = seconds = time.perf_counter() - started
+        ttft.append(first)
+        total.append(seconds)
+    return ttft, total
+
+
+async def _run_async(calls):
+    from models.async_groq_model import AsyncGroqModel
+    from prompts.admin import admin_ask
+
+    model = AsyncGroqModel(MODEL_NAME, system_prompt=admin_ask)
+
+    async def call():
+        started = time.perf_counter()
+        first = None
+        async for _ in model.stream_plain_text("Hãy đặt một câu hỏi."):
+            if first is None:
+                first = time.perf_counter() - started
+        return first, time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(call() for _ in range(calls)))
+    return [r[0] for r in results], [r[1] for r in results], time.perf_counter() - started
+
+
+def run_async(calls):
+    """
+    Stream `calls` questions at once through the pooled async client.
+
+    Returns:
+        tuple: Lists of the seconds to first token and total seconds, and
+            the wall time of the whole batch.
+    """
+    return asyncio.run(_run_async(calls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the LLM clients against a local server.")
+    parser.add_argument("--calls", type=int, default=20, help="Sequential calls per sync mode.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Calls at once in async mode.")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds before the first chunk.")
+    parser.add_argument("--chunk-delay", type=float, default=0.05,
+                        help="Seconds between chunks of 8 characters.")
+    args = parser.parse_args()
+
+    from models import config
+    from models.clients import set_client
+
+    server, url = start_server(args.latency, args.chunk_delay)
+    config.GROQ_BASE_URL = url
+    config.GROQ_API_KEY = config.GROQ_API_KEY or "fake"
+    set_client(None, None)  # Built again on first use, against the local server
+
+    rows = [
+        ("sync, fresh client", *run_sync(args.calls, fresh_client=True)),
+        ("sync, shared client", *run_sync(args.calls)),
+        ("sync, streamed", *run_sync(args.calls, stream=True)),
+    ]
+    ttft, total, wall = run_async(args.concurrency)
+    rows.append((f"async x{args.concurrency}, streamed", ttft, total))
+    server.shutdown()
+
+    print(f"{'mode':<26}{'ttft p50 ms':>13}{'ttft p95 ms':>13}{'total p50 ms':>14}{'total p95 ms':>14}")
+    for name, ttft, total in rows:
+        print(f"{name:<26}{percentile(ttft, 50) * 1000:>13.1f}{percentile(ttft, 95) * 1000:>13.1f}"
+              f"{percentile(total, 50) * 1000:>14.1f}{percentile(total, 95) * 1000:>14.1f}")
+    print(f"\n{args.concurrency} async calls took {wall:.2f}s in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Time the local scorer on rooms from ten to ten thousand answers.
+
+    python -m benchmarks.local_scorer --answers 10 100 1000 10000 --repeat 5
+
+Answers are drawn from the canned answers of the fake LLM, with a few
+variations and some empty answers like those of players who skip a turn.
+The scorer should cost a few microseconds per answer whatever the room size.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from simulation.fake_llm import ANSWERS
+
+QUESTION = "Bạn sẽ làm gì nếu có một ngày nghỉ bất ngờ?"
+VARIATIONS = (
+    lambda answer: answer,
+    lambda answer: answer.lower().rstrip("."),
+    lambda answer: f"{answer} haha",
+    lambda answer: f"ko bít nữa, chắc là {answer.lower()}",
+    lambda answer: "",
+)
+
+
+def make_room(size, rng):
+    return [rng.choice(VARIATIONS)(rng.choice(ANSWERS)) for _ in range(size)]
+
+
+def time_scores(scorer, answers, repeat):
+    """
+    Score `answers` `repeat` times.
+
+    Returns:
+        list: Seconds of each run.
+    """
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        scorer.score(QUESTION, answers)
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of the local scorer by room size.")
+    parser.add_argument("--answers", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="Answers per room, one run each.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per room size.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the rooms.")
+    args = parser.parse_args()
+
+    from players_manager.local_scorer import LocalScorer
+
+    scorer = LocalScorer()
+    rng = random.Random(args.seed)
+    scorer.score(QUESTION, make_room(10, rng))  # Warm up NumPy
+
+    print(f"{'answers':>8}{'median ms':>11}{'min ms':>9}{'us per answer':>15}")
+    for size in args.answers:
+        seconds = time_scores(scorer, make_room(size, rng), args.repeat)
+        median = statistics.median(seconds)
+        print(f"{size:>8}{median * 1000:>11.2f}{min(seconds) * 1000:>9.2f}{median / size * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Time what recording metrics adds to every LLM call: `record_llm_call` and
+`span` on their own, with and without the JSON log exporter, and a whole
+model call against a zero-latency fake LLM with metrics on and off.
+
+    python -m benchmarks.metrics_overhead --calls 100000 --threads 8
+
+The fake LLM answers at once, so the model call is the cheapest it can be
+and the share taken by metrics is the largest it can be.
+"""
+import argparse
+import contextlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+USAGE = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+LABELS = {"role": "ai-player", "game_id": "benchmark"}
+
+
+def per_call(operation, calls, threads=1):
+    """
+    Run `operation` `calls` times over `threads` threads.
+
+    Returns:
+        float: Microseconds of wall time per call.
+    """
+    def run(count):
+        for _ in range(count):
+            operation()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, [calls // threads] * threads))
+    return (time.perf_counter() - started) / (calls // threads * threads) * 1e6
+
+
+def model_call(model):
+    return lambda: model.generate_plain_text("Câu hỏi", use_cache=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of recording LLM metrics.")
+    parser.add_argument("--calls", type=int, default=100000, help="Calls per metrics measurement.")
+    parser.add_argument("--model-calls", type=int, default=5000, help="Calls per model measurement.")
+    parser.add_argument("--threads", type=int, default=8, help="Threads of the concurrent runs.")
+    args = parser.parse_args()
+
+    from models.groq_model import GroqModel
+    from models.metrics import JsonLogExporter, Metrics, metrics
+    from simulation.fake_llm import install_fake_llm
+
+    def record(target):
+        return lambda: target.record_llm_call(LABELS, 0.2, queue_time=0.01, usage=USAGE)
+
+    def span(target):
+        def operation():
+            with target.span("game_step", step="play_turn"):
+                pass
+        return operation
+
+    plain = Metrics()
+    exported = Metrics()
+    exporter = JsonLogExporter("benchmarks.metrics_overhead")
+    exporter.logger.addHandler(logging.FileHandler(os.devnull))
+    exporter.logger.setLevel(logging.INFO)
+    exporter.logger.propagate = False
+    exported.exporters.append(exporter)
+
+    rows = [
+        ("record_llm_call", per_call(record(plain), args.calls),
+         per_call(record(plain), args.calls, args.threads)),
+        ("record_llm_call + JSON log", per_call(record(exported), args.calls // 10),
+         per_call(record(exported), args.calls // 10, args.threads)),
+        ("span", per_call(span(plain), args.calls), per_call(span(plain), args.calls, args.threads)),
+    ]
+
+    install_fake_llm(latency=0, jitter=0)
+    model = GroqModel("fake-model", labels={"role": "ai-player"})
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with_metrics = (per_call(model_call(model), args.model_calls),
+                        per_call(model_call(model), args.model_calls, args.threads))
+        record_llm_call = metrics.record_llm_call
+        metrics.record_llm_call = lambda *args, **kwargs: None
+        try:
+            without = (per_call(model_call(model), args.model_calls),
+                       per_call(model_call(model), args.model_calls, args.threads))
+        finally:
+            metrics.record_llm_call = record_llm_call
+    rows += [("model call, metrics off", *without), ("model call, metrics on", *with_metrics)]
+
+    print(f"{'operation':<30}{'1 thread us':>13}{f'{args.threads} threads us':>15}")
+    for name, single, threaded in rows:
+        print(f"{name:<30}{single:>13.2f}{threaded:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
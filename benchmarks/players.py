@@ -0,0 +1,129 @@
+"""
+Time the player bookkeeping of answering and ranking in rooms of up to
+5,000 players, with the old list of player dicts and with PlayerTable.
+
+    python -m benchmarks.players --players 100 1000 5000
+
+`ListScanGame` below is the bookkeeping of the game before PlayerTable:
+every lookup scans the list of players and ranking checks who answered
+with a scan of the answers. Both sides rank with the same instant stand-in
+for the admin, so only the bookkeeping is timed. Submitting an answer
+should cost the same whatever the room size, and ranking the same per
+player.
+"""
+import argparse
+import contextlib
+import os
+import time
+import uuid
+
+
+class ListScanGame:
+    def __init__(self):
+        """
+        Players and answers of a game the way they were kept before
+        PlayerTable, without the parts that do not touch them.
+        """
+        self.players = []  # List of player dicts
+        self.answers = []  # List of {player_id, answer}
+
+    def add_player(self, name):
+        player_id = str(uuid.uuid4())
+        self.players.append({"id": player_id, "name": name, "is_ai": False, "eliminated": False})
+        return player_id
+
+    def find_player(self, player_id):
+        for player in self.players:
+            if player["id"] == player_id:
+                return player
+        return None
+
+    def submit_answer(self, player_id, answer):
+        player = self.find_player(player_id)
+        if player and not player["eliminated"]:
+            self.answers.append({"player_id": player_id, "answer": answer})
+            return True
+        return False
+
+    def eliminate_player(self, player_id):
+        player = self.find_player(player_id)
+        if player:
+            player["eliminated"] = True
+
+    def ranking(self, rank):
+        players = [dict(player) for player in self.players]
+        player_answered = [item["player_id"] for item in self.answers]
+        answer_dict = {answer["player_id"]: answer["answer"] for answer in self.answers}
+        for idx, player in enumerate(players):
+            if player["eliminated"]:
+                continue
+            if player["id"] not in player_answered or answer_dict[player["id"]] == "":
+                players[idx]["eliminated"] = True
+                self.eliminate_player(player["id"])
+        all_ids = [answer["player_id"] for answer in self.answers]
+        all_answers = [answer["answer"] for answer in self.answers]
+        all_ranks = rank(None, all_answers)
+        return {
+            "scores": [
+                {"player_id": all_ids[i], "answer": all_answers[i], "rank": all_ranks[i]}
+                for i in range(len(all_ids))
+            ],
+            "players": players,
+        }
+
+
+def instant_rank(question, answers, **kwargs):
+    return [50] * len(answers)
+
+
+def time_list_scan(size):
+    game = ListScanGame()
+    ids = [game.add_player(f"human-{i}") for i in range(size)]
+    started = time.perf_counter()
+    for i, player_id in enumerate(ids):
+        game.submit_answer(player_id, f"Câu trả lời {i}")
+    submit = (time.perf_counter() - started) / size
+    started = time.perf_counter()
+    game.ranking(instant_rank)
+    return submit, time.perf_counter() - started
+
+
+def time_player_table(size):
+    from game_manager.game import Game
+    from players_manager.human_player import HumanPlayer
+
+    game = Game(prefetch_questions=0, enforce_deadline=False, speculative_answers=False)
+    game.admin.rank = instant_rank
+    game.admin.local_scores = lambda question, answers: None
+    ids = [game.add_player(HumanPlayer(f"human-{i}")) for i in range(size)]
+    started = time.perf_counter()
+    for i, player_id in enumerate(ids):
+        game.submit_answer(player_id, f"Câu trả lời {i}")
+    submit = (time.perf_counter() - started) / size
+    started = time.perf_counter()
+    game.ranking()
+    seconds = time.perf_counter() - started
+    game.end_game()
+    return submit, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Player bookkeeping cost by room size.")
+    parser.add_argument("--players", type=int, nargs="+", default=[100, 1000, 5000],
+                        help="Players per room, one run each.")
+    args = parser.parse_args()
+
+    rows = []
+    # The game logs every answer, which would drown the report.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for size in args.players:
+            rows.append((size, "list scan", *time_list_scan(size)))
+            rows.append((size, "PlayerTable", *time_player_table(size)))
+
+    print(f"{'players':>8}  {'bookkeeping':<13}{'submit us':>11}{'rank ms':>10}{'rank us/player':>16}")
+    for size, name, submit, rank in rows:
+        print(f"{size:>8}  {name:<13}{submit * 1e6:>11.1f}{rank * 1000:>10.1f}{rank / size * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Time what the request profiler adds to a request: nothing when PROFILING is
+unset, the sampling check when it is set but the request is not profiled,
+and cProfile itself when the request is profiled.
+
+    python -m benchmarks.profiling_overhead --requests 2000
+
+Requests are /game_state calls through the Flask test client. The profiled
+view is wired in place the way app.py does at import with PROFILING set, so
+every mode runs in one process. The check in front of the view is also
+timed on its own, inside a request context.
+"""
+import argparse
+import contextlib
+import os
+import time
+import timeit
+
+ADMIN_TOKEN = "benchmark"
+
+
+def time_requests(client, game_id, requests, headers=None):
+    """
+    Returns:
+        float: Microseconds per request.
+    """
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get("/game_state", query_string={"game_id": game_id}, headers=headers)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of the request profiler.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode.")
+    parser.add_argument("--calls", type=int, default=200000, help="Calls of the bare check.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    install_fake_llm(latency=0)
+    import app as app_module
+    from profiler import RequestProfiler
+
+    app = app_module.app
+    client = app.test_client()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game_id = client.post("/create_game", json={"prefetch_questions": 0}).get_json()["game_id"]
+        for i in range(8):
+            client.post("/add_player", json={"game_id": game_id, "player_name": f"human-{i}"})
+
+    plain_view = app.view_functions["game_state"]
+    time_requests(client, game_id, args.requests)  # Warm up
+    off = time_requests(client, game_id, args.requests)
+
+    app_module.profiler = RequestProfiler(sample_rate=0)
+    app_module.ADMIN_TOKEN = ADMIN_TOKEN
+    app.view_functions["game_state"] = app_module.profile_view("game_state", plain_view)
+    try:
+        unprofiled = time_requests(client, game_id, args.requests)
+        profiled = time_requests(client, game_id, args.requests // 10, headers={
+            "X-Profile": "1", "Authorization": f"Bearer {ADMIN_TOKEN}",
+        })
+        with app.test_request_context("/game_state"):
+            def view():
+                pass
+
+            bare = timeit.timeit(view, number=args.calls) / args.calls * 1e9
+            guarded = app_module.profile_view("game_state", view)
+            check = timeit.timeit(guarded, number=args.calls) / args.calls * 1e9
+    finally:
+        app.view_functions["game_state"] = plain_view
+        app_module.profiler = None
+
+    print(f"{'mode':<34}{'us per request':>16}")
+    print(f"{'PROFILING unset':<34}{off:>16.1f}")
+    print(f"{'PROFILING set, not profiled':<34}{unprofiled:>16.1f}")
+    print(f"{'PROFILING set, profiled':<34}{profiled:>16.1f}")
+    print(f"\nCheck in front of a view: {check:.0f}ns per call, {bare:.0f}ns for a bare call")
+
+
+if __name__ == "__main__":
+    main()
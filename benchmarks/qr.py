@@ -0,0 +1,80 @@
+"""
+Serve /game_qr over and over through the Flask test client and compare
+requests per second with the rendered QR code cache cleared before every
+request, with the cache, and with conditional requests answered by 304.
+
+    python -m benchmarks.qr --games 50 --requests 2000
+
+Lobby screens poll the QR code of their game, so the same few images are
+asked for again and again.
+"""
+import argparse
+import contextlib
+import os
+import time
+
+
+def run(client, game_ids, requests, image_format, mode):
+    """
+    Ask for the QR codes of `game_ids` in turn, `requests` times.
+
+    Args:
+        mode (str): `uncached` clears the render cache before every request,
+            `cached` keeps it, `conditional` sends the ETag of the last reply.
+
+    Returns:
+        tuple: Requests per second, 304 replies and bytes of the bodies.
+    """
+    from app import render_qr
+
+    etags = {}
+    not_modified = body_bytes = 0
+    render_qr.cache_clear()
+    started = time.perf_counter()
+    for i in range(requests):
+        game_id = game_ids[i % len(game_ids)]
+        headers = {}
+        if mode == "uncached":
+            render_qr.cache_clear()
+        elif mode == "conditional" and game_id in etags:
+            headers["If-None-Match"] = f'"{etags[game_id]}"'
+        response = client.get(f"/game_qr?game_id={game_id}&format={image_format}", headers=headers)
+        if response.status_code == 304:
+            not_modified += 1
+        else:
+            etags[game_id] = response.get_etag()[0]
+        body_bytes += len(response.data)
+    seconds = time.perf_counter() - started
+    return requests / seconds, not_modified, body_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests per second of /game_qr.")
+    parser.add_argument("--games", type=int, default=50, help="Games whose QR code is asked for.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode and format.")
+    parser.add_argument("--formats", nargs="+", default=["json", "png", "svg"], help="Formats to time.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    install_fake_llm(latency=0)
+    from app import app
+
+    client = app.test_client()
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game_ids = [
+            client.post("/create_game", json={"prefetch_questions": 0}).get_json()["game_id"]
+            for _ in range(args.games)
+        ]
+        for image_format in args.formats:
+            for mode in ("uncached", "cached", "conditional"):
+                rows.append((image_format, mode, *run(client, game_ids, args.requests, image_format, mode)))
+
+    print(f"{'format':<8}{'mode':<13}{'requests/s':>12}{'304s':>7}{'body KB':>10}")
+    for image_format, mode, per_second, not_modified, body_bytes in rows:
+        print(f"{image_format:<8}{mode:<13}{per_second:>12.0f}{not_modified:>7}{body_bytes / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
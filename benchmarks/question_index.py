@@ -0,0 +1,116 @@
+"""
+Time lookups and inserts in the question index as it fills up, against a
+scan comparing every stored signature, and check what it catches.
+
+    python -m benchmarks.question_index --sizes 1000 10000 20000 --lookups 500
+
+Questions are made up of common Vietnamese syllables, so that they share
+many words and n-grams like the questions of a real game do. Lookups are
+half new questions and half near-duplicates of stored ones, with a changed
+ending, punctuation or case.
+"""
+import argparse
+import random
+import time
+
+SYLLABLES = (
+    "bạn", "sẽ", "làm", "gì", "khi", "trời", "mưa", "ngày", "nghỉ", "người", "yêu", "của", "bố", "mẹ",
+    "thân", "sếp", "em", "bé", "cảm", "thấy", "thế", "nào", "nghĩ", "nói", "ăn", "mặc", "đi", "đâu",
+    "bị", "lạc", "đường", "lúc", "nửa", "đêm", "trong", "kỳ", "hè", "trúng", "xổ", "số", "mất", "điện",
+    "trên", "hoang", "đảo", "buổi", "phỏng", "vấn", "gặp", "nổi", "tiếng", "vào", "Tết", "quên", "ví",
+    "ở", "sân", "bay", "đám", "cưới", "đầu", "tiên", "một", "mình", "cùng", "bè", "lần", "sáng", "sớm",
+    "sau", "giờ", "đang", "vội", "con", "mèo", "chó", "biển", "núi", "phố", "chợ", "trường", "học",
+    "thầy", "cô", "bài", "hát", "phim", "sách", "món", "quà", "tiền", "điện", "thoại", "xe", "máy",
+    "nhà", "bếp", "bánh", "mì", "phở", "cà", "phê", "trà", "sữa", "kem", "hoa", "cây", "gió", "nắng",
+)
+
+
+def make_question(rng):
+    words = rng.choices(SYLLABLES, k=rng.randint(8, 14))
+    return " ".join(words).capitalize() + "?"
+
+
+def near_duplicate(question, rng):
+    variants = (
+        lambda q: q.upper(),
+        lambda q: q.rstrip("?") + " vậy?",
+        lambda q: q.replace(" ", "  ").rstrip("?") + "!",
+        lambda q: "Theo bạn, " + q[0].lower() + q[1:],
+    )
+    return rng.choice(variants)(question)
+
+
+def scan_duplicate(index, question):
+    """
+    Compare a question with every stored signature, as an index without LSH
+    buckets would.
+    """
+    from players_manager.question_index import normalize_question
+
+    signature = index._signature(normalize_question(question))
+    return any(
+        sum(1 for x, y in zip(signature, other) if x == y) / index.num_perm >= index.threshold
+        for other in index._signatures
+    )
+
+
+def per_call(operation, items):
+    started = time.perf_counter()
+    results = [operation(item) for item in items]
+    return (time.perf_counter() - started) / len(items), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of the question index as it fills up.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 20000],
+                        help="Stored questions, one run each.")
+    parser.add_argument("--lookups", type=int, default=500, help="Lookups per size.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the questions.")
+    args = parser.parse_args()
+
+    from players_manager.question_index import QuestionIndex
+
+    rng = random.Random(args.seed)
+    index = QuestionIndex()
+    stored = []
+    rows = []
+    for size in sorted(args.sizes):
+        insert_seconds = 0.0
+        inserts = 0
+        while len(index) < size:
+            question = make_question(rng)
+            started = time.perf_counter()
+            if index.add(question):
+                stored.append(question)
+            insert_seconds += time.perf_counter() - started
+            inserts += 1
+
+        known = set(stored)
+        fresh = []
+        while len(fresh) < args.lookups // 2:
+            question = make_question(rng)
+            if question not in known:
+                fresh.append(question)
+        variants = [near_duplicate(rng.choice(stored), rng) for _ in range(args.lookups - len(fresh))]
+        lookups = fresh + variants
+
+        lookup, found = per_call(index.is_duplicate, lookups)
+        scan, _ = per_call(lambda q: scan_duplicate(index, q), lookups[:max(1, args.lookups // 10)])
+        rows.append({
+            "size": size,
+            "insert": insert_seconds / inserts,
+            "lookup": lookup,
+            "scan": scan,
+            "caught": sum(found[len(fresh):]) / len(variants),
+            "false": sum(found[:len(fresh)]) / len(fresh),
+        })
+
+    print(f"{'stored':>7}{'insert ms':>11}{'lookup ms':>11}{'scan ms':>10}"
+          f"{'variants caught':>17}{'new flagged':>13}")
+    for r in rows:
+        print(f"{r['size']:>7}{r['insert'] * 1000:>11.2f}{r['lookup'] * 1000:>11.2f}"
+              f"{r['scan'] * 1000:>10.1f}{r['caught']:>17.0%}{r['false']:>13.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Time how long starting a turn takes with and without questions prefetched,
+against a slow fake LLM.
+
+    python -m benchmarks.question_prefetch --games 20 --turns 5 --latency 1.0 --think-time 2.0
+
+Every game plays a few turns, with `--think-time` seconds between them as
+players answer. Without prefetching each `play_turn` waits for the admin to
+ask a question, with it the question was generated during the previous turn.
+"""
+import argparse
+import contextlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation.harness import percentile
+
+
+def play(prefetch_questions, turns, think_time):
+    """
+    Play `turns` turns of a game, waiting `think_time` between them.
+
+    Returns:
+        list: Seconds each `play_turn` took.
+    """
+    from game_manager.game import Game
+    from players_manager.ai_player import AIPlayer
+    from players_manager.human_player import HumanPlayer
+
+    game = Game(
+        prefetch_questions=prefetch_questions,
+        enforce_deadline=False,
+        speculative_answers=False,
+    )
+    game.add_player(HumanPlayer("human"))
+    game.add_player(AIPlayer("ai"), is_ai=True)
+    game.start_game()
+    seconds = []
+    for _ in range(turns):
+        time.sleep(think_time)
+        started = time.perf_counter()
+        game.play_turn()
+        seconds.append(time.perf_counter() - started)
+    game.end_game()
+    return seconds
+
+
+def wait_idle(llm, quiet):
+    """
+    Wait until the fake LLM got no call for `quiet` seconds, so questions
+    still being prefetched for ended games do not print over the report.
+    """
+    calls = None
+    while calls != llm.completions.calls:
+        calls = llm.completions.calls
+        time.sleep(quiet)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn start latency with and without prefetching.")
+    parser.add_argument("--games", type=int, default=20, help="Games played at once per mode.")
+    parser.add_argument("--turns", type=int, default=5, help="Turns per game.")
+    parser.add_argument("--latency", type=float, default=1.0, help="Mean LLM latency in seconds.")
+    parser.add_argument("--think-time", type=float, default=2.0,
+                        help="Seconds between two turns, while players answer.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    llm = install_fake_llm(latency=args.latency, seed=args.seed)
+
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for prefetch_questions in (0, 2):
+            calls = llm.completions.calls
+            with ThreadPoolExecutor(max_workers=args.games) as executor:
+                runs = list(executor.map(
+                    lambda _: play(prefetch_questions, args.turns, args.think_time), range(args.games)
+                ))
+            seconds = [s for run in runs for s in run]
+            rows.append((prefetch_questions, seconds, llm.completions.calls - calls))
+            wait_idle(llm, args.latency * 2)
+
+    print(f"{'prefetch':>9}{'turns':>7}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'LLM calls':>11}")
+    for prefetch_questions, seconds, calls in rows:
+        print(f"{prefetch_questions:>9}{len(seconds):>7}{percentile(seconds, 50) * 1000:>9.0f}"
+              f"{percentile(seconds, 95) * 1000:>9.0f}{max(seconds) * 1000:>9.0f}{calls:>11}")
+
+
+if __name__ == "__main__":
+    main()
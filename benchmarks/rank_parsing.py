@@ -0,0 +1,152 @@
+"""
+Count the extra LLM calls messy rank outputs cost, before and after the
+tolerant score parser.
+
+    python -m benchmarks.rank_parsing --rankings 500 --messiness 0.3
+
+The corpus below holds outputs the rank model really produces. The old
+parser ran `ast.literal_eval` on the whole output and re-sent the whole room
+on any failure. The new one re-sends only the answers it found no score for.
+With `--rankings` the admin also ranks rooms against the fake LLM, to count
+the calls per ranking end to end.
+"""
+import argparse
+import ast
+import random
+import time
+
+from players_manager.score_parser import extract_scores
+
+# (output, scores it holds), every output scores three answers.
+CORPUS = [
+    ('{"scores": [80, 20, 55]}', [80, 20, 55]),
+    ('[80, 20, 55]', [80, 20, 55]),
+    ('Đây là kết quả đánh giá:\n```json\n{"scores": [80, 20, 55]}\n```', [80, 20, 55]),
+    ('```\n[80, 20, 55]\n```', [80, 20, 55]),
+    ("Kết quả: {'scores': [80, 20, 55]}", [80, 20, 55]),
+    ('{"scores": [80, 20, 55,]}', [80, 20, 55]),
+    ('{"1": 80, "2": 20, "3": 55}', [80, 20, 55]),
+    ('{"scores": ["80", "20%", "55"]}', [80, 20, 55]),
+    ("Đáp án 1: 80\nĐáp án 2: 20\nĐáp án 3: 55", [80, 20, 55]),
+    ("Đáp án 1: 80%\nĐáp án 2: 20%\nĐáp án 3: 55%", [80, 20, 55]),
+    ("Đáp án 1: 80,5\nĐáp án 2: 20\nĐáp án 3: 55", [80.5, 20, 55]),
+    ("1. 80\n2. 20\n3. 55", [80, 20, 55]),
+    ("1) 85.5\n2) 20.5\n3) 55", [85.5, 20.5, 55]),
+    ("Answer #1 - 80, Answer #2 - 20, Answer #3 - 55", [80, 20, 55]),
+    ("The scores are 85.5, 20 and 55.25", [85.5, 20, 55.25]),
+    ("80 20 55", [80, 20, 55]),
+    ('{"scores": [80, 20]}', [80, 20, None]),
+    ('{"scores": [80, 120, 55]}', [80, None, 55]),
+    ("Tôi không thể đánh giá các câu trả lời này.", [None, None, None]),
+    ("Scores: 80/100, 20/100, 55/100", [80, 20, 55]),
+]
+
+
+def old_parse(output, expected):
+    """
+    Parser of the admin before `extract_scores`, None when it had to re-rank.
+    """
+    try:
+        scores = ast.literal_eval(output)
+    except Exception:
+        return None
+    if not isinstance(scores, list) or len(scores) != expected:
+        return None
+    return scores
+
+
+def run_corpus(repeat=1000):
+    """
+    Parse the corpus with both parsers.
+
+    Returns:
+        dict: Extra calls and re-sent answers of each parser, the scores the
+            new parser got wrong and its parsing time per output.
+    """
+    report = {
+        "outputs": len(CORPUS),
+        "old": {"extra_calls": 0, "resent_answers": 0},
+        "new": {"extra_calls": 0, "resent_answers": 0, "wrong_scores": 0},
+        "failures": [],
+    }
+    for output, expected in CORPUS:
+        if old_parse(output, len(expected)) is None:
+            report["old"]["extra_calls"] += 1
+            report["old"]["resent_answers"] += len(expected)
+        scores = extract_scores(output, len(expected))
+        missing = scores.count(None)
+        report["new"]["extra_calls"] += bool(missing)
+        report["new"]["resent_answers"] += missing
+        wrong = sum(s is not None and s != e for s, e in zip(scores, expected))
+        report["new"]["wrong_scores"] += wrong
+        if scores != expected:
+            report["failures"].append({"output": output, "scores": scores, "expected": expected})
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for output, expected in CORPUS:
+            extract_scores(output, len(expected))
+    report["parse_us"] = round((time.perf_counter() - started) / (repeat * len(CORPUS)) * 1e6, 2)
+    return report
+
+
+def run_rankings(rankings, answers, messiness, seed=0):
+    """
+    Rank `rankings` rooms against the fake LLM.
+
+    Returns:
+        dict: LLM calls per ranking and answers that fell back to local scores.
+    """
+    from simulation.fake_llm import ANSWERS, install_fake_llm
+
+    client = install_fake_llm(latency=0, jitter=0, messiness=messiness, seed=seed)
+    from players_manager.admin import Admin
+
+    admin = Admin(local_weight=0)
+    rng = random.Random(seed)
+    fallbacks = 0
+    for _ in range(rankings):
+        admin.rank("Bạn thường làm gì vào cuối tuần?", [rng.choice(ANSWERS) for _ in range(answers)])
+        fallbacks += admin.rank_fallbacks
+    completions = client.completions
+    return {
+        "rankings": rankings,
+        "messy_outputs": completions.messy,
+        "calls_per_ranking": round(completions.calls / rankings, 3),
+        "extra_calls_per_ranking": round(completions.calls / rankings - 1, 3),
+        "fallbacks": fallbacks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extra LLM calls caused by messy rank outputs.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Times the corpus is parsed for timing.")
+    parser.add_argument("--rankings", type=int, default=0,
+                        help="Rooms ranked against the fake LLM, 0 to only parse the corpus.")
+    parser.add_argument("--answers", type=int, default=6, help="Answers per ranked room.")
+    parser.add_argument("--messiness", type=float, default=0.3,
+                        help="Probability a fake rank output is malformed.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM.")
+    args = parser.parse_args()
+
+    report = run_corpus(args.repeat)
+    print(f"{report['outputs']} messy outputs, {report['parse_us']}us to parse one")
+    print(f"{'parser':<8}{'extra calls':>13}{'re-sent answers':>17}")
+    for name in ("old", "new"):
+        print(f"{name:<8}{report[name]['extra_calls']:>13}{report[name]['resent_answers']:>17}")
+    print(f"Scores misread by the new parser: {report['new']['wrong_scores']}")
+    for failure in report["failures"]:
+        print(f"  {failure['output']!r}: {failure['scores']}, expected {failure['expected']}")
+
+    if args.rankings:
+        ranked = run_rankings(args.rankings, args.answers, args.messiness, args.seed)
+        print()
+        print(
+            f"{ranked['rankings']} rankings, {ranked['messy_outputs']} messy outputs: "
+            f"{ranked['calls_per_ranking']} calls per ranking "
+            f"({ranked['extra_calls_per_ranking']} extra), {ranked['fallbacks']} local fallbacks"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Play hundreds of rooms at once through the Flask test client and report how
+throughput grows with the number of rooms.
+
+    python -m benchmarks.rooms --rooms 1 10 100 300 --latency 0.2
+
+Each room is a full game played by the simulation harness, against the fake
+LLM. Rooms only share the registry, so requests per second should grow
+with the number of rooms while the latency of the cheap endpoints stays
+flat.
+"""
+import argparse
+import contextlib
+import os
+
+CHEAP_ENDPOINTS = ("/add_player", "/submit_answer", "/game_state", "/active_players")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of concurrent rooms.")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1, 10, 100, 300],
+                        help="Rooms played at once, one run each.")
+    parser.add_argument("--turns", type=int, default=2, help="Turns per room.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean LLM latency in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM and the players.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+    from simulation.harness import run_load
+
+    install_fake_llm(latency=args.latency, seed=args.seed)
+    from app import app
+
+    rows = []
+    # The games log every step, which would drown the report.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for rooms in args.rooms:
+            report = run_load(
+                app.test_client,
+                games=rooms,
+                concurrency=rooms,
+                turns=args.turns,
+                seed=args.seed,
+            )
+            cheap = [report["endpoints"][e]["p99_ms"] for e in CHEAP_ENDPOINTS if e in report["endpoints"]]
+            rows.append((rooms, report, max(cheap, default=0)))
+
+    print(f"{'rooms':>6}{'requests':>10}{'errors':>8}{'seconds':>9}{'requests/s':>12}"
+          f"{'turns/s':>9}{'cheap p99 ms':>14}")
+    for rooms, report, cheap_p99 in rows:
+        print(f"{rooms:>6}{report['requests']:>10}{report['errors']:>8}{report['seconds']:>9}"
+              f"{report['requests_per_second']:>12}{report['turns_per_second']:>9}{cheap_p99:>14}")
+
+
+if __name__ == "__main__":
+    main()
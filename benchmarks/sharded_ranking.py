@@ -0,0 +1,85 @@
+"""
+Rank rooms of growing size in one prompt and in parallel anchored shards,
+against a fake LLM whose latency grows with the prompt.
+
+    python -m benchmarks.sharded_ranking --rooms 16 50 100 300 --latency-per-token 0.001
+
+The single prompt is timed twice: with the fixed 128-token output budget
+the rank model had before sharding, which truncates the scores of large
+rooms, and with the budget sized to the room.
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from simulation.fake_llm import ANSWERS
+
+QUESTION = "Bạn sẽ làm gì nếu có một ngày nghỉ bất ngờ?"
+
+
+def make_room(size, rng):
+    return [f"{rng.choice(ANSWERS)} ({i})" for i in range(size)]
+
+
+def rank_room(llm, answers, shard_size, fixed_budget=False):
+    """
+    Rank one room with a fresh admin.
+
+    Returns:
+        dict: Seconds, LLM calls and answers left to the local scorer.
+    """
+    from players_manager.admin import Admin
+
+    admin = Admin(shard_size=shard_size)
+    if fixed_budget:
+        # The rank model before sharding, whatever the number of answers.
+        admin._rank_model_for = lambda count: admin.rank_model
+    calls = llm.completions.calls
+    started = time.perf_counter()
+    scores = admin.rank(QUESTION, answers)
+    return {
+        "seconds": time.perf_counter() - started,
+        "calls": llm.completions.calls - calls,
+        "fallbacks": admin.rank_fallbacks,
+        "scored": len(scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single prompt vs sharded ranking of large rooms.")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[16, 50, 100, 300],
+                        help="Answers per room, one run each.")
+    parser.add_argument("--shard-size", type=int, default=16, help="Answers per shard.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Base LLM latency in seconds.")
+    parser.add_argument("--latency-per-token", type=float, default=0.001,
+                        help="Extra LLM latency per prompt token, in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM and the rooms.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    llm = install_fake_llm(latency=args.latency, jitter=0.2, seed=args.seed,
+                           latency_per_token=args.latency_per_token)
+    rng = random.Random(args.seed)
+    modes = [
+        ("single, 128 tokens", 0, True),
+        ("single, sized", 0, False),
+        (f"sharded by {args.shard_size}", args.shard_size, False),
+    ]
+
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for size in args.rooms:
+            answers = make_room(size, rng)
+            for name, shard_size, fixed_budget in modes:
+                rows.append((size, name, rank_room(llm, answers, shard_size, fixed_budget)))
+
+    print(f"{'answers':>8}  {'mode':<20}{'seconds':>9}{'calls':>7}{'fallbacks':>11}")
+    for size, name, r in rows:
+        print(f"{size:>8}  {name:<20}{r['seconds']:>9.2f}{r['calls']:>7}{r['fallbacks']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Time how long the app takes to import and how long creating games with AI
+players takes, and check that neither calls the LLM.
+
+    python -m benchmarks.startup --imports 5 --games 1000 --ai-players 3
+
+The import is timed in a fresh interpreter each time, so module caches of
+earlier runs do not help. Games are created through the registry like
+/create_game does, with the fake LLM installed to count calls.
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import app
+print(time.perf_counter() - started, "groq" in sys.modules)
+"""
+
+
+def time_import(runs):
+    """
+    Import the app in `runs` fresh interpreters.
+
+    Returns:
+        tuple: Seconds of each import, and whether the groq package was
+            imported along with the app.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, GROQ_API_KEY=os.getenv("GROQ_API_KEY") or "fake")
+    seconds, groq_loaded = [], False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT], cwd=root, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        seconds.append(float(output[-2]))
+        groq_loaded = groq_loaded or output[-1] == "True"
+    return seconds, groq_loaded
+
+
+def create_games(count, ai_players):
+    """
+    Create `count` games with `ai_players` AI players each.
+
+    Returns:
+        float: Seconds it took.
+    """
+    from game_manager.registry import GameRegistry
+    from players_manager.ai_player import AIPlayer
+
+    registry = GameRegistry()
+    started = time.perf_counter()
+    for _ in range(count):
+        game = registry.create_game()
+        for i in range(ai_players):
+            game.add_player(AIPlayer(f"ai-{i}"), is_ai=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the app and cost of creating games.")
+    parser.add_argument("--imports", type=int, default=5, help="Fresh interpreters importing the app.")
+    parser.add_argument("--games", type=int, default=1000, help="Games to create.")
+    parser.add_argument("--ai-players", type=int, default=3, help="AI players per game.")
+    args = parser.parse_args()
+
+    imports, groq_loaded = time_import(args.imports)
+
+    from simulation.fake_llm import install_fake_llm
+
+    llm = install_fake_llm(latency=0)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        seconds = create_games(args.games, args.ai_players)
+
+    print(f"import app: median {statistics.median(imports) * 1000:.0f}ms, "
+          f"min {min(imports) * 1000:.0f}ms over {args.imports} runs, "
+          f"groq imported: {'yes' if groq_loaded else 'no'}")
+    print(f"{args.games} games with {args.ai_players} AI players: {seconds:.3f}s, "
+          f"{seconds / args.games * 1e6:.0f}us per game, LLM calls: {llm.completions.calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Watch one game with many spectators and compare what it costs the server
+when they poll the full state, poll for deltas with `since`, or subscribe
+to the Server-Sent Events of /game_events.
+
+    python -m benchmarks.subscribers --spectators 100 --interval 0.5
+
+The game is played by the simulation harness against the fake LLM, with
+humans who think for a while before answering. For each mode the report
+gives the requests and bytes the spectators cost, and how long after an
+event they saw it.
+"""
+import argparse
+import contextlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation.harness import GameSimulator, LatencyRecorder, percentile
+
+
+class Spectator:
+    def __init__(self, client, game_id, game):
+        """
+        Follow a game the way a spectator screen would, counting what it costs.
+
+        Args:
+            client: A Flask test client.
+            game_id: Id of the game to follow.
+            game: The game itself, only read to time the events seen by
+                spectators polling the full state.
+        """
+        self.client = client
+        self.game_id = game_id
+        self.game = game
+        self.requests = 0
+        self.bytes = 0
+        self.lags = []  # Seconds between an event and the spectator seeing it
+
+    def saw(self, events):
+        now = time.time()
+        self.lags.extend(now - event["time"] for event in events)
+
+    def poll_full(self, interval, done):
+        version = 0
+        while not done.is_set():
+            response = self.client.get("/game_state", query_string={"game_id": self.game_id})
+            self.requests += 1
+            self.bytes += len(response.data)
+            state = response.get_json()
+            if state["version"] != version:
+                self.saw(self.game.events.since(version) or [])
+                version = state["version"]
+            done.wait(interval)
+
+    def poll_since(self, interval, done):
+        version = 0
+        while not done.is_set():
+            response = self.client.get(
+                "/game_state", query_string={"game_id": self.game_id, "since": version}
+            )
+            self.requests += 1
+            self.bytes += len(response.data)
+            if response.status_code == 200:
+                data = response.get_json()
+                self.saw(data.get("events", []))
+                version = data["version"]
+            done.wait(interval)
+
+    def subscribe(self, interval, done):
+        response = self.client.get(
+            "/game_events", query_string={"game_id": self.game_id, "since": 0}, buffered=False
+        )
+        self.requests += 1
+        buffer = ""
+        for chunk in response.response:
+            text = chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+            self.bytes += len(text.encode("utf-8"))
+            buffer += text
+            *messages, buffer = buffer.split("\n\n")
+            now = time.time()
+            for message in messages:
+                for line in message.split("\n"):
+                    if line.startswith("data: "):
+                        self.lags.append(now - json.loads(line[6:])["time"])
+        response.close()
+
+
+def watch(app, mode, spectators, interval, turns, think_time, seed):
+    """
+    Play one game while `spectators` follow it in `mode`.
+
+    Returns:
+        dict: Requests, bytes and event lag of the spectators.
+    """
+    from app import games
+
+    simulator = GameSimulator(
+        app.test_client(), LatencyRecorder(), humans=2, ai_players=3, turns=turns,
+        skip_rate=0, think_time=think_time, seed=seed,
+    )
+    player = threading.Thread(target=simulator.play)
+    player.start()
+    while simulator.game_id is None:
+        time.sleep(0.01)
+    game = games.get_game(simulator.game_id)
+
+    done = threading.Event()
+    watchers = [Spectator(app.test_client(), simulator.game_id, game) for _ in range(spectators)]
+    run = {"full": Spectator.poll_full, "since": Spectator.poll_since, "sse": Spectator.subscribe}[mode]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=spectators) as executor:
+        futures = [executor.submit(run, watcher, interval, done) for watcher in watchers]
+        player.join()
+        done.set()
+        for future in futures:
+            future.result()
+    seconds = time.perf_counter() - started
+
+    lags = [lag for watcher in watchers for lag in watcher.lags]
+    requests = sum(watcher.requests for watcher in watchers)
+    return {
+        "mode": mode,
+        "seconds": seconds,
+        "requests": requests,
+        "requests_per_second": requests / seconds,
+        "kilobytes": sum(watcher.bytes for watcher in watchers) / 1024,
+        "lag_p50": percentile(lags, 50),
+        "lag_p95": percentile(lags, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of spectators polling vs subscribing.")
+    parser.add_argument("--spectators", type=int, default=100, help="Spectators following the game.")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between two polls.")
+    parser.add_argument("--turns", type=int, default=2, help="Turns of the game.")
+    parser.add_argument("--think-time", type=float, default=2.0,
+                        help="Seconds the humans take to answer.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean LLM latency in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM and the players.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    install_fake_llm(latency=args.latency, seed=args.seed)
+    from app import app
+
+    # The games log every step, which would drown the report.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        rows = [
+            watch(app, mode, args.spectators, args.interval, args.turns, args.think_time, args.seed)
+            for mode in ("full", "since", "sse")
+        ]
+
+    def ms(seconds):
+        return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+    print(f"{'mode':<7}{'seconds':>9}{'requests':>10}{'requests/s':>12}{'KB':>9}"
+          f"{'lag p50 ms':>12}{'lag p95 ms':>12}")
+    for r in rows:
+        print(f"{r['mode']:<7}{r['seconds']:>9.1f}{r['requests']:>10}{r['requests_per_second']:>12.1f}"
+              f"{r['kilobytes']:>9.0f}{ms(r['lag_p50']):>12}{ms(r['lag_p95']):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Run thousands of games whose turns all close on their deadline at about the
+same time, and measure how late the turns close.
+
+    python -m benchmarks.turn_deadlines --games 100 1000 3000 --latency 0.5
+
+Every game has one human who never answers and some AI players, so each
+closed turn waits for AI answers and a ranking from the fake LLM. Lateness
+is the time between the deadline of a turn and its `turn_closed` event; it
+should stay around the tick of the timer wheel however many games run,
+since the slow work after closing runs as jobs. Scheduling and cancelling a
+timer is also timed on its own.
+"""
+import argparse
+import contextlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation.harness import percentile
+
+
+def start_games(count, ai_players, answer_timeout, workers=64):
+    """
+    Create `count` games and start their first turn.
+
+    Returns:
+        list: The games.
+    """
+    from game_manager.game import Game
+    from players_manager.ai_player import AIPlayer
+    from players_manager.human_player import HumanPlayer
+
+    def start(_):
+        game = Game(answer_timeout=answer_timeout, prefetch_questions=0)
+        game.add_player(HumanPlayer("human"))
+        for i in range(ai_players):
+            game.add_player(AIPlayer(f"ai-{i}"), is_ai=True)
+        game.start_game()
+        game.play_turn()
+        return game
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(start, range(count)))
+
+
+def turn_times(game):
+    """
+    Return when the first turn of a game started, closed and was ranked,
+    from its events.
+    """
+    times = {}
+    for event in game.events.since(0) or []:
+        if event["type"] in ("turn_started", "turn_closed", "ranking_ready"):
+            times.setdefault(event["type"], event["time"])
+    return times
+
+
+def run_games(count, ai_players, answer_timeout, timeout):
+    """
+    Start `count` games, wait for their turns to be ranked and measure how
+    late the turns closed.
+
+    Returns:
+        dict: Lateness of closing and ranking, in seconds.
+    """
+    games = start_games(count, ai_players, answer_timeout)
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if all(game.last_ranking is not None for game in games):
+            break
+        time.sleep(0.2)
+
+    closed, ranked = [], []
+    for game in games:
+        times = turn_times(game)
+        if "turn_started" not in times or "turn_closed" not in times:
+            continue
+        deadline = times["turn_started"] + answer_timeout
+        closed.append(times["turn_closed"] - deadline)
+        if "ranking_ready" in times:
+            ranked.append(times["ranking_ready"] - deadline)
+    for game in games:
+        game.end_game()
+    return {
+        "games": count,
+        "closed": len(closed),
+        "ranked": len(ranked),
+        "close_p50": percentile(closed, 50),
+        "close_p99": percentile(closed, 99),
+        "close_max": max(closed, default=None),
+        "rank_p50": percentile(ranked, 50),
+        "rank_p99": percentile(ranked, 99),
+    }
+
+
+def time_timers(count=100000):
+    """
+    Return the microseconds it takes to schedule then cancel one timer, with
+    `count` timers pending.
+    """
+    from game_manager.timer_wheel import TimerWheel
+
+    wheel = TimerWheel()
+    started = time.perf_counter()
+    timers = [wheel.schedule(3600, print) for _ in range(count)]
+    for timer in timers:
+        timer.cancel()
+    return round((time.perf_counter() - started) / count * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn deadline lateness with many games.")
+    parser.add_argument("--games", type=int, nargs="+", default=[100, 1000, 3000],
+                        help="Games running at once, one run each.")
+    parser.add_argument("--ai-players", type=int, default=2, help="AI players per game.")
+    parser.add_argument("--answer-timeout", type=int, default=5, help="Seconds a turn lasts.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean LLM latency in seconds.")
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="Seconds to wait for every turn to be ranked.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake LLM.")
+    args = parser.parse_args()
+
+    from simulation.fake_llm import install_fake_llm
+
+    install_fake_llm(latency=args.latency, seed=args.seed)
+
+    # The games log every step, which would drown the report.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        rows = [
+            run_games(count, args.ai_players, args.answer_timeout, args.timeout)
+            for count in args.games
+        ]
+
+    def ms(seconds):
+        return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+    print(f"{'games':>7}{'closed':>8}{'ranked':>8}{'close p50 ms':>14}{'close p99 ms':>14}"
+          f"{'close max ms':>14}{'rank p50 ms':>13}{'rank p99 ms':>13}")
+    for r in rows:
+        print(f"{r['games']:>7}{r['closed']:>8}{r['ranked']:>8}{ms(r['close_p50']):>14}"
+              f"{ms(r['close_p99']):>14}{ms(r['close_max']):>14}{ms(r['rank_p50']):>13}"
+              f"{ms(r['rank_p99']):>13}")
+    print(f"\nScheduling and cancelling a timer: {time_timers()}us")
+
+
+if __name__ == "__main__":
+    main()
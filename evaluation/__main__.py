@@ -0,0 +1,75 @@
+"""
+Evaluate prompt variants and AI personas offline: answer a set of questions
+as every persona, rank the AI answers with the real human ones, and report how
+often the humans are voted out.
+
+    python -m evaluation questions.jsonl --output results.jsonl --variants variants.json
+
+Each line of the input holds {"id": ..., "question": ..., "human_answers": [...]}.
+The variants file maps a name to {"ai_player": ..., "admin_rank": ...} system
+prompts. Results are appended to the output as units finish, and rerunning the
+same command resumes an interrupted run.
+
+The fake LLM backend is used unless `--live` is given. With `--cache` every
+response is recorded to a SQLite file and replayed on later runs.
+"""
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline evaluation of prompts and personas.")
+    parser.add_argument("input", help="JSONL file of questions and human answers.")
+    parser.add_argument("--output", required=True, help="JSONL file the results are appended to.")
+    parser.add_argument("--variants", default=None, help="JSON file of prompt variants.")
+    parser.add_argument("--personas", default=None,
+                        help="Comma-separated AI player styles, every style by default.")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes.")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Units submitted at once, twice the workers by default. LLM requests "
+                             "in flight are bounded by the smaller of this and --workers.")
+    parser.add_argument("--local-weight", type=float, default=0.0,
+                        help="Share of the local scorer in the admin's scores.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for repeatable runs.")
+    parser.add_argument("--live", action="store_true", help="Call the real LLM API.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean fake LLM latency in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Probability a fake LLM call fails with a 429 or 5xx.")
+    parser.add_argument("--messiness", type=float, default=0.0,
+                        help="Probability a fake LLM output is malformed.")
+    parser.add_argument("--cache", default=None, help="SQLite file recording and replaying responses.")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+    args = parser.parse_args()
+
+    from evaluation.runner import format_summary, load_items, load_variants, run_evaluation, summarize
+    from players_manager.ai_player import STYLES
+
+    fake = None if args.live else {
+        "latency": args.latency,
+        "failure_rate": args.failure_rate,
+        "messiness": args.messiness,
+    }
+    counts = run_evaluation(
+        load_items(args.input),
+        load_variants(args.variants),
+        args.personas.split(",") if args.personas else STYLES,
+        args.output,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        local_weight=args.local_weight,
+        seed=args.seed,
+        fake=fake,
+        cache=args.cache,
+    )
+    summary = summarize(args.output)
+    summary["run"] = counts
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(f"{counts['evaluated']} units evaluated, {counts['skipped']} already done, "
+              f"{counts['failed']} failed\n")
+        print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
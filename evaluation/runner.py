@@ -0,0 +1,279 @@
+import json
+import os
+import random
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from prompts.admin import admin_rank
+from prompts.ai_player import system_prompt as ai_player_prompt
+
+# Set in each worker process by `_init_worker`.
+_backend = {}
+
+
+def load_items(path):
+    """
+    Read the questions to evaluate from a JSONL file.
+
+    Each line holds a `question` and the `human_answers` real players gave
+    to it, and optionally an `id`, the line number by default.
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            items.append({
+                "id": str(item.get("id", number)),
+                "question": item["question"],
+                "human_answers": [a for a in item.get("human_answers", []) if a and a.strip()],
+            })
+    return items
+
+
+def load_variants(path=None):
+    """
+    Read the prompt variants to compare from a JSON file mapping a variant
+    name to its `ai_player` and `admin_rank` system prompts. Missing prompts
+    are the ones of the game, and without a file only those are evaluated.
+    """
+    variants = {"default": {}}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            variants = json.load(f)
+    return {
+        name: {
+            "ai_player": variant.get("ai_player", ai_player_prompt),
+            "admin_rank": variant.get("admin_rank", admin_rank),
+        }
+        for name, variant in variants.items()
+    }
+
+
+def done_units(path):
+    """
+    Return the (id, variant) pairs already evaluated in an output file, so an
+    interrupted run resumes where it stopped.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Line cut short by an interrupted run
+            done.add((record["id"], record["variant"]))
+    return done
+
+
+def _end_line(path):
+    """
+    Terminate a line cut short by an interrupted run, so the next record
+    starts on its own line.
+    """
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _init_worker(backend):
+    """
+    Point the LLM clients of a worker process at the chosen backend.
+    """
+    from models import config
+
+    if backend.get("cache"):
+        # Recorded responses never expire and are replayed across runs.
+        config.LLM_CACHE = True
+        config.LLM_CACHE_PATH = backend["cache"]
+        config.LLM_CACHE_TTL = 0
+        # Replays need the AI answers too, each persona answers once per unit.
+        config.LLM_CACHE_SKIP_ROLES = ()
+    _backend.update(backend)
+
+
+def evaluate_unit(item, variant_name, prompts, personas, local_weight, seed):
+    """
+    Answer one question as every persona with one prompt variant, and rank
+    the AI answers together with the human ones.
+
+    Returns:
+        dict: The output record of the unit.
+    """
+    from players_manager.admin import Admin
+    from players_manager.ai_player import AIPlayer
+
+    unit_seed = zlib.crc32(f"{seed}:{item['id']}:{variant_name}".encode())
+    if _backend.get("fake"):
+        from simulation.fake_llm import install_fake_llm
+
+        # Reseeded per unit, so results do not depend on the worker it ran on.
+        install_fake_llm(**_backend["fake"], seed=unit_seed)
+
+    started = time.perf_counter()
+    entries = [{"author": "human", "answer": answer} for answer in item["human_answers"]]
+    for persona in personas:
+        player = AIPlayer(f"ai-{persona}", system_prompt=prompts["ai_player"], style=persona)
+        answer = player.answer(item["question"])
+        if answer and answer.strip():
+            entries.append({"author": "ai", "persona": persona, "answer": answer})
+
+    # Answers are ranked in a shuffled order, like in a game.
+    random.Random(unit_seed).shuffle(entries)
+    # Unsharded, so the unit ranks in one call and its calls stay sequential.
+    admin = Admin(rank_system_prompt=prompts["admin_rank"], local_weight=local_weight, shard_size=0)
+    scores = admin.rank(item["question"], [entry["answer"] for entry in entries])
+    for entry, score in zip(entries, scores):
+        entry["score"] = score
+
+    # The lowest AI-likeness score is voted out, a human there is detected.
+    lowest = min(entries, key=lambda entry: entry["score"]) if entries else None
+    return {
+        "id": item["id"],
+        "variant": variant_name,
+        "question": item["question"],
+        "answers": entries,
+        "human_detected": lowest is not None and lowest["author"] == "human",
+        "local_fallbacks": admin.rank_fallbacks,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_evaluation(items, variants, personas, output, workers=4, max_in_flight=None,
+                   local_weight=0.0, seed=0, fake=None, cache=None):
+    """
+    Evaluate every question with every prompt variant in a process pool, and
+    append one JSON line per unit to `output` as soon as it is done.
+
+    Units already in `output` are skipped. Each unit makes its calls one
+    after another, ranking included since the admin does not shard it, so
+    at most `min(workers, max_in_flight)` requests are in flight: units
+    beyond `workers` wait in the pool's queue.
+
+    Args:
+        items: Questions and human answers, see `load_items`.
+        variants: Prompt variants, see `load_variants`.
+        personas: Styles of the AI players answering each question.
+        output: Path of the JSONL output file.
+        workers: Number of worker processes.
+        max_in_flight: Units submitted at once, twice `workers` by default.
+            Only `workers` of them run at a time.
+        local_weight: Share of the local scores in the admin's scores.
+        seed: Seed of the shuffling and of the fake backend.
+        fake: Arguments of the fake LLM backend, None to call the real API.
+        cache: Path of a SQLite response cache recording the calls and
+            replaying them on later runs.
+
+    Returns:
+        dict: Number of units evaluated, skipped and failed.
+    """
+    done = done_units(output)
+    units = [
+        (item, name) for item in items for name in variants if (item["id"], name) not in done
+    ]
+    max_in_flight = max_in_flight or 2 * workers
+    counts = {"evaluated": 0, "skipped": len(items) * len(variants) - len(units), "failed": 0}
+
+    _end_line(output)
+    with open(output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=({"fake": fake, "cache": cache},)
+    ) as executor:
+        pending = {}
+
+        def collect(futures):
+            for future in futures:
+                item, name = pending.pop(future)
+                try:
+                    record = future.result()
+                except Exception as e:
+                    print(f"Evaluating {item['id']} with {name} failed: {e}")
+                    counts["failed"] += 1
+                    continue
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                counts["evaluated"] += 1
+
+        for item, name in units:
+            if len(pending) >= max_in_flight:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+            future = executor.submit(
+                evaluate_unit, item, name, variants[name], personas, local_weight, seed
+            )
+            pending[future] = (item, name)
+        collect(wait(pending).done)
+    return counts
+
+
+def summarize(output):
+    """
+    Summarize an output file: how often humans are detected with each prompt
+    variant, and how human each persona looks.
+    """
+    variants = defaultdict(lambda: {"units": 0, "detected": 0, "human": [], "ai": [], "fallbacks": 0})
+    personas = defaultdict(lambda: {"answers": 0, "scores": [], "lowest": 0})
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            variant = variants[record["variant"]]
+            variant["units"] += 1
+            variant["detected"] += record["human_detected"]
+            variant["fallbacks"] += record.get("local_fallbacks", 0)
+            lowest = min((a["score"] for a in record["answers"]), default=None)
+            for answer in record["answers"]:
+                variant[answer["author"]].append(answer["score"])
+                if answer["author"] == "ai":
+                    persona = personas[(record["variant"], answer["persona"])]
+                    persona["answers"] += 1
+                    persona["scores"].append(answer["score"])
+                    persona["lowest"] += answer["score"] == lowest
+
+    def mean(values):
+        return round(sum(values) / len(values), 1) if values else None
+
+    return {
+        "variants": {
+            name: {
+                "units": v["units"],
+                "detection_rate": round(v["detected"] / v["units"], 3),
+                "mean_human_score": mean(v["human"]),
+                "mean_ai_score": mean(v["ai"]),
+                "local_fallbacks": v["fallbacks"],
+            }
+            for name, v in sorted(variants.items())
+        },
+        "personas": {
+            f"{name}/{persona}": {
+                "answers": p["answers"],
+                "mean_score": mean(p["scores"]),
+                "voted_out_rate": round(p["lowest"] / p["answers"], 3),
+            }
+            for (name, persona), p in sorted(personas.items())
+        },
+    }
+
+
+def format_summary(summary):
+    lines = [f"{'variant':<24}{'units':>8}{'detected':>10}{'human':>8}{'ai':>8}{'fallbacks':>11}"]
+    for name, v in summary["variants"].items():
+        lines.append(
+            f"{name:<24}{v['units']:>8}{v['detection_rate']:>10.1%}"
+            f"{v['mean_human_score']!s:>8}{v['mean_ai_score']!s:>8}{v['local_fallbacks']:>11}"
+        )
+    lines += ["", f"{'variant/persona':<40}{'answers':>9}{'score':>8}{'voted out':>11}"]
+    for name, p in summary["personas"].items():
+        lines.append(
+            f"{name:<40}{p['answers']:>9}{p['mean_score']!s:>8}{p['voted_out_rate']:>11.1%}"
+        )
+    return "\n".join(lines)
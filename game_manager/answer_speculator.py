@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from game_manager.timer_wheel import get_timer_wheel
+from models import config
+from players_manager.ai_player import answer_batch
+
+# Shared by every game, like the question prefetcher.
+_executor = ThreadPoolExecutor(
+    max_workers=config.SPECULATION_WORKERS,
+    thread_name_prefix="ai-speculation",
+)
+
+
+class AnswerSpeculator:
+    def __init__(self, release_window=(0.2, 0.7)):
+        """
+        Answer for the AI players of a game as soon as a turn starts.
+
+        Each answer is handed to the game at a random time within the turn,
+        so AI players do not all answer at once the moment the question is
+        asked. Answers of a turn that was replaced, or of a player who was
+        eliminated, are thrown away.
+
+        Args:
+            release_window: Range of the release time, as fractions of the
+                answer timeout.
+        """
+        self.release_window = release_window
+        self.turn = None
+        self._futures = {}  # player_id -> Future of the answer
+        self._timers = []
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+
+    def start(self, turn, question, players, answer_timeout, release, batched=False,
+              usage_meter=None, game_id=None):
+        """
+        Start answering `question` for the AI `players` of `turn`.
+
+        Args:
+            turn: The turn the answers are for.
+            question: The question of the turn.
+            players: The PlayerRecords of the AI players.
+            answer_timeout: Seconds the turn lasts.
+            release: Called as `release(turn, player_id)` once the answer of
+                a player is ready and its release time has come.
+            batched: Answer for every player with one completion.
+        """
+        self.discard()
+        if not players:
+            return
+        started = time.monotonic()
+        deadline = started + answer_timeout
+        futures = {player.id: Future() for player in players}
+        with self._lock:
+            self.turn = turn
+            self._futures = futures
+            self._started = started
+            self._finished = None
+
+        for player in players:
+            release_at = started + random.uniform(*self.release_window) * answer_timeout
+            futures[player.id].add_done_callback(
+                lambda future, player_id=player.id, release_at=release_at:
+                    self._on_done(future, turn, player_id, release_at, release)
+            )
+
+        if batched:
+            _executor.submit(
+                self._answer_batch, futures, players, question, deadline, usage_meter, game_id
+            )
+        else:
+            for player in players:
+                _executor.submit(self._answer, futures[player.id], player, question, deadline)
+
+    @staticmethod
+    def _answer(future, player, question, deadline):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(player.player.answer(question, deadline))
+        except Exception as e:
+            print(f"AI player {player.name} failed to answer ahead: {e}")
+            future.set_result(None)
+
+    @staticmethod
+    def _answer_batch(futures, players, question, deadline, usage_meter, game_id):
+        running = [
+            (player, futures[player.id]) for player in players
+            if futures[player.id].set_running_or_notify_cancel()
+        ]
+        if not running:
+            return
+        answers = answer_batch(
+            [player.player for player, _ in running],
+            question,
+            usage_meter=usage_meter,
+            deadline=deadline,
+            game_id=game_id,
+        )
+        # Players missing from the output get None and are answered on demand.
+        for (_, future), answer in zip(running, answers):
+            future.set_result(answer)
+
+    def _on_done(self, future, turn, player_id, release_at, release):
+        with self._lock:
+            if self.turn != turn or self._futures.get(player_id) is not future:
+                return
+            self._finished = time.monotonic()
+            if future.cancelled() or future.result() is None:
+                return
+            timer = get_timer_wheel().schedule(
+                max(0, release_at - time.monotonic()), release, turn, player_id
+            )
+            self._timers.append(timer)
+
+    def ready(self, turn, player_id):
+        """
+        Return the answer of a player if it is already generated, else None.
+        """
+        with self._lock:
+            future = self._futures.get(player_id) if self.turn == turn else None
+        if future is None or not future.done() or future.cancelled():
+            return None
+        return future.result()
+
+    def take(self, turn, player_ids, deadline):
+        """
+        Wait until `deadline` for the answers of `player_ids` still being
+        generated.
+
+        Returns:
+            dict: player_id -> answer, for the players answered ahead.
+        """
+        with self._lock:
+            if self.turn != turn:
+                return {}
+            futures = {
+                self._futures[player_id]: player_id
+                for player_id in player_ids if player_id in self._futures
+            }
+        done, _ = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        return {
+            futures[future]: future.result()
+            for future in done
+            if not future.cancelled() and future.result() is not None
+        }
+
+    def generation_time(self, turn):
+        """
+        Seconds it took to answer ahead for every AI player of `turn`, None if
+        some answers are still being generated.
+        """
+        with self._lock:
+            if self.turn != turn or self._finished is None:
+                return None
+            if not all(future.done() for future in self._futures.values()):
+                return None
+            return self._finished - self._started
+
+    def discard(self, player_id=None):
+        """
+        Throw away the answer of one player, or of everyone.
+        """
+        with self._lock:
+            if player_id is not None:
+                futures = [self._futures.pop(player_id)] if player_id in self._futures else []
+            else:
+                futures = list(self._futures.values())
+                for timer in self._timers:
+                    timer.cancel()
+                self.turn = None
+                self._futures = {}
+                self._timers = []
+        # Cancelling runs the done callbacks, which take the lock.
+        for future in futures:
+            future.cancel()
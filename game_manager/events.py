@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import deque
+
+from game_manager.store import MemoryGameStore
+
+
+class EventLog:
+    def __init__(self, max_events=1000, store=None, game_id=None, snapshot=None):
+        """
+        Versioned log of the recent events of a game.
+
+        Every event gets the next version number, so clients can resume from
+        the last version they have seen.
+
+        Args:
+            max_events: Number of recent events kept for resuming clients.
+            store: GameStore every emitted event is written to.
+            game_id: Id of the game in the store.
+            snapshot: Callable returning the state of the game, saved to the
+                store every `store.snapshot_every` events.
+        """
+        self.version = 0
+        self.store = store if store is not None else MemoryGameStore()
+        self.game_id = game_id
+        self.snapshot = snapshot
+        self._events = deque(maxlen=max_events)
+        self._cond = threading.Condition()
+
+    def emit(self, event_type, **data):
+        """
+        Append an event and wake up every waiting subscriber.
+
+        Returns:
+            dict: The emitted event.
+        """
+        with self._cond:
+            event = {
+                "version": self.version + 1,
+                "type": event_type,
+                "time": time.time(),
+                "data": data,
+            }
+            self.store.append(self.game_id, event)
+            self.version = event["version"]
+            self._events.append(event)
+            every = self.store.snapshot_every
+            if self.snapshot is not None and every and self.version % every == 0:
+                self.store.save_snapshot(self.game_id, self.version, self.snapshot())
+            self._cond.notify_all()
+        return event
+
+    def replay(self, event):
+        """
+        Add an event already in the store, e.g. logged by another worker.
+        """
+        with self._cond:
+            self.version = event["version"]
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def since(self, version):
+        """
+        Return the events newer than `version`.
+
+        Returns:
+            list: The events in order, or None if some of them were already
+                dropped from the log and the client needs the full state.
+        """
+        with self._cond:
+            if version >= self.version:
+                return []
+            if not self._events or self._events[0]["version"] > version + 1:
+                return None
+            start = version + 1 - self._events[0]["version"]
+            return [self._events[i] for i in range(start, len(self._events))]
+
+    def wait(self, version, timeout=None):
+        """
+        Block until there are events newer than `version` or the timeout expires.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > version, timeout=timeout)
+        return self.since(version)
@@ -1,160 +1,747 @@
 import random
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import wraps
 
+from game_manager.answer_speculator import AnswerSpeculator
+from game_manager.events import EventLog
+from game_manager.jobs import get_job_runner
+from game_manager.player_table import PlayerRecord, PlayerTable
+from game_manager.question_prefetcher import QuestionPrefetcher
+from game_manager.store import MemoryGameStore, VersionConflict
+from game_manager.timer_wheel import get_timer_wheel
+from models import config
+from models.metrics import metrics
+from models.usage import UsageMeter
 from players_manager.admin import Admin
+from players_manager.ai_player import AIPlayer, answer_batch
+from players_manager.human_player import HumanPlayer
+from players_manager.rank_batcher import get_rank_batcher
+
+MAX_GAME_JOBS = 20  # Finished jobs kept in the state of a game
+RELEASE_RETRY_DELAY = 0.1  # Seconds before releasing an AI answer to a busy game again
+
+
+def traced(step):
+    """
+    Record the duration of a game step in the `game_step` metrics.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with metrics.span("game_step", step=step, game_id=self.id):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class Game:
-    def __init__(self, answer_timeout=30, min_players=2):
+    def __init__(
+        self,
+        answer_timeout=30,
+        min_players=2,
+        ai_concurrency=8,
+        prefetch_questions=2,
+        ai_answer_mode="parallel",
+        batch_ranking=False,
+        enforce_deadline=True,
+        auto_advance=False,
+        speculative_answers=True,
+        store=None,
+        game_id=None,
+    ):
+        self.settings = {
+            "answer_timeout": answer_timeout,
+            "min_players": min_players,
+            "ai_concurrency": ai_concurrency,
+            "prefetch_questions": prefetch_questions,
+            "ai_answer_mode": ai_answer_mode,
+            "batch_ranking": batch_ranking,
+            "enforce_deadline": enforce_deadline,
+            "auto_advance": auto_advance,
+            "speculative_answers": speculative_answers,
+        }
+        self.id = game_id or str(uuid.uuid4())
+        self.lock = threading.RLock()  # Serializes requests touching this game
+        # Serializes the steps of a turn that wait for the model (new turn, AI
+        # answers, ranking). Held across model calls, unlike `lock`, and always
+        # taken before it.
+        self.turn_lock = threading.RLock()
         self.answer_timeout = answer_timeout
         self.min_players = min_players
+        self.ai_concurrency = ai_concurrency  # Max AI answers generated at once
+        self.ai_answer_mode = ai_answer_mode  # parallel, batched
+        self.enforce_deadline = enforce_deadline  # Close and rank turns when time runs out
+        self.auto_advance = auto_advance  # Start the next turn once a turn is ranked
+        self.speculative_answers = speculative_answers  # Answer for AI players as the turn starts
         self.turn = 0
         self.status = "waiting"  # waiting, in_progress, finished
-        self.players = []  # List of player dicts
+        self.players = PlayerTable()
         self.current_question = None
-        self.answers = []  # List of {player_id, answer}
+        self.answers = {}  # player_id -> answer
         self.turn_start_time = None
-        self.admin = Admin()
+        self.answers_closed = False
+        self.last_ranking = None
+        self.jobs = OrderedDict()  # job_id -> finished job, most recent last
+        self._deadline_timer = None
+        self.on_conflict = None  # Called with the game id when this copy diverged from the store
+        self._synced_at = 0.0  # time.monotonic() of the last sync with the store
+        self.store = store if store is not None else MemoryGameStore()
+        self.events = EventLog(store=self.store, game_id=self.id, snapshot=self.snapshot)
+        # LLM usage of each step of a turn, reported in `turn_report`
+        self.usage = {step: UsageMeter() for step in ("question", "answers", "ranking")}
+        self.turn_report = {}
+        self._question_usage = self.usage["question"].snapshot()
+        self._answers_usage = self.usage["answers"].snapshot()
+        self.speculator = AnswerSpeculator()
+        self._speculated = 0  # AI answers of the turn generated ahead
+        self.admin = Admin(
+            ask_usage_meter=self.usage["question"],
+            rank_usage_meter=self.usage["ranking"],
+            rank_batcher=get_rank_batcher() if batch_ranking else None,
+            game_id=self.id,
+        )
+        self.question_prefetcher = QuestionPrefetcher(
+            self.admin.ask, buffer_size=prefetch_questions
+        )
+        if game_id is None:
+            self.events.emit("game_created", settings=self.settings)
 
-    def get_state(self):
+    @classmethod
+    def restore(cls, game_id, store):
+        """
+        Rebuild a game from its latest snapshot and the events logged after it.
+
+        Returns:
+            Game: The game, or None if it is not in the store.
+        """
+        snapshot, events = store.load(game_id)
+        if snapshot is None and not events:
+            return None
+        settings = snapshot["settings"] if snapshot else events[0]["data"]["settings"]
+        game = cls(**settings, store=store, game_id=game_id)
+        if snapshot is not None:
+            game._load_snapshot(snapshot)
+        for event in events:
+            game.apply_event(event)
+            game.events.replay(event)
+        game._resume()
+        return game
+
+    def snapshot(self):
+        """
+        Return the state needed to rebuild the game, as plain JSON data.
+        """
         return {
+            "version": self.events.version,
+            "settings": self.settings,
             "status": self.status,
             "turn": self.turn,
-            "players": [
-                {
-                    "id": player["id"],
-                    "name": player["name"],
-                    "is_ai": player["is_ai"],
-                    "eliminated": player["eliminated"],
-                }
-                for player in self.players
-            ],
+            "players": [self._player_data(player) for player in self.players],
             "current_question": self.current_question,
             "answers": self.answers,
+            "turn_start_time": self.turn_start_time,
+            "answers_closed": self.answers_closed,
+            "last_ranking": self.last_ranking,
+            "jobs": list(self.jobs.values()),
+        }
+
+    def _load_snapshot(self, snapshot):
+        for data in snapshot["players"]:
+            self._add_record(self._player_record(data))
+        self.status = snapshot["status"]
+        self.turn = snapshot["turn"]
+        self.current_question = snapshot["current_question"]
+        self.answers = snapshot["answers"]
+        self.turn_start_time = snapshot["turn_start_time"]
+        self.answers_closed = snapshot["answers_closed"]
+        self.last_ranking = snapshot["last_ranking"]
+        for job in snapshot.get("jobs", []):
+            self._remember_job(job)
+        self.events.version = snapshot["version"]
+
+    def apply_event(self, event):
+        """
+        Update the state of the game from an event read back from the store.
+        """
+        data = event["data"]
+        if event["type"] == "player_joined":
+            self._add_record(self._player_record(data["player"], data.get("style")))
+        elif event["type"] == "game_started":
+            self.status = "in_progress"
+        elif event["type"] == "turn_started":
+            self.turn = data["turn"]
+            self.current_question = data["question"]
+            self.answer_timeout = data["answer_timeout"]
+            self.turn_start_time = event["time"]
+            self.answers = {}
+            self.answers_closed = False
+            self.turn_report = {}
+            self.admin.question_index.add(data["question"])
+            # The turn was started by another worker, its answers are generated there.
+            self.speculator.discard()
+        elif event["type"] == "answer_submitted":
+            self.answers[data["player_id"]] = data["answer"]
+        elif event["type"] == "turn_closed":
+            self.answers_closed = True
+        elif event["type"] == "player_eliminated":
+            self.players.eliminate(data["player_id"])
+        elif event["type"] == "ranking_ready":
+            self.answers_closed = True
+            self.last_ranking = {
+                "turn": data["turn"],
+                "scores": data["scores"],
+                "players": [player.to_dict() for player in self.players],
+            }
+        elif event["type"] == "job_finished":
+            self._remember_job(data["job"])
+        elif event["type"] == "game_ended":
+            self.status = "finished"
+            self.release()
+
+    def sync(self):
+        """
+        Apply the events other workers logged for this game since this copy
+        was last updated. Call with the game lock held.
+
+        Returns:
+            bool: False if the game is no longer in the store.
+        """
+        events = self.store.events_since(self.id, self.events.version)
+        self._synced_at = time.monotonic()
+        if events is None:
+            return not self.store.persistent
+        for event in events:
+            self.apply_event(event)
+            self.events.replay(event)
+        return True
+
+    def refresh(self, max_age):
+        """
+        Sync with the store unless this copy was synced less than `max_age`
+        seconds ago. Many subscribers of a game call this as they wait for
+        events, one of them queries the store and the events it replays wake
+        up the others.
+
+        Returns:
+            bool: False if the game is no longer in the store.
+        """
+        if time.monotonic() - self._synced_at < max_age:
+            return True
+        with self.lock:
+            if time.monotonic() - self._synced_at < max_age:
+                return True
+            return self.sync()
+
+    def diverged(self, error):
+        """
+        Drop this copy of the game after `error`, a VersionConflict raised
+        outside of a request: another worker updated the game first, so the
+        state here was changed without being logged. The game is restored
+        from the store on its next access.
+        """
+        print(f"Game {self.id} diverged from the store: {error}")
+        self.release()
+        if self.on_conflict is not None:
+            self.on_conflict(self.id)
+
+    def _resume(self):
+        """
+        Restart the background work of a restored game.
+
+        The question prefetcher is left alone: every worker serving the game
+        restores it, only the one that plays the next turn needs questions,
+        and its first `play_turn` starts prefetching.
+        """
+        if self.status != "in_progress":
+            return
+        if self.enforce_deadline and self.turn and not self.answers_closed:
+            self._deadline_timer = get_timer_wheel().schedule(
+                self.get_remaining_time(), self.close_turn, self.turn
+            )
+
+    @staticmethod
+    def _player_data(record):
+        return {**record.to_dict(), "style": getattr(record.player, "style", None)}
+
+    @staticmethod
+    def _player_record(data, style=None):
+        if data["is_ai"]:
+            player = AIPlayer(data["name"])
+            style = data.get("style", style)
+            if style:
+                player.style = style
+        else:
+            player = HumanPlayer(data["name"])
+        record = PlayerRecord(data["id"], player, data["is_ai"])
+        record.eliminated = data["eliminated"]
+        return record
+
+    def get_state(self):
+        # Read without the game lock, so every collection is copied first.
+        return {
+            "game_id": self.id,
+            "version": self.events.version,
+            "status": self.status,
+            "turn": self.turn,
+            "players": [player.to_dict() for player in self.players],
+            "current_question": self.current_question,
+            "answers": [
+                {"player_id": player_id, "answer": answer}
+                for player_id, answer in list(self.answers.items())
+            ],
             "remaining_time": self.get_remaining_time(),
+            "answers_closed": self.answers_closed,
+            "ranking": self.last_ranking,
+            "jobs": list(self.jobs.values()),
+            "turn_report": dict(self.turn_report),
         }
 
     def add_player(self, player, is_ai=False):
         player_id = str(uuid.uuid4())
-        player_data = {
-            "id": player_id,
-            "player": player,
-            "name": player.name,
-            "is_ai": is_ai,
-            "eliminated": False,
-        }
-        self.players.append(player_data)
+        record = PlayerRecord(player_id, player, is_ai)
+        self._add_record(record)
+        self.events.emit(
+            "player_joined", player=record.to_dict(), style=getattr(player, "style", None)
+        )
         print(f"Player {player.name} added with ID: {player_id}")
         return player_id
 
+    def _add_record(self, record):
+        if record.is_ai:
+            record.player.usage_meter = self.usage["answers"]
+            record.player.game_id = self.id
+        self.players.add(record)
+
     def find_player(self, player_id):
-        for player in self.players:
-            if player["id"] == player_id:
-                return player
-        return None
+        return self.players.get(player_id)
 
     def generate_question(self):
-        self.current_question = self.admin.ask()
-        return self.current_question
+        """
+        Return the question of the next turn, without the game lock since it
+        may wait for the admin.
+        """
+        return self.question_prefetcher.get()
 
     def submit_answer(self, player_id, answer):
-        player = self.find_player(player_id)
-        if player and not player["eliminated"]:
-            self.answers.append({"player_id": player_id, "answer": answer})
-            print(f"Player {player['name']} submitted answer: {answer}")
-            return True
-        else:
-            print(f"Player {player_id} is not in the game or has been eliminated.")
-            return False
+        if answer is not None and not isinstance(answer, str):
+            answer = str(answer)
+        with self.lock:
+            if self.answers_closed:
+                print(f"Answers are closed for turn {self.turn}.")
+                return False
+            player = self.find_player(player_id)
+            if player and not player.eliminated:
+                self._store_answer(player, answer)
+                return True
+            else:
+                print(f"Player {player_id} is not in the game or has been eliminated.")
+                return False
 
-    def collect_ai_answer(self, player_id, player_info):
-        if player_info["is_ai"] and not player_info["eliminated"]:
-            answer = player_info["player"].answer(self.current_question)
-            self.submit_answer(player_id, answer)
+    def _store_answer(self, player, answer):
+        # A later submission replaces the earlier one.
+        self.answers[player.id] = answer
+        self.events.emit("answer_submitted", player_id=player.id, answer=answer)
+        print(f"Player {player.name} submitted answer: {answer}")
 
+    @traced("ranking")
     def ranking(self):
-        players = [
-            {
-                "id": player["id"],
-                "name": player["name"],
-                "is_ai": player["is_ai"],
-                "eliminated": player["eliminated"],
-            }
-            for player in self.players
-        ]
+        """
+        Close the answers of the turn and rank them.
 
-        player_answered = [item["player_id"] for item in self.answers]
-        answer_dict = {}
-        for answer in self.answers:
-            answer_dict[answer["player_id"]] = answer["answer"]
+        A turn is ranked once, later calls return the same ranking. The game
+        lock is only held to read the answers and to apply the ranking, not
+        while the admin ranks them.
 
-        for idx, player in enumerate(players):
-            if player["eliminated"]:
-                continue
+        Returns:
+            dict: The ranking, or None if the turn changed meanwhile.
+        """
+        with self.turn_lock:
+            with self.lock:
+                if self.last_ranking is not None and self.last_ranking["turn"] == self.turn:
+                    return self.last_ranking
+                turn = self.turn
+                self.answers_closed = True
+                self._cancel_deadline()
+                pending = []
+                if self.speculative_answers:
+                    pending = [p for p in self.players.active() if p.is_ai and p.id not in self.answers]
+                deadline = time.monotonic() + self.get_remaining_time()
 
-            if player["id"] not in player_answered:
-                players[idx]["eliminated"] = True
-                self.eliminate_player(player["id"])
-                continue
+            # Answers generated ahead count even if their release time has not come.
+            speculated = self.speculator.take(turn, [p.id for p in pending], deadline) if pending else {}
 
-            if answer_dict[player["id"]] == "":
-                players[idx]["eliminated"] = True
-                self.eliminate_player(player["id"])
-                continue
-            
-        all_ids = [answer["player_id"] for answer in self.answers]
-        all_answers = [answer["answer"] for answer in self.answers]
+            with self.lock:
+                if self.turn != turn:
+                    print(f"Turn {turn} was replaced before it was ranked.")
+                    return None
+                self._speculated += self._store_ai_answers(pending, speculated)
 
-        all_ranks = self.admin.rank(self.current_question, all_answers)
+                # Players that did not answer, or answered nothing, are eliminated.
+                for player in self.players.active():
+                    if not self.answers.get(player.id):
+                        self.eliminate_player(player.id)
 
-        return {
-            "scores": [
-                {
-                    "player_id": all_ids[i],
-                    "answer": all_answers[i],
-                    "rank": all_ranks[i],
+                question = self.current_question
+                all_ids = list(self.answers)
+                all_answers = list(self.answers.values())
+
+                started, usage = time.time(), self.usage["ranking"].snapshot()
+                # Local scores are pushed at once, the admin's ranking follows.
+                # Without them the turn is ranked by the admin alone.
+                local_scores = self.admin.local_scores(question, all_answers)
+                if local_scores is not None:
+                    self.events.emit(
+                        "ranking_provisional",
+                        turn=turn,
+                        scores=[
+                            {"player_id": player_id, "rank": rank}
+                            for player_id, rank in zip(all_ids, local_scores)
+                        ],
+                    )
+
+            all_ranks = self.admin.rank(
+                question,
+                all_answers,
+                deadline=time.monotonic() + config.RANK_DEADLINE,
+                local_scores=local_scores,
+            )
+
+            with self.lock:
+                if self.turn != turn:
+                    print(f"Turn {turn} was replaced before it was ranked.")
+                    return None
+                self._report("ranking", started, usage, batched=self.admin.rank_batcher is not None)
+                self.turn_report["ranking"]["local_fallbacks"] = self.admin.rank_fallbacks
+
+                ranking = {
+                    "turn": turn,
+                    "scores": [
+                        {
+                            "player_id": all_ids[i],
+                            "answer": all_answers[i],
+                            "rank": all_ranks[i],
+                        }
+                        for i in range(len(all_ids))
+                    ],
+                    "players": [player.to_dict() for player in self.players],
                 }
-                for i in range(len(all_ids))
-            ],
-            "players": players,
-        }
+                self.last_ranking = ranking
+                self.events.emit("ranking_ready", turn=turn, scores=ranking["scores"])
+                return ranking
+
+    def close_turn(self, turn):
+        """
+        Close `turn` once its deadline has passed.
+
+        Runs on the timer wheel, so it only closes the answers and hands the
+        rest of the turn to a `close_turn` job, see `finish_turn`.
+        """
+        try:
+            with self.lock:
+                if not self.sync():
+                    return
+                if self.status != "in_progress" or self.turn != turn or self.answers_closed:
+                    return
+                self.answers_closed = True
+                self._deadline_timer = None
+                self.events.emit("turn_closed", turn=turn)
+                print(f"Turn {turn} closed.")
+        except VersionConflict as e:
+            self.diverged(e)
+            return
+        get_job_runner().submit(
+            self, "close_turn", lambda: self.finish_turn(turn), key=f"turn-{turn}"
+        )
+
+    def finish_turn(self, turn):
+        """
+        Rank a closed turn.
+
+        AI players that have not answered yet get `AI_ANSWER_GRACE` more
+        seconds, then the answers are ranked. With `auto_advance` the next turn
+        starts, or the game ends when fewer than `min_players` remain.
+
+        Returns:
+            dict: The turn and whether it was ranked.
+        """
+        with self.turn_lock:
+            if self.turn != turn:
+                return {"turn": turn, "ranked": False}
+            self.play_turn_ai(deadline=time.monotonic() + config.AI_ANSWER_GRACE)
+            ranked = self.ranking() is not None
+            if ranked and self.auto_advance:
+                with self.lock:
+                    enough_players = len(self.players.active()) >= self.min_players
+                    if not enough_players:
+                        self.end_game()
+                if enough_players:
+                    self.play_turn()
+            return {"turn": turn, "ranked": ranked}
+
+    def _cancel_deadline(self):
+        if self._deadline_timer is not None:
+            self._deadline_timer.cancel()
+            self._deadline_timer = None
+
+    def record_job(self, job):
+        """
+        Keep the outcome of a finished background job in the game state.
+
+        Args:
+            job (dict): The summary of the job, see `Job.summary`.
+        """
+        self._remember_job(job)
+        self.events.emit("job_finished", job=job)
+
+    def _remember_job(self, job):
+        self.jobs[job["job_id"]] = job
+        while len(self.jobs) > MAX_GAME_JOBS:
+            self.jobs.popitem(last=False)
 
     def eliminate_player(self, player_id):
-        player = self.find_player(player_id)
+        self.speculator.discard(player_id)
+        player = self.players.eliminate(player_id)
         if player:
-            player["eliminated"] = True
-            print(f"Player {player['name']} has been eliminated.")
+            self.events.emit("player_eliminated", player_id=player_id)
+            print(f"Player {player.name} has been eliminated.")
         else:
             print(f"Player {player_id} not found.")
 
     def get_active_players(self):
-        active_players = [p for p in self.players if not p["eliminated"]]
+        active_players = self.players.active()
         return {
-            "ids": [p["id"] for p in active_players],
-            "names": [p["name"] for p in active_players],
+            "ids": [p.id for p in active_players],
+            "names": [p.name for p in active_players],
         }
 
     def start_game(self):
         self.status = "in_progress"
+        self.question_prefetcher.start()
+        self.events.emit("game_started")
+
+    def end_game(self):
+        self.status = "finished"
+        self.release()
+        self.events.emit("game_ended")
 
+    def release(self):
+        """
+        Stop the background work of the game, without changing its state.
+        """
+        self._cancel_deadline()
+        self.question_prefetcher.stop()
+        self.speculator.discard()
+
+    @traced("play_turn")
     def play_turn(self):
-        if self.status != "in_progress":
-            print("Game is not in progress.")
+        with self.turn_lock:
+            with self.lock:
+                if self.status != "in_progress":
+                    print("Game is not in progress.")
+                    return
+                # Questions are prefetched, so their usage is counted since the last turn.
+                started, usage = time.time(), self._question_usage
+
+            question = self.generate_question()
+
+            with self.lock:
+                if self.status != "in_progress":
+                    print("Game is not in progress.")
+                    return
+                self.turn += 1
+                self.current_question = question
+                self._question_usage = self.usage["question"].snapshot()
+                self.answers = {}
+                self.answers_closed = False
+                self.turn_report = {}
+                self._answers_usage = self.usage["answers"].snapshot()
+                self._speculated = 0
+                self._report("question", started, usage)
+                print(f"Question for turn {self.turn}: {self.current_question}")
+                self.turn_start_time = time.time()
+                self._cancel_deadline()
+                if self.enforce_deadline:
+                    self._deadline_timer = get_timer_wheel().schedule(
+                        self.answer_timeout, self.close_turn, self.turn
+                    )
+                self.events.emit(
+                    "turn_started",
+                    turn=self.turn,
+                    question=self.current_question,
+                    answer_timeout=self.answer_timeout,
+                )
+                if self.speculative_answers:
+                    self.speculator.start(
+                        self.turn,
+                        self.current_question,
+                        [p for p in self.players.active() if p.is_ai],
+                        self.answer_timeout,
+                        self._release_answer,
+                        batched=self.ai_answer_mode == "batched",
+                        usage_meter=self.usage["answers"],
+                        game_id=self.id,
+                    )
+
+    def _release_answer(self, turn, player_id):
+        """
+        Submit the answer generated ahead for an AI player, once its release
+        time has come.
+
+        Runs on the timer wheel, which is shared by every game, so it never
+        waits for the game lock. A busy game is retried a moment later.
+        """
+        if not self.lock.acquire(blocking=False):
+            get_timer_wheel().schedule(RELEASE_RETRY_DELAY, self._release_answer, turn, player_id)
             return
+        try:
+            if self.status != "in_progress" or self.turn != turn or self.answers_closed:
+                return
+            player = self.players.get(player_id)
+            if player is None or player.eliminated or player_id in self.answers:
+                return
+            answer = self.speculator.ready(turn, player_id)
+            if answer:
+                self._store_answer(player, answer)
+                self._speculated += 1
+        except VersionConflict as e:
+            self.diverged(e)
+        finally:
+            self.lock.release()
 
-        self.turn += 1
-        self.generate_question()
-        self.answers = []
-        print(f"Question for turn {self.turn}: {self.current_question}")
-        self.turn_start_time = time.time()
+    def _store_ai_answers(self, ai_players, answers):
+        """
+        Submit the answers of the AI players still in the game that have not
+        answered meanwhile. Call with the game lock held.
 
-    def play_turn_ai(self):
-        if self.status != "in_progress":
-            print("Game is not in progress.")
-        for player in self.players:
-            if not player["eliminated"] and player["is_ai"]:
-                self.collect_ai_answer(player["id"], player)
+        Returns:
+            int: The number of answers submitted.
+        """
+        stored = 0
+        for player in ai_players:
+            answer = answers.get(player.id)
+            if answer is not None and not player.eliminated and player.id not in self.answers:
+                self._store_answer(player, answer)
+                stored += 1
+        return stored
+
+    @traced("play_turn_ai")
+    def play_turn_ai(self, deadline=None):
+        """
+        Collect answers from the active AI players that have not answered yet.
+
+        In `batched` mode every AI player is answered by one completion, and
+        players missing from its output fall back to individual calls. With
+        `speculative_answers` the answers generated since the turn started are
+        used first, and only the missing ones are generated now. The game lock
+        is not held while answers are generated.
+
+        Args:
+            deadline: `time.monotonic()` time by which answers must be in,
+                the end of the turn by default.
+        """
+        with self.turn_lock:
+            with self.lock:
+                if self.status != "in_progress":
+                    print("Game is not in progress.")
+                    return
+                if self.last_ranking is not None and self.last_ranking["turn"] == self.turn:
+                    print(f"Turn {self.turn} is already ranked.")
+                    return
+
+                ai_players = [
+                    p for p in self.players.active() if p.is_ai and p.id not in self.answers
+                ]
+                if not ai_players and not self.speculative_answers:
+                    return
+
+                turn = self.turn
+                started, usage = time.time(), self.usage["answers"].snapshot()
+                question = self.current_question
+                if deadline is None:
+                    deadline = time.monotonic() + self.get_remaining_time()
+                if self.speculative_answers:
+                    # Speculative answers are counted since the turn started.
+                    usage = self._answers_usage
+
+            speculated = {}
+            if self.speculative_answers and ai_players:
+                speculated = self.speculator.take(turn, [p.id for p in ai_players], deadline)
+            answers = {}
+            pending = [p for p in ai_players if p.id not in speculated]
+            if pending and self.ai_answer_mode == "batched":
+                batch = answer_batch(
+                    [player.player for player in pending],
+                    question,
+                    usage_meter=self.usage["answers"],
+                    deadline=deadline,
+                    game_id=self.id,
+                )
+                answers.update(
+                    (player.id, answer) for player, answer in zip(pending, batch) if answer is not None
+                )
+                pending = [p for p in pending if p.id not in answers]
+            if pending:
+                answers.update(self._collect_ai_answers(pending, question, deadline))
+
+            with self.lock:
+                if self.turn != turn or (
+                    self.last_ranking is not None and self.last_ranking["turn"] == turn
+                ):
+                    print(f"Turn {turn} moved on before the AI players answered.")
+                    return
+                self._speculated += self._store_ai_answers(ai_players, speculated)
+                self._store_ai_answers(ai_players, answers)
+                self._report("answers", started, usage, batched=self.ai_answer_mode == "batched")
+                if self.speculative_answers:
+                    # Time the players waited less than if answers were generated now.
+                    generation_time = self.speculator.generation_time(turn) or 0
+                    waited = self.turn_report["answers"]["wall_time"]
+                    self.turn_report["answers"]["speculative"] = self._speculated
+                    self.turn_report["answers"]["saved_time"] = round(
+                        max(0, generation_time - waited), 3
+                    )
+
+    def _collect_ai_answers(self, ai_players, question, deadline):
+        """
+        Answer for each AI player in parallel.
+
+        At most `ai_concurrency` answers are generated at once. Players that
+        have not answered when the turn runs out of time are skipped.
+
+        Returns:
+            dict: player_id -> answer, for the players that answered.
+        """
+        executor = ThreadPoolExecutor(max_workers=min(self.ai_concurrency, len(ai_players)))
+        futures = {
+            executor.submit(player.player.answer, question, deadline): player
+            for player in ai_players
+        }
+        done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        answers = {}
+        for future in done:
+            player = futures[future]
+            try:
+                answers[player.id] = future.result()
+            except Exception as e:
+                print(f"AI player {player.name} failed to answer: {e}")
+        for future in not_done:
+            print(f"AI player {futures[future].name} did not answer in time.")
+        return answers
+
+    def _report(self, step, started, usage, batched=None):
+        report = {
+            "wall_time": round(time.time() - started, 3),
+            **self.usage[step].since(usage),
+        }
+        if batched is not None:
+            report["mode"] = "batched" if batched else "per_player"
+        self.turn_report[step] = report
 
     def get_remaining_time(self):
         if self.turn_start_time is None:
@@ -0,0 +1,177 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from game_manager.store import VersionConflict
+from models import config
+
+
+class Job:
+    __slots__ = (
+        "id", "game_id", "kind", "key", "status", "result", "error",
+        "created_at", "finished_at", "done",
+    )
+
+    def __init__(self, game_id, kind, key=None):
+        self.id = str(uuid.uuid4())
+        self.game_id = game_id
+        self.kind = kind
+        self.key = key
+        self.status = "queued"  # queued, running, done, failed
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.done = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "game_id": self.game_id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def summary(self):
+        """
+        Return the outcome of the job without its result, which only
+        /jobs/<id> serves. This is what the game state and its events keep,
+        so they do not grow with the rankings of every turn.
+        """
+        result = self.result if isinstance(self.result, dict) else {}
+        summary = {key: result[key] for key in ("turn", "ranked") if key in result}
+        if self.kind == "rank_answers":
+            summary["ranked"] = self.result is not None
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "finished_at": self.finished_at,
+            "summary": summary,
+        }
+
+
+class JobRunner:
+    def __init__(self, max_workers=32, max_jobs=10000):
+        """
+        Run slow game operations in the background and keep their outcome.
+
+        Operations take the game lock themselves, only to read and update
+        the game, so requests are not held up while a job waits for the
+        model. Submitting the same
+        operation again with the same idempotency key, or while the previous
+        one is still pending, returns the existing job instead of running it
+        twice.
+
+        Args:
+            max_workers: Number of jobs running at once.
+            max_jobs: Number of jobs remembered, the oldest finished ones are
+                forgotten first.
+        """
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()  # job_id -> Job
+        self._keys = {}  # (game_id, kind, key) -> Job
+        self._pending = {}  # (game_id, kind) -> Job not finished yet
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, game, kind, operation, key=None):
+        """
+        Run `operation()` in the background, unless the same job exists.
+
+        Args:
+            game: The Game the operation acts on.
+            kind: Name of the operation, e.g. `next_turn`.
+            operation: Callable returning the JSON result of the job.
+            key: Idempotency key sent by the client, if any.
+
+        Returns:
+            tuple: The job and whether it was newly created.
+        """
+        with self._lock:
+            job = self._keys.get((game.id, kind, key)) if key else None
+            if job is None:
+                job = self._pending.get((game.id, kind))
+            if job is not None:
+                return job, False
+
+            job = Job(game.id, kind, key)
+            self._jobs[job.id] = job
+            self._pending[(game.id, kind)] = job
+            if key:
+                self._keys[(game.id, kind, key)] = job
+            self._evict()
+        self._executor.submit(self._run, job, game, operation)
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, game, operation):
+        job.status = "running"
+        conflict = None
+        try:
+            job.result = operation()
+            job.status = "done"
+        except Exception as e:
+            print(f"Job {job.kind} of game {job.game_id} failed: {e}")
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+            if isinstance(e, VersionConflict):
+                conflict = e
+        job.finished_at = time.time()
+        with self._lock:
+            self._pending.pop((job.game_id, job.kind), None)
+        try:
+            if conflict is None:
+                with game.lock:
+                    game.record_job(job.summary())
+        except VersionConflict as e:
+            conflict = e
+        finally:
+            job.done.set()
+        if conflict is not None:
+            # The game changed without being logged, drop it before it serves stale state.
+            game.diverged(conflict)
+
+    def _evict(self):
+        while len(self._jobs) > self.max_jobs:
+            job = next((job for job in self._jobs.values() if job.finished), None)
+            if job is None:
+                return
+            del self._jobs[job.id]
+            self._keys.pop((job.game_id, job.kind, job.key), None)
+
+    def __len__(self):
+        return len(self._jobs)
+
+
+_job_runner = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """
+    Return the JobRunner shared by the app and the games of the process.
+    """
+    global _job_runner
+    if _job_runner is None:
+        with _job_runner_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner(max_workers=config.JOB_WORKERS)
+    return _job_runner
@@ -0,0 +1,61 @@
+class PlayerRecord:
+    __slots__ = ("id", "player", "name", "is_ai", "eliminated")
+
+    def __init__(self, player_id, player, is_ai=False):
+        self.id = player_id
+        self.player = player
+        self.name = player.name
+        self.is_ai = is_ai
+        self.eliminated = False
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "is_ai": self.is_ai,
+            "eliminated": self.eliminated,
+        }
+
+
+class PlayerTable:
+    def __init__(self):
+        """
+        Players of a game indexed by id, with the active players kept apart so
+        lookups and eliminations do not scan the whole room.
+        """
+        self._players = {}  # player_id -> PlayerRecord, in joining order
+        self._active = {}  # player_id -> PlayerRecord, used as an ordered set
+
+    def add(self, record):
+        self._players[record.id] = record
+        if not record.eliminated:
+            self._active[record.id] = record
+
+    def get(self, player_id):
+        return self._players.get(player_id)
+
+    def eliminate(self, player_id):
+        """
+        Mark a player as eliminated.
+
+        Returns:
+            PlayerRecord: The player, or None if it does not exist.
+        """
+        record = self._players.get(player_id)
+        if record:
+            record.eliminated = True
+            self._active.pop(player_id, None)
+        return record
+
+    def active(self):
+        """
+        Return the active players in joining order.
+        """
+        return list(self._active.values())
+
+    def __iter__(self):
+        # Iterates over a copy, so readers without the game lock are safe.
+        return iter(list(self._players.values()))
+
+    def __len__(self):
+        return len(self._players)
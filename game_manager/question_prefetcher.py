@@ -0,0 +1,98 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from models import config
+
+# Shared by every game so idle games do not hold a thread each.
+_executor = ThreadPoolExecutor(
+    max_workers=config.PREFETCH_WORKERS,
+    thread_name_prefix="question-prefetch",
+)
+
+
+class QuestionPrefetcher:
+    def __init__(self, generate, buffer_size=2):
+        """
+        Keep a small buffer of upcoming questions generated in the background.
+
+        Args:
+            generate: Callable returning a new question. It is never called
+                concurrently with itself.
+            buffer_size: Number of questions to keep ready.
+        """
+        self.generate = generate
+        self.buffer_size = buffer_size
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._generate_lock = threading.Lock()
+        self._filling = False
+        self._stopped = False
+
+    def start(self):
+        """
+        Start filling the buffer.
+        """
+        with self._cond:
+            self._stopped = False
+        self._schedule_fill()
+
+    def stop(self):
+        """
+        Stop producing questions and drop the buffered ones.
+        """
+        with self._cond:
+            self._stopped = True
+            self._buffer.clear()
+            self._cond.notify_all()
+
+    def get(self):
+        """
+        Pop a ready question, generating one synchronously if none is buffered.
+
+        Returns:
+            str: The next question.
+        """
+        with self._cond:
+            # A question being generated right now is closer than a fresh one.
+            while not self._buffer and self._filling and not self._stopped:
+                self._cond.wait()
+            question = self._buffer.popleft() if self._buffer else None
+
+        if question is None:
+            with self._generate_lock:
+                question = self.generate()
+        self._schedule_fill()
+        return question
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def _schedule_fill(self):
+        with self._cond:
+            if self._stopped or self._filling or len(self._buffer) >= self.buffer_size:
+                return
+            self._filling = True
+        _executor.submit(self._fill)
+
+    def _fill(self):
+        try:
+            while True:
+                with self._cond:
+                    if self._stopped or len(self._buffer) >= self.buffer_size:
+                        return
+                try:
+                    with self._generate_lock:
+                        question = self.generate()
+                except Exception as e:
+                    print(f"Failed to prefetch question: {e}")
+                    return
+                with self._cond:
+                    if self._stopped:
+                        return
+                    self._buffer.append(question)
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._filling = False
+                self._cond.notify_all()
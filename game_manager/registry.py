@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+from game_manager.game import Game
+from game_manager.store import MemoryGameStore
+
+
+class GameRegistry:
+    def __init__(self, max_games=1000, idle_ttl=3600, store=None):
+        """
+        Keep many game sessions alive at once, keyed by game id.
+
+        With a persistent store, games missing from memory are restored from
+        it and every access first applies the events other workers logged, so
+        several processes can serve the same game. Evicting a game then only
+        drops the copy held by this process.
+
+        Args:
+            max_games: Maximum number of games kept in memory. The least
+                recently used game is evicted when the limit is exceeded.
+            idle_ttl: Seconds a game may stay untouched before it is evicted.
+            store: GameStore the games are logged to, in memory by default.
+        """
+        self.max_games = max_games
+        self.idle_ttl = idle_ttl
+        self.store = store if store is not None else MemoryGameStore()
+        self._games = OrderedDict()  # game_id -> (game, last_access)
+        self._lock = threading.Lock()
+
+    def create_game(self, **kwargs):
+        """
+        Create a new game and register it.
+
+        Returns:
+            Game: The newly created game.
+        """
+        game = Game(store=self.store, **kwargs)
+        game.on_conflict = self.forget
+        with self._lock:
+            self._games[game.id] = (game, time.monotonic())
+            self._evict()
+        return game
+
+    def get_game(self, game_id):
+        """
+        Look up a game by id and mark it as recently used.
+
+        Returns:
+            Game: The game, or None if it does not exist or has expired.
+        """
+        if not game_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is not None and now - entry[1] > self.idle_ttl:
+                del self._games[game_id]
+                self._drop(entry[0])
+                entry = None
+            if entry is not None:
+                game = entry[0]
+                self._games[game_id] = (game, now)
+                self._games.move_to_end(game_id)
+                self._evict()
+            elif not self.store.persistent:
+                return None
+
+        if entry is None:
+            # Restored without the registry lock, which every request of every
+            # game takes, since it reads the store and replays events.
+            restored = Game.restore(game_id, self.store)
+            if restored is None:
+                return None
+            restored.on_conflict = self.forget
+            with self._lock:
+                entry = self._games.get(game_id)
+                # Another request may have restored the game meanwhile.
+                game = entry[0] if entry is not None else restored
+                self._games[game_id] = (game, now)
+                self._games.move_to_end(game_id)
+                self._evict()
+            if game is not restored:
+                restored.release()
+
+        # Only a persistent store holds events this copy may have missed.
+        if self.store.persistent:
+            with game.lock:
+                if not game.sync():
+                    self.forget(game_id)
+                    return None
+        return game
+
+    def forget(self, game_id):
+        """
+        Drop the copy of a game held by this process, e.g. after it diverged
+        from the store. It is restored from the store on the next access.
+        """
+        with self._lock:
+            entry = self._games.pop(game_id, None)
+        if entry:
+            entry[0].release()
+
+    def remove_game(self, game_id):
+        with self._lock:
+            entry = self._games.pop(game_id, None)
+        if not entry:
+            return None
+        entry[0].end_game()
+        self.store.delete(game_id)
+        return entry[0]
+
+    def _drop(self, game):
+        if self.store.persistent:
+            game.release()
+        else:
+            game.end_game()
+
+    def _evict(self):
+        now = time.monotonic()
+        # Entries are ordered by last access, so expired games sit at the front.
+        while self._games:
+            game_id, (game, last_access) = next(iter(self._games.items()))
+            if now - last_access <= self.idle_ttl and len(self._games) <= self.max_games:
+                break
+            del self._games[game_id]
+            self._drop(game)
+            print(f"Game {game_id} evicted.")
+
+    def __len__(self):
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
@@ -0,0 +1,149 @@
+import json
+import sqlite3
+import threading
+
+
+class VersionConflict(Exception):
+    """
+    Raised when another worker already logged an event with the same version.
+    """
+
+    def __init__(self, game_id, version):
+        super().__init__(f"Game {game_id} already has an event {version}.")
+        self.game_id = game_id
+        self.version = version
+
+
+class MemoryGameStore:
+    """
+    Default store, games only live in the memory of the process.
+    """
+
+    persistent = False
+    snapshot_every = 0
+
+    def append(self, game_id, event):
+        pass
+
+    def save_snapshot(self, game_id, version, state):
+        pass
+
+    def load(self, game_id):
+        return None, []
+
+    def events_since(self, game_id, version):
+        return []
+
+    def delete(self, game_id):
+        pass
+
+
+class SQLiteGameStore:
+    persistent = True
+
+    def __init__(self, path, snapshot_every=100):
+        """
+        Append-only log of game events with periodic snapshots, in SQLite.
+
+        A game is rebuilt from its latest snapshot plus the events logged
+        after it. Several processes can share the same file, every event
+        version is written once so concurrent writers cannot both advance a
+        game from the same version.
+
+        Args:
+            path: Path of the SQLite file.
+            snapshot_every: Save a snapshot every this many events of a game.
+        """
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS events "
+            "(game_id TEXT, version INTEGER, type TEXT, time REAL, data TEXT, "
+            "PRIMARY KEY (game_id, version)) WITHOUT ROWID"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots "
+            "(game_id TEXT PRIMARY KEY, version INTEGER, state TEXT)"
+        )
+        self._db.commit()
+
+    def append(self, game_id, event):
+        """
+        Log an event of a game.
+
+        Raises:
+            VersionConflict: If the version of the event is already logged.
+        """
+        row = (
+            game_id,
+            event["version"],
+            event["type"],
+            event["time"],
+            json.dumps(event["data"], ensure_ascii=False),
+        )
+        with self._lock:
+            try:
+                with self._db:
+                    self._db.execute("INSERT INTO events VALUES (?, ?, ?, ?, ?)", row)
+            except sqlite3.IntegrityError as e:
+                raise VersionConflict(game_id, event["version"]) from e
+
+    def save_snapshot(self, game_id, version, state):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO snapshots VALUES (?, ?, ?) ON CONFLICT (game_id) DO UPDATE "
+                "SET version = excluded.version, state = excluded.state "
+                "WHERE excluded.version > snapshots.version",
+                (game_id, version, json.dumps(state, ensure_ascii=False)),
+            )
+
+    def load(self, game_id):
+        """
+        Return the latest snapshot of a game and the events logged after it.
+
+        Returns:
+            tuple: The snapshot, or None if there is none, and the events.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, state FROM snapshots WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            version, snapshot = (row[0], json.loads(row[1])) if row else (0, None)
+            events = self._events_after(game_id, version)
+        return snapshot, events
+
+    def events_since(self, game_id, version):
+        """
+        Return the events of a game newer than `version`.
+
+        Returns:
+            list: The events in order, or None if the game is not in the store.
+        """
+        with self._lock:
+            (last,) = self._db.execute(
+                "SELECT MAX(version) FROM events WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            if last is None:
+                return None
+            if last <= version:
+                return []
+            return self._events_after(game_id, version)
+
+    def _events_after(self, game_id, version):
+        rows = self._db.execute(
+            "SELECT version, type, time, data FROM events "
+            "WHERE game_id = ? AND version > ? ORDER BY version",
+            (game_id, version),
+        )
+        return [
+            {"version": v, "type": event_type, "time": t, "data": json.loads(data)}
+            for v, event_type, t, data in rows
+        ]
+
+    def delete(self, game_id):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM events WHERE game_id = ?", (game_id,))
+            self._db.execute("DELETE FROM snapshots WHERE game_id = ?", (game_id,))
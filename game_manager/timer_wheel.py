@@ -0,0 +1,120 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from models import config
+
+
+class Timer:
+    __slots__ = ("due", "callback", "args", "cancelled")
+
+    def __init__(self, due, callback, args):
+        self.due = due  # Tick at which the timer fires
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Stop the timer from firing. Cancelled timers are dropped when their
+        slot comes up.
+        """
+        self.cancelled = True
+
+
+class TimerWheel:
+    def __init__(self, tick=0.1, slots=512, max_workers=8):
+        """
+        Fire many timers from a single background thread.
+
+        Timers are hashed into `slots` buckets by the tick they are due at, so
+        scheduling and cancelling cost O(1) and each tick only looks at the
+        timers of one bucket, however many games are running. Callbacks run
+        on a thread pool so a slow one does not delay the others.
+
+        Args:
+            tick: Resolution of the wheel in seconds.
+            slots: Number of buckets, a timer further away than one turn of the
+                wheel stays in its bucket for several turns.
+            max_workers: Number of callbacks running at once.
+        """
+        self.tick = tick
+        self.slots = slots
+        self._wheel = [[] for _ in range(slots)]
+        self._start = time.monotonic()
+        self._current = 0  # Next tick to process
+        self._count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="timer")
+
+    def schedule(self, delay, callback, *args):
+        """
+        Call `callback(*args)` in about `delay` seconds.
+
+        Returns:
+            Timer: Handle to cancel the timer.
+        """
+        due = math.ceil((time.monotonic() + delay - self._start) / self.tick)
+        with self._lock:
+            timer = Timer(max(due, self._current), callback, args)
+            self._wheel[timer.due % self.slots].append(timer)
+            self._count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return timer
+
+    def _run(self):
+        while True:
+            time.sleep(max(0, self._start + (self._current + 1) * self.tick - time.monotonic()))
+            now = int((time.monotonic() - self._start) / self.tick)
+            with self._lock:
+                # Catch up on every tick missed while sleeping or busy.
+                while self._current <= now:
+                    self._advance(self._current)
+                    self._current += 1
+
+    def _advance(self, tick):
+        bucket = self._wheel[tick % self.slots]
+        if not bucket:
+            return
+        pending = []
+        for timer in bucket:
+            if timer.cancelled:
+                self._count -= 1
+            elif timer.due <= tick:
+                self._count -= 1
+                self._executor.submit(self._fire, timer)
+            else:
+                pending.append(timer)
+        self._wheel[tick % self.slots] = pending
+
+    @staticmethod
+    def _fire(timer):
+        if timer.cancelled:
+            return
+        try:
+            timer.callback(*timer.args)
+        except Exception as e:
+            print(f"Timer callback {timer.callback.__name__} failed: {e}")
+
+    def __len__(self):
+        return self._count
+
+
+_timer_wheel = None
+_timer_wheel_lock = threading.Lock()
+
+
+def get_timer_wheel():
+    """
+    Return the TimerWheel shared by every game in the process.
+    """
+    global _timer_wheel
+    if _timer_wheel is None:
+        with _timer_wheel_lock:
+            if _timer_wheel is None:
+                _timer_wheel = TimerWheel(max_workers=config.TURN_DEADLINE_WORKERS)
+    return _timer_wheel
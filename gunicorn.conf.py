@@ -0,0 +1,27 @@
+"""
+Gunicorn settings, used by the Procfile: `gunicorn -c gunicorn.conf.py app:app`.
+
+Turn endpoints spend seconds waiting on the LLM API. With the default `gevent`
+worker that wait is cooperative: a worker keeps serving other rooms while a
+request is blocked on the network, instead of holding one worker per in-flight
+LLM call like the `sync` worker does.
+
+Environment:
+    GUNICORN_WORKER_CLASS: `gevent` (default), `gthread` or `sync`.
+    WEB_CONCURRENCY: Number of worker processes. Without GAME_STORE_PATH
+        games only live in the memory of one process, so it defaults to 1.
+    GUNICORN_WORKER_CONNECTIONS: Concurrent requests per gevent worker.
+    GUNICORN_THREADS: Threads per gthread worker.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.getenv("WEB_CONCURRENCY", 2 if os.getenv("GAME_STORE_PATH") else 1))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+# Gunicorn turns `sync` into `gthread` when threads > 1.
+threads = int(os.getenv("GUNICORN_THREADS", 32)) if worker_class == "gthread" else 1
+# Turn requests wait on the LLM, and event streams stay open.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
@@ -0,0 +1,102 @@
+from models.clients import get_async_client
+from models.groq_model import GroqModel
+import time
+
+
+class AsyncGroqModel(GroqModel):
+    """
+    Async variant of GroqModel, every call is a coroutine.
+
+    Takes the same arguments as GroqModel. When no client is given the shared
+    pooled AsyncGroq client is used.
+    """
+
+    @property
+    def client(self):
+        return self._client or get_async_client()
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    async def _create(self, request, deadline=None):
+        async def call():
+            return await self.client.chat.completions.create(**request, **self._timeout(deadline))
+
+        stats, started = {}, time.perf_counter()
+        try:
+            completion = await self.scheduler.run_async(
+                call, stats=stats, **self._schedule(request, deadline)
+            )
+        except Exception as e:
+            self._record_call(started, stats, error=type(e).__name__)
+            raise
+        self._record_call(started, stats, None if request.get("stream") else completion)
+        return completion
+
+    async def generate_plain_text(self, prompt, use_cache=True, deadline=None):
+        messages = self._build_messages(prompt)
+        if self.stream:
+            return "".join([text async for text in self._stream(messages, deadline)])
+
+        request = self._completion_kwargs(messages)
+        key = self._cache_key(request, use_cache)
+        if key:
+            output = self.cache.get(key)
+            if output is not None:
+                return output
+
+        chat_completion = await self._create(request, deadline)
+        output = chat_completion.choices[0].message.content
+        if key:
+            self.cache.set(key, output)
+        return output
+
+    async def stream_plain_text(self, prompt, deadline=None):
+        """
+        Generate a response and yield its text as the tokens arrive.
+        """
+        async for text in self._stream(self._build_messages(prompt), deadline):
+            yield text
+
+    async def memory_chat(self, prompt=None, deadline=None):
+        """
+        Chat with your restored memory
+        """
+        if self.stream:
+            return "".join([text async for text in self.stream_memory_chat(prompt, deadline)])
+
+        chat_completion = await self._create(
+            self._completion_kwargs(self._memory_messages(prompt)), deadline
+        )
+        content = chat_completion.choices[0].message.content
+        self._remember(content)
+        return content
+
+    async def stream_memory_chat(self, prompt=None, deadline=None):
+        """
+        Streaming variant of `memory_chat`, the full reply is stored in memory
+        once the stream is exhausted.
+        """
+        parts = []
+        async for text in self._stream(self._memory_messages(prompt), deadline):
+            parts.append(text)
+            yield text
+        self._remember("".join(parts))
+
+    async def tools_chat(self, messages, tools, deadline=None):
+        request = self._tools_request(messages, tools)
+        key = self._cache_key(request)
+        message = self._cached_message(key)
+        if message is None:
+            response = await self._create(request, deadline)
+            message = response.choices[0].message
+            if key:
+                self.cache.set(key, message.model_dump(exclude_none=True))
+        return message, message.tool_calls
+
+    async def _stream(self, messages, deadline=None):
+        chunks = await self._create(self._completion_kwargs(messages, stream=True), deadline)
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,78 @@
+import threading
+
+from models import config
+
+_lock = threading.Lock()
+_client = None
+_async_client = None
+
+
+def _limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=config.GROQ_MAX_CONNECTIONS,
+        max_keepalive_connections=config.GROQ_MAX_KEEPALIVE,
+        keepalive_expiry=30,
+    )
+
+
+def get_client():
+    """
+    Return the Groq client shared by every model in the process.
+
+    The client, and the `groq` package itself, are only loaded on first use
+    so importing the app and creating games stays cheap.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import httpx
+                from groq import Groq
+
+                # Retries are handled by the request scheduler.
+                _client = Groq(
+                    api_key=config.GROQ_API_KEY,
+                    base_url=config.GROQ_BASE_URL,
+                    max_retries=0,
+                    http_client=httpx.Client(
+                        limits=_limits(), timeout=httpx.Timeout(config.GROQ_TIMEOUT, connect=5)
+                    ),
+                )
+    return _client
+
+
+def get_async_client():
+    """
+    Return the AsyncGroq client shared by every async model in the process.
+
+    The client keeps a pool of keep-alive connections, so it must be used from
+    a single long-lived event loop.
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                import httpx
+                from groq import AsyncGroq
+
+                _async_client = AsyncGroq(
+                    api_key=config.GROQ_API_KEY,
+                    base_url=config.GROQ_BASE_URL,
+                    max_retries=0,
+                    http_client=httpx.AsyncClient(
+                        limits=_limits(), timeout=httpx.Timeout(config.GROQ_TIMEOUT, connect=5)
+                    ),
+                )
+    return _async_client
+
+
+def set_client(client=None, async_client=None):
+    """
+    Replace the shared clients, e.g. with a fake backend.
+    """
+    global _client, _async_client
+    with _lock:
+        _client = client
+        _async_client = async_client
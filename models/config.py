@@ -0,0 +1,62 @@
+from dotenv import load_dotenv
+import os
+
+# Read the environment once for the whole process.
+load_dotenv()
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", 100))
+GROQ_MAX_KEEPALIVE = int(os.getenv("GROQ_MAX_KEEPALIVE", 20))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", 60))
+
+ADMIN_MODEL = os.getenv("ADMIN_MODEL")
+AI_PLAYER_MODEL = os.getenv("AI_PLAYER_MODEL")
+
+# Response cache, opt-in.
+LLM_CACHE = os.getenv("LLM_CACHE", "").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 1024))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 3600))
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", 1.0))
+# Roles never cached: AI players of the same style would give away identical answers.
+LLM_CACHE_SKIP_ROLES = tuple(
+    role for role in os.getenv("LLM_CACHE_SKIP_ROLES", "ai-player,ai-player-batch").split(",") if role
+)
+
+# Detect questions repeated across every game of the process, not only within one.
+SHARED_QUESTION_INDEX = os.getenv("SHARED_QUESTION_INDEX", "").lower() in ("1", "true", "yes")
+
+# Seconds the shared rank batcher waits for other rooms before sending.
+RANK_BATCH_WINDOW = float(os.getenv("RANK_BATCH_WINDOW", 0.05))
+
+# Rooms with more answers than this are ranked in parallel chunks.
+RANK_SHARD_SIZE = int(os.getenv("RANK_SHARD_SIZE", 16))
+
+# Seconds the admin gets to rank a turn before local scores are used, and the
+# share of the local scores in the final ones.
+RANK_DEADLINE = float(os.getenv("RANK_DEADLINE", 20))
+RANK_LOCAL_WEIGHT = float(os.getenv("RANK_LOCAL_WEIGHT", 0.2))
+
+# Request scheduler, limits of 0 mean no limit.
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", 0))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", 0))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", 256))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+
+# Log a JSON record for every LLM call and turn step.
+METRICS_LOG = os.getenv("METRICS_LOG", "").lower() in ("1", "true", "yes")
+
+# Background jobs running slow game operations at once.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 32))
+
+# Questions generated ahead of the turns that ask them, at once.
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", 16))
+
+# AI answers generated as soon as a turn starts, at once.
+SPECULATION_WORKERS = int(os.getenv("SPECULATION_WORKERS", 32))
+
+# Turn deadlines: callbacks closing turns at once, and the extra seconds AI
+# players get to answer once a turn is closed.
+TURN_DEADLINE_WORKERS = int(os.getenv("TURN_DEADLINE_WORKERS", 8))
+AI_ANSWER_GRACE = float(os.getenv("AI_ANSWER_GRACE", 15))
@@ -1,17 +1,16 @@
-from groq import Groq
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+from models.clients import get_client
+from models.memory import estimate_tokens
+from models.metrics import metrics
+from models.response_cache import get_default_cache
+from models.scheduler import PRIORITY_NORMAL, get_scheduler
+import time
 
 
 class GroqModel:
     def __init__(
         self,
         model_name,
-        client=client,
+        client=None,
         system_prompt=None,
         response_format=None,
         temperature=0.5,
@@ -19,12 +18,20 @@ class GroqModel:
         top_p=0.5,
         stream=False,
         stop=None,
+        memory_policy=None,
+        prompt_hook=None,
+        cache=None,
+        usage_meter=None,
+        priority=PRIORITY_NORMAL,
+        scheduler=None,
+        labels=None,
     ):
         """
         Initialize the GroqModel with the given parameters.
 
         Args:
-            client: The Groq client to use for the model.
+            client: The Groq client to use for the model, defaults to the
+                shared client.
             model_name: The name of the model to use.
             system_prompt: The system prompt to use.
             temperature: The temperature to use.
@@ -32,8 +39,19 @@ class GroqModel:
             top_p: The nucleus sampling threshold.
             stream: Whether to stream the response.
             stop: The stop sequence to use.
+            memory_policy: The MemoryPolicy bounding `memory_chat` history.
+            prompt_hook: Called as `prompt_hook(model, messages, prompt_tokens)`
+                before every request, used to watch prompt size.
+            cache: The ResponseCache for `generate_plain_text` and
+                `tools_chat`, defaults to the shared cache if LLM_CACHE is set.
+            usage_meter: The UsageMeter counting the calls and tokens.
+            priority: Scheduling priority of the requests, see models.scheduler.
+            scheduler: The RequestScheduler every request goes through,
+                defaults to the shared scheduler.
+            labels (dict): Tags of the metrics of every request, e.g. role
+                and game_id.
         """
-        self.client = client
+        self._client = client
         self.model_name = model_name
         self.system_prompt = system_prompt
         self.temperature = temperature
@@ -42,6 +60,13 @@ class GroqModel:
         self.top_p = top_p
         self.stream = stream
         self.stop = stop
+        self.memory_policy = memory_policy
+        self.prompt_hook = prompt_hook
+        self.cache = cache if cache is not None else get_default_cache()
+        self.usage_meter = usage_meter
+        self.priority = priority
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+        self.labels = labels or {}
         self.memory = [
             {
                 "role": "system",
@@ -49,9 +74,17 @@ class GroqModel:
             }
         ] if self.system_prompt else []
 
-    def generate_plain_text(self, prompt):
+    @property
+    def client(self):
+        return self._client or get_client()
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    def _build_messages(self, prompt):
         if self.system_prompt:
-            messages = [
+            return [
                 {
                     "role": "system",
                     "content": self.system_prompt,
@@ -61,63 +94,171 @@ class GroqModel:
                     "content": prompt,
                 },
             ]
-        else:
-            messages = [
-                {"role": "user", "content": prompt},
-            ]
+        return [
+            {"role": "user", "content": prompt},
+        ]
 
-        chat_completion = self.client.chat.completions.create(
+    def _completion_kwargs(self, messages, stream=False):
+        if self.prompt_hook:
+            self.prompt_hook(self, messages, estimate_tokens(messages))
+        return dict(
             messages=messages,
             model=self.model_name,
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             response_format=self.response_format,
             top_p=self.top_p,
-            stream=self.stream,
+            stream=stream,
             stop=self.stop,
         )
 
+    def _memory_messages(self, prompt):
+        if prompt:
+            self.memory.append({"role": "user", "content": prompt})
+        if not self.memory_policy:
+            return self.memory
+        self.memory = self.memory_policy.trim(self.memory)
+        return self.memory_policy.render(self.memory)
+
+    def _remember(self, content):
+        self.memory.append({"role": "assistant", "content": content})
+        self.memory.append({"role": "user", "content": "Now give a new question without any explanation"})
+
+    def _record_call(self, started, stats, completion=None, error=None):
+        usage = getattr(completion, "usage", None)
+        if self.usage_meter is not None and not error:
+            self.usage_meter.record(usage)
+        metrics.record_llm_call(
+            self.labels,
+            latency=time.perf_counter() - started,
+            queue_time=stats.get("queue_time", 0),
+            usage=usage,
+            retries=stats.get("retries", 0),
+            error=error,
+        )
+
+    def _schedule(self, request, deadline):
+        tokens = estimate_tokens(request["messages"]) + (request.get("max_tokens") or 0)
+        return dict(priority=self.priority, deadline=deadline, tokens=tokens)
+
+    def _timeout(self, deadline):
+        if deadline is None:
+            return {}
+        return {"timeout": max(0.1, deadline - time.monotonic())}
+
+    def _create(self, request, deadline=None):
+        """
+        Send a completion request through the scheduler.
+
+        Args:
+            request (dict): The completion arguments.
+            deadline (float): `time.monotonic()` time the reply is needed by.
+        """
+        def call():
+            return self.client.chat.completions.create(**request, **self._timeout(deadline))
+
+        stats, started = {}, time.perf_counter()
+        try:
+            completion = self.scheduler.run(call, stats=stats, **self._schedule(request, deadline))
+        except Exception as e:
+            self._record_call(started, stats, error=type(e).__name__)
+            raise
+        self._record_call(started, stats, None if request.get("stream") else completion)
+        return completion
+
+    def _cache_key(self, request, use_cache=True):
+        if self.cache is None or not use_cache:
+            return None
+        return self.cache.key(request, role=self.labels.get("role"))
+
+    def generate_plain_text(self, prompt, use_cache=True, deadline=None):
+        messages = self._build_messages(prompt)
+        if self.stream:
+            return "".join(self._stream(messages, deadline))
+
+        request = self._completion_kwargs(messages)
+        key = self._cache_key(request, use_cache)
+        if key:
+            output = self.cache.get(key)
+            if output is not None:
+                return output
+
+        chat_completion = self._create(request, deadline)
+
         output = chat_completion.choices[0].message.content
+        if key:
+            self.cache.set(key, output)
         return output
-    
-    def memory_chat(self, prompt=None):
+
+    def stream_plain_text(self, prompt, deadline=None):
+        """
+        Generate a response and yield its text as the tokens arrive.
+        """
+        yield from self._stream(self._build_messages(prompt), deadline)
+
+    def memory_chat(self, prompt=None, deadline=None):
         """
         Chat with your restored memory
         """
-        if prompt:
-            self.memory.append({"role": "user", "content": prompt})
-        chat_completion = self.client.chat.completions.create(
-            messages=self.memory,
-            model=self.model_name,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            response_format=self.response_format,
-            top_p=self.top_p,
-            stream=self.stream,
-            stop=self.stop,
-        ).choices[0].message
-        self.memory.append(chat_completion)
-        self.memory.append({"role": "user", "content": "Now give a new question without any explanation"})
-        return chat_completion.content
-    
+        if self.stream:
+            return "".join(self.stream_memory_chat(prompt, deadline))
+
+        chat_completion = self._create(
+            self._completion_kwargs(self._memory_messages(prompt)), deadline
+        )
+        content = chat_completion.choices[0].message.content
+        self._remember(content)
+        return content
+
+    def stream_memory_chat(self, prompt=None, deadline=None):
+        """
+        Streaming variant of `memory_chat`, the full reply is stored in memory
+        once the stream is exhausted.
+        """
+        parts = []
+        for text in self._stream(self._memory_messages(prompt), deadline):
+            parts.append(text)
+            yield text
+        self._remember("".join(parts))
+
+    def _stream(self, messages, deadline=None):
+        chunks = self._create(self._completion_kwargs(messages, stream=True), deadline)
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def reset_memory(self):
         """
         Reset the memory of the model.
         """
         self.memory = []
 
-    def tools_chat(self, messages, tools):
-        response = (
-            self.client.chat.completions.create(
-                messages=messages,
-                model=self.model_name,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                stream=self.stream,
-                tools=tools,
-                tool_choice="auto",
-            )
-            .choices[0]
-            .message
+    def _tools_request(self, messages, tools):
+        return dict(
+            messages=messages,
+            model=self.model_name,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=False,
+            tools=tools,
+            tool_choice="auto",
         )
+
+    def _cached_message(self, key):
+        cached = self.cache.get(key) if key else None
+        if cached is None:
+            return None
+        from groq.types.chat import ChatCompletionMessage
+
+        return ChatCompletionMessage.model_validate(cached)
+
+    def tools_chat(self, messages, tools, deadline=None):
+        request = self._tools_request(messages, tools)
+        key = self._cache_key(request)
+        response = self._cached_message(key)
+        if response is None:
+            completion = self._create(request, deadline)
+            response = completion.choices[0].message
+            if key:
+                self.cache.set(key, response.model_dump(exclude_none=True))
         return response, response.tool_calls
\ No newline at end of file
@@ -0,0 +1,107 @@
+def estimate_tokens(messages):
+    """
+    Roughly estimate the prompt tokens of a list of chat messages.
+
+    Uses ~4 characters per token plus a small per-message overhead, which is
+    close enough to keep request sizes bounded without a tokenizer.
+    """
+    return sum(4 + len(message.get("content") or "") // 4 for message in messages)
+
+
+def _split_system(memory):
+    if memory and memory[0]["role"] == "system":
+        return memory[:1], memory[1:]
+    return [], memory
+
+
+def _drop_leading_replies(messages):
+    # A window should not start with an assistant reply cut off from its prompt.
+    while messages and messages[0]["role"] == "assistant":
+        messages = messages[1:]
+    return messages
+
+
+class MemoryPolicy:
+    """
+    Keep the stored conversation of `GroqModel.memory_chat` bounded.
+    """
+
+    def trim(self, memory):
+        """
+        Return the messages worth keeping, the system prompt is always kept.
+        """
+        return memory
+
+    def render(self, memory):
+        """
+        Return the messages to send for the (already trimmed) memory.
+        """
+        return memory
+
+
+class SlidingWindowMemory(MemoryPolicy):
+    def __init__(self, max_messages=12):
+        """
+        Keep only the last `max_messages` messages after the system prompt.
+        """
+        self.max_messages = max_messages
+
+    def trim(self, memory):
+        system, history = _split_system(memory)
+        return system + _drop_leading_replies(history[-self.max_messages:])
+
+
+class TokenBudgetMemory(MemoryPolicy):
+    def __init__(self, max_tokens=1024, count_tokens=estimate_tokens):
+        """
+        Drop the oldest messages until the prompt fits in `max_tokens`.
+        """
+        self.max_tokens = max_tokens
+        self.count_tokens = count_tokens
+
+    def trim(self, memory):
+        system, history = _split_system(memory)
+        budget = self.max_tokens - self.count_tokens(system)
+        start = 0
+        while start < len(history) - 1 and self.count_tokens(history[start:]) > budget:
+            start += 1
+        return system + _drop_leading_replies(history[start:])
+
+
+class CompactingMemory(MemoryPolicy):
+    def __init__(self, keep_messages=6, max_questions=50):
+        """
+        Fold old assistant replies into a compact list of already asked
+        questions and keep only the last `keep_messages` messages verbatim.
+
+        Args:
+            keep_messages: Number of recent messages kept as they are.
+            max_questions: Maximum number of old questions listed.
+        """
+        self.keep_messages = keep_messages
+        self.max_questions = max_questions
+        self.asked_questions = []
+
+    def trim(self, memory):
+        system, history = _split_system(memory)
+        if len(history) <= self.keep_messages:
+            return memory
+        kept = _drop_leading_replies(history[-self.keep_messages:])
+        self.asked_questions.extend(
+            message["content"]
+            for message in history[:len(history) - len(kept)]
+            if message["role"] == "assistant"
+        )
+        del self.asked_questions[:-self.max_questions]
+        return system + kept
+
+    def render(self, memory):
+        if not self.asked_questions:
+            return memory
+        system, history = _split_system(memory)
+        summary = {
+            "role": "system",
+            "content": "Các câu hỏi đã được hỏi, không được hỏi lại:\n"
+            + "\n".join(f"- {question}" for question in self.asked_questions),
+        }
+        return system + [summary] + history
@@ -0,0 +1,166 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+from models import config
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Labels kept out of Prometheus series to bound their number, they still
+# appear in the structured log records.
+LOG_ONLY_LABELS = ("game_id",)
+
+
+class Metrics:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        In-process counters and histograms, rendered in the Prometheus text
+        format, with optional exporters receiving one record per event.
+        """
+        self.buckets = buckets
+        self.exporters = []
+        self._counters = defaultdict(float)  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(
+            (key, str(value)) for key, value in labels.items()
+            if value is not None and key not in LOG_ONLY_LABELS
+        ))
+
+    def inc(self, name, value=1, **labels):
+        key = (name, self._key(labels))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name, value, **labels):
+        key = (name, self._key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def export(self, record):
+        """
+        Pass a record to every exporter.
+        """
+        for exporter in self.exporters:
+            exporter(record)
+
+    def record_llm_call(self, labels, latency, queue_time=0, usage=None, retries=0, error=None):
+        """
+        Record one LLM request.
+
+        Args:
+            labels (dict): Tags of the request, e.g. role and game_id.
+            latency (float): Seconds from submitting to the scheduler to reply.
+            queue_time (float): Seconds spent waiting for admission.
+            usage: The `usage` of the completion, if any.
+            retries (int): Number of retries.
+            error (str): Name of the error that failed the call.
+        """
+        self.inc("llm_requests_total", **labels)
+        self.observe("llm_request_seconds", latency, **labels)
+        self.observe("llm_queue_seconds", queue_time, **labels)
+        if retries:
+            self.inc("llm_retries_total", retries, **labels)
+        if error:
+            self.inc("llm_errors_total", error=error, **labels)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        completion_tokens = getattr(usage, "completion_tokens", None) or 0
+        if usage is not None:
+            self.inc("llm_prompt_tokens_total", prompt_tokens, **labels)
+            self.inc("llm_completion_tokens_total", completion_tokens, **labels)
+        if self.exporters:
+            self.export({
+                "event": "llm_call",
+                **labels,
+                "latency": round(latency, 4),
+                "queue_time": round(queue_time, 4),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "retries": retries,
+                "error": error,
+            })
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        Time a block of code as `<name>_seconds`, labelled with `labels`.
+        """
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(f"{name}_seconds", duration, **labels)
+            if error:
+                self.inc(f"{name}_errors_total", error=error, **labels)
+            if self.exporters:
+                self.export({"event": name, **labels, "duration": round(duration, 4), "error": error})
+
+    def render_prometheus(self):
+        """
+        Render every metric in the Prometheus text exposition format.
+        """
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._histograms.items())
+
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{fmt(labels)} {value:g}")
+        for (name, labels), (counts, total, count) in histograms:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                lines.append(f"{name}_bucket{fmt(labels, [('le', f'{bound:g}')])} {cumulative}")
+            lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{fmt(labels)} {total:g}")
+            lines.append(f"{name}_count{fmt(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class JsonLogExporter:
+    def __init__(self, logger_name="llm_imposter.metrics"):
+        """
+        Write every metrics record as one JSON line to a logger.
+        """
+        self.logger = logging.getLogger(logger_name)
+
+    def __call__(self, record):
+        self.logger.info(json.dumps(record, ensure_ascii=False))
+
+
+metrics = Metrics()
+if config.METRICS_LOG:
+    logging.basicConfig(level=logging.INFO)
+    metrics.exporters.append(JsonLogExporter())
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from models import config
+
+
+class ResponseCache:
+    def __init__(self, max_entries=1024, ttl=3600, path=None, max_temperature=1.0, skip_roles=()):
+        """
+        Cache of LLM responses keyed on the full request.
+
+        Args:
+            max_entries: Size of the in-memory LRU tier.
+            ttl: Seconds an entry stays valid, None to never expire.
+            path: Path of an optional SQLite file used as a second tier.
+            max_temperature: Requests sampled above this temperature are not
+                cached, their output is meant to differ every time.
+            skip_roles: Roles of the models whose requests are not cached.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.skip_roles = skip_roles
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+
+    def key(self, request, role=None):
+        """
+        Return the cache key of a request, or None if it must not be cached.
+
+        Args:
+            request (dict): The keyword arguments of the completion call.
+            role (str): Role of the calling model, see `skip_roles`.
+        """
+        if (request.get("stream") or role in self.skip_roles
+                or (request.get("temperature") or 0) > self.max_temperature):
+            with self._lock:
+                self.bypasses += 1
+            return None
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (entry[0] is None or entry[0] > now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "entries": len(self._entries),
+        }
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Return the process-wide response cache, or None unless LLM_CACHE is set.
+    """
+    global _default_cache
+    if not config.LLM_CACHE:
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache(
+                    max_entries=config.LLM_CACHE_SIZE,
+                    ttl=config.LLM_CACHE_TTL,
+                    path=config.LLM_CACHE_PATH,
+                    max_temperature=config.LLM_CACHE_MAX_TEMPERATURE,
+                    skip_roles=config.LLM_CACHE_SKIP_ROLES,
+                )
+    return _default_cache
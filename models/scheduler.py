@@ -0,0 +1,219 @@
+import asyncio
+import bisect
+import itertools
+import random
+import threading
+import time
+
+from models import config
+
+# Lower runs first.
+PRIORITY_HIGH = 0  # Question generation and ranking, on the critical path
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2  # AI player answers
+
+
+class SchedulerOverloaded(Exception):
+    """
+    Raised when too many LLM requests are already waiting.
+    """
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when an LLM request cannot complete before its deadline.
+    """
+
+
+class TokenBucket:
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """
+        Seconds until `amount` is available, 0 if it already is.
+        """
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0
+        return (amount - self.level) / self.rate
+
+
+def _is_retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ in (
+        "APITimeoutError",
+        "APIConnectionError",
+    )
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        requests_per_minute=None,
+        tokens_per_minute=None,
+        max_queue=256,
+        max_retries=4,
+        base_delay=0.5,
+        max_delay=8,
+    ):
+        """
+        Admit LLM requests within the provider rate limits and retry the ones
+        that fail transiently.
+
+        Waiting requests are admitted by priority, then arrival order. When
+        `max_queue` requests are already waiting new ones are rejected with
+        SchedulerOverloaded instead of piling up.
+
+        Args:
+            requests_per_minute: Request rate limit, None for no limit.
+            tokens_per_minute: Token rate limit, None for no limit.
+            max_queue: Maximum number of requests waiting for admission.
+            max_retries: Retries for 429s, timeouts and server errors.
+            base_delay: First backoff delay in seconds.
+            max_delay: Maximum backoff delay in seconds.
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._queue = []  # Sorted (priority, seq) of waiting requests
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def run(self, call, priority=PRIORITY_NORMAL, deadline=None, tokens=0, stats=None):
+        """
+        Run `call()` once admitted, retrying transient failures.
+
+        Args:
+            call: Callable doing the request.
+            priority: One of the PRIORITY_* classes.
+            deadline: `time.monotonic()` time by which the call must be done.
+            tokens: Estimated tokens used by the request.
+            stats (dict): Filled with the `queue_time` and `retries` of the call.
+        """
+        stats = {} if stats is None else stats
+        stats.update(queue_time=0, retries=0)
+        for attempt in itertools.count():
+            stats["retries"] = attempt
+            queued = time.perf_counter()
+            self.admit(priority, deadline, tokens)
+            stats["queue_time"] += time.perf_counter() - queued
+            try:
+                return call()
+            except Exception as e:
+                time.sleep(self._backoff(e, attempt, deadline))
+
+    async def run_async(self, call, priority=PRIORITY_NORMAL, deadline=None, tokens=0, stats=None):
+        """
+        Like `run`, for a coroutine function `call`.
+        """
+        stats = {} if stats is None else stats
+        stats.update(queue_time=0, retries=0)
+        for attempt in itertools.count():
+            stats["retries"] = attempt
+            queued = time.perf_counter()
+            await asyncio.to_thread(self.admit, priority, deadline, tokens)
+            stats["queue_time"] += time.perf_counter() - queued
+            try:
+                return await call()
+            except Exception as e:
+                await asyncio.sleep(self._backoff(e, attempt, deadline))
+
+    def _backoff(self, error, attempt, deadline):
+        """
+        Return the delay before retrying, or re-raise the error if it is final.
+        """
+        if not _is_retryable(error) or attempt >= self.max_retries:
+            raise error
+        delay = _retry_after(error)
+        if delay is None:
+            # Full jitter keeps many games from retrying in lockstep.
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            raise DeadlineExceeded("LLM request could not be retried before its deadline.") from error
+        print(f"LLM request failed ({error}), retrying in {delay:.2f}s... {attempt + 1}/{self.max_retries}")
+        return delay
+
+    def admit(self, priority=PRIORITY_NORMAL, deadline=None, tokens=0):
+        """
+        Block until the request may be sent.
+        """
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                raise SchedulerOverloaded("Too many LLM requests are waiting, try again later.")
+            bisect.insort(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        raise DeadlineExceeded("LLM request was not admitted before its deadline.")
+                    wait = None
+                    if self._queue[0] == ticket:
+                        wait = self._reserve(tokens, now)
+                        if wait == 0:
+                            return
+                    if deadline is not None:
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._cond.wait(wait)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+
+    def _reserve(self, tokens, now):
+        wait = 0
+        for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                wait = max(wait, bucket.wait_time(amount))
+        if wait:
+            return wait
+        if self.requests is not None:
+            self.requests.level -= 1
+        if self.tokens is not None:
+            self.tokens.level -= min(tokens, self.tokens.capacity)
+        return 0
+
+    def __len__(self):
+        return len(self._queue)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Return the RequestScheduler shared by every model in the process.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler(
+                    requests_per_minute=config.LLM_REQUESTS_PER_MINUTE,
+                    tokens_per_minute=config.LLM_TOKENS_PER_MINUTE,
+                    max_queue=config.LLM_MAX_QUEUE,
+                    max_retries=config.LLM_MAX_RETRIES,
+                )
+    return _scheduler
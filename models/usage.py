@@ -0,0 +1,42 @@
+import threading
+
+
+class UsageMeter:
+    def __init__(self):
+        """
+        Thread-safe counters of LLM calls and tokens.
+        """
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage=None, share=1):
+        """
+        Count one call and the token usage reported by the API, if any.
+
+        Args:
+            usage: The `usage` of the completion.
+            share: Fraction of the call to count, for calls batching the work
+                of several games.
+        """
+        with self._lock:
+            self.calls += share
+            if usage is not None:
+                self.prompt_tokens += (usage.prompt_tokens or 0) * share
+                self.completion_tokens += (usage.completion_tokens or 0) * share
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def since(self, snapshot):
+        """
+        Return the usage accumulated since an earlier `snapshot()`.
+        """
+        now = self.snapshot()
+        return {key: now[key] - snapshot[key] for key in now}
@@ -1,71 +1,286 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from models import config
 from models.groq_model import GroqModel
-from dotenv import load_dotenv
+from models.memory import CompactingMemory
+from models.scheduler import PRIORITY_HIGH, SchedulerOverloaded
+from players_manager.local_scorer import LocalScorer, blend
+from players_manager.question_index import QuestionIndex, shared_question_index
+from players_manager.score_parser import extract_scores
 from prompts.admin import admin_ask, admin_rank
-import ast
-import os
 
-load_dotenv()
+
+def _fit_scale(pairs, min_scale=0.5, max_scale=2):
+    """
+    Fit `reference = scale * score + offset` on the (score, reference) pairs
+    of the anchor answers of a chunk.
+    """
+    if not pairs:
+        return 1, 0
+    xs, ys = zip(*pairs)
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    scale = 1
+    # Anchors scored too close together say nothing about the scale.
+    if len(pairs) > 1 and variance >= 25 * len(pairs):
+        scale = sum((x - mean_x) * (y - mean_y) for x, y in pairs) / variance
+        scale = min(max_scale, max(min_scale, scale))
+    return scale, mean_y - scale * mean_x
 
 
 class Admin:
     def __init__(
         self,
-        model_name=os.getenv("ADMIN_MODEL"),
+        model_name=config.ADMIN_MODEL,
         ask_system_prompt=admin_ask,
         rank_system_prompt=admin_rank,
+        memory_policy=None,
+        prompt_hook=None,
+        question_index=None,
+        shared_index=shared_question_index,
+        max_regenerations=3,
+        ask_usage_meter=None,
+        rank_usage_meter=None,
+        rank_batcher=None,
+        game_id=None,
+        shard_size=config.RANK_SHARD_SIZE,
+        anchors=2,
+        rank_concurrency=32,
+        local_scorer=None,
+        local_weight=config.RANK_LOCAL_WEIGHT,
     ):
-        self.ask_model = GroqModel(
-            model_name=model_name,
-            system_prompt=ask_system_prompt,
+        self.question_index = question_index if question_index is not None else QuestionIndex()
+        self.shared_index = shared_index
+        self.max_regenerations = max_regenerations
+        self.model_name = model_name
+        self.ask_system_prompt = ask_system_prompt
+        self.rank_system_prompt = rank_system_prompt
+        self.memory_policy = memory_policy
+        self.prompt_hook = prompt_hook
+        self.ask_usage_meter = ask_usage_meter
+        self.rank_usage_meter = rank_usage_meter
+        self.rank_batcher = rank_batcher
+        self.game_id = game_id
+        self.shard_size = shard_size
+        self.anchors = anchors
+        self.rank_concurrency = rank_concurrency
+        self.local_scorer = local_scorer if local_scorer is not None else LocalScorer()
+        self.local_weight = local_weight
+        self.rank_fallbacks = 0  # Answers of the last ranking scored locally
+        self._sized_rank_models = {}  # max_tokens -> GroqModel
+        self._lock = threading.Lock()
+
+    # The models are only built once the admin first asks or ranks.
+    @cached_property
+    def ask_model(self):
+        return GroqModel(
+            model_name=self.model_name,
+            system_prompt=self.ask_system_prompt,
             temperature=2,
             max_tokens=1028,
             top_p=1,
             stream=False,
             stop=None,
+            memory_policy=self.memory_policy or CompactingMemory(max_questions=10),
+            prompt_hook=self.prompt_hook,
+            usage_meter=self.ask_usage_meter,
+            priority=PRIORITY_HIGH,
+            labels={"role": "admin-ask", "game_id": self.game_id},
         )
 
-        self.rank_model = GroqModel(
-            model_name=model_name,
-            system_prompt=rank_system_prompt,
+    @cached_property
+    def rank_model(self):
+        return self._build_rank_model(max_tokens=128)
+
+    def _build_rank_model(self, max_tokens):
+        return GroqModel(
+            model_name=self.model_name,
+            system_prompt=self.rank_system_prompt,
             temperature=0.5,
-            max_tokens=128,
+            max_tokens=max_tokens,
             top_p=0.5,
             stream=False,
             stop=None,
+            response_format={"type": "json_object"},
+            prompt_hook=self.prompt_hook,
+            usage_meter=self.rank_usage_meter,
+            priority=PRIORITY_HIGH,
+            labels={"role": "admin-rank", "game_id": self.game_id},
         )
 
+    def _rank_model_for(self, count):
+        """
+        Return a rank model whose output budget fits `count` scores.
+        """
+        max_tokens = -(-(32 + 8 * count) // 64) * 64
+        if max_tokens <= 128:
+            return self.rank_model
+        with self._lock:
+            model = self._sized_rank_models.get(max_tokens)
+            if model is None:
+                model = self._sized_rank_models[max_tokens] = self._build_rank_model(max_tokens)
+        return model
+
     def ask(self):
         """
         Create a question for the current turn
 
+        Questions that duplicate one already asked in this game (or in any
+        game, when a shared index is used) are regenerated.
+
         Returns:
             str: The generated question.
         """
         question = self.ask_model.memory_chat(prompt="Hãy trả lại một câu hỏi duy nhất bằng Tiếng Việt, đừng nói gì khác, đảm bảo mỗi câu hỏi chỉ được hỏi một lần.")
+        for i in range(self.max_regenerations):
+            if not self._is_duplicate(question):
+                break
+            print(f"Duplicate question, regenerating... {i + 1}/{self.max_regenerations}")
+            question = self.ask_model.memory_chat(prompt="Câu hỏi này đã được hỏi rồi, hãy đưa ra một câu hỏi hoàn toàn khác.")
+
+        self.question_index.add(question)
+        if self.shared_index is not None:
+            self.shared_index.add(question)
         return question
 
-    def rank(self, question, answers, retry=5):
+    def _is_duplicate(self, question):
+        if self.question_index.is_duplicate(question):
+            return True
+        return self.shared_index is not None and self.shared_index.is_duplicate(question)
+
+    def rank(self, question, answers, retry=5, deadline=None, local_scores=None):
         """
         Rank the answers provided by players.
 
+        Scores that are missing or invalid in the model output are asked for
+        again, only for the answers that lack one. With a rank batcher the
+        first attempt is batched together with other games. Rooms with more
+        than `shard_size` answers are ranked in parallel chunks.
+
+        Model scores are blended with the scores of the local scorer, which
+        also stand in for the answers the model has not scored by `deadline`.
+
         Args:
             question (str): The question to rank the answers for.
             answers (list): List of answers provided by players.
+            retry (int): Maximum number of follow-up calls for missing scores.
+            deadline (float): `time.monotonic()` time the scores are needed by.
+            local_scores (list): Scores of the local scorer, if already known.
 
         Returns:
             list: Probability scores for each answer.
         """
-        prompt = f"Câu hỏi: {question}\n\n"
-        for i, answer in enumerate(answers):
-            prompt += f"Đáp án {i + 1}: {answer}\n"
-        scores = self.rank_model.generate_plain_text(prompt)
+        if local_scores is None:
+            local_scores = self.local_scores(question, answers)
+        if self.shard_size and len(answers) > self.shard_size:
+            scores = self._rank_sharded(question, answers, retry, deadline)
+        else:
+            scores = [None] * len(answers)
+            if self.rank_batcher is not None and answers:
+                scores = self.rank_batcher.rank(
+                    question, answers, usage_meter=self.rank_usage_meter, deadline=deadline
+                )
+            scores = self._fill_scores(question, answers, scores, retry, deadline)
 
-        for i in range(retry):
+        self.rank_fallbacks = scores.count(None)
+        if self.rank_fallbacks:
+            print(f"Could not score {self.rank_fallbacks} answers, using local scores for them.")
+        return blend(scores, local_scores, self.local_weight)
+
+    def local_scores(self, question, answers):
+        """
+        Score the answers with the local scorer.
+
+        Returns:
+            list: One score per answer, or None if the local scorer failed.
+        """
+        try:
+            return self.local_scorer.score(question, answers)
+        except Exception as e:
+            print(f"Local scorer failed: {e}")
+            return None
+
+    def _fill_scores(self, question, answers, scores, retry, deadline=None):
+        """
+        Ask the model for the scores still None, retrying the ones it misses.
+
+        Gives up at once when the scheduler is overloaded, the scores left
+        None are then the local ones, see `blend`.
+        """
+        scores = list(scores)
+        for attempt in range(retry + 1):
+            missing = [i for i, score in enumerate(scores) if score is None]
+            if not missing:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"No time left to score {len(missing)} answers.")
+                break
+            if attempt:
+                print(f"Retrying {len(missing)} missing scores... {attempt}/{retry}")
             try:
-                scores = ast.literal_eval(scores)
+                # A retry must reach the model, not replay a cached bad output.
+                output = self._rank_model_for(len(missing)).generate_plain_text(
+                    self._rank_prompt(question, [answers[i] for i in missing]),
+                    use_cache=not attempt,
+                    deadline=deadline,
+                )
+            except SchedulerOverloaded as e:
+                # Retrying would only add load, the local scores fill the gaps.
+                print(f"Not ranking {len(missing)} answers, the model is overloaded: {e}")
                 break
             except Exception as e:
-                print(f"Error parsing scores: {e}")
-                scores = self.rank_model.generate_plain_text(prompt)
-                print(f"Retrying... {i + 1}/{retry}")
+                print(f"Error ranking answers: {e}")
+                continue
+            for i, score in zip(missing, extract_scores(output, len(missing))):
+                scores[i] = score
         return scores
+
+    def _rank_sharded(self, question, answers, retry, deadline=None):
+        """
+        Rank a large room in chunks of `shard_size` answers scored in parallel.
+
+        Every chunk also scores the same few anchor answers. The scores of a
+        chunk are then mapped linearly so that its anchors land on their
+        average score over all chunks, which puts the chunks on one scale.
+
+        Returns:
+            list: One score per answer, None where no chunk produced one.
+        """
+        n = len(answers)
+        anchors = sorted({k * n // (self.anchors + 1) for k in range(1, self.anchors + 1)})
+        anchor_set = set(anchors)
+        rest = [i for i in range(n) if i not in anchor_set]
+        size = max(1, self.shard_size - len(anchors))
+        chunks = [anchors + rest[k:k + size] for k in range(0, len(rest), size)]
+
+        def rank_chunk(chunk):
+            return self._fill_scores(
+                question, [answers[i] for i in chunk], [None] * len(chunk), retry, deadline
+            )
+
+        with ThreadPoolExecutor(max_workers=min(len(chunks), self.rank_concurrency)) as executor:
+            results = list(executor.map(rank_chunk, chunks))
+
+        merged = [None] * n
+        for p, i in enumerate(anchors):
+            values = [scores[p] for scores in results if scores[p] is not None]
+            if values:
+                merged[i] = round(sum(values) / len(values))
+        for chunk, scores in zip(chunks, results):
+            scale, offset = _fit_scale([
+                (scores[p], merged[i])
+                for p, i in enumerate(anchors)
+                if scores[p] is not None and merged[i] is not None
+            ])
+            for p in range(len(anchors), len(chunk)):
+                if scores[p] is not None:
+                    merged[chunk[p]] = min(100, max(0, round(scale * scores[p] + offset)))
+        return merged
+
+    def _rank_prompt(self, question, answers):
+        prompt = f"Câu hỏi: {question}\n\n"
+        for i, answer in enumerate(answers):
+            prompt += f"Đáp án {i + 1}: {answer}\n"
+        return prompt
@@ -1,52 +1,67 @@
+from functools import cached_property
+from models import config
 from models.groq_model import GroqModel
+from models.scheduler import PRIORITY_LOW
 from players_manager.player import Player
-from prompts.ai_player import system_prompt
-from dotenv import load_dotenv
+from prompts.ai_player import batch_system_prompt, system_prompt
+import json
 import random
-import os
 
-load_dotenv()
+
+# Personalities an AI player answers with.
+STYLES = [
+    "nhàm chán",
+    "hài hước",
+    "rảnh rỗi",
+    "vui vẻ",
+    "thích chơi bời",
+    "nghiêm túc",
+    "chăm học",
+    "thích đùa giỡn",
+    "thiếu kiên nhẫn",
+    "học giỏi",
+    "thích khám phá",
+    "thích tìm hiểu",
+]
 
 
 class AIPlayer(Player):
     def __init__(
-        self, name, model_name=os.getenv("AI_PLAYER_MODEL"), system_prompt=system_prompt
+        self, name, model_name=config.AI_PLAYER_MODEL, system_prompt=system_prompt, style=None
     ):
         super().__init__(name)
-        self.style = random.choice(
-            [
-                "nhàm chán",
-                "hài hước",
-                "rảnh rỗi",
-                "vui vẻ",
-                "thích chơi bời",
-                "nghiêm túc",
-                "chăm học",
-                "thích đùa giỡn",
-                "thiếu kiên nhẫn",
-                "học giỏi",
-                "thích khám phá",
-                "thích tìm hiểu",
-            ]
-        )
-        self.model = GroqModel(
-            model_name=model_name, system_prompt=system_prompt.format(style=self.style),
+        self.style = style or random.choice(STYLES)
+        self.model_name = model_name
+        self.system_prompt = system_prompt
+        self.usage_meter = None
+        self.game_id = None
+
+    @cached_property
+    def model(self):
+        # Built on the first answer, joining a game costs no model setup.
+        return GroqModel(
+            model_name=self.model_name,
+            system_prompt=self.system_prompt.format(style=self.style),
             temperature=0.5,
             max_tokens=128,
             top_p=0.5,
+            usage_meter=self.usage_meter,
+            priority=PRIORITY_LOW,
+            labels={"role": "ai-player", "game_id": self.game_id},
         )
 
-    def answer(self, question):
+    def answer(self, question, deadline=None):
         """
         Generate a response to the given question using the AI model.
 
         Args:
             question (str): The question to ask the AI model.
+            deadline (float): `time.monotonic()` time the answer is needed by.
 
         Returns:
             str: The generated response from the AI model.
         """
-        response = self.model.generate_plain_text(question)
+        response = self.model.generate_plain_text(question, deadline=deadline)
         return response
 
     def submit(self):
@@ -54,3 +69,48 @@ class AIPlayer(Player):
         Submit the AI player's answer to the game.
         """
         pass
+
+
+def answer_batch(
+    players,
+    question,
+    model_name=config.AI_PLAYER_MODEL,
+    usage_meter=None,
+    deadline=None,
+    game_id=None,
+):
+    """
+    Answer a question for several AI players with a single completion.
+
+    Args:
+        players (list): The AIPlayer instances, each answering in its own style.
+        question (str): The question to answer.
+        deadline (float): `time.monotonic()` time the answers are needed by.
+
+    Returns:
+        list: One answer per player, None where the output had no answer.
+    """
+    model = GroqModel(
+        model_name=model_name,
+        system_prompt=batch_system_prompt,
+        response_format={"type": "json_object"},
+        temperature=0.5,
+        max_tokens=128 * len(players),
+        top_p=0.5,
+        usage_meter=usage_meter,
+        priority=PRIORITY_LOW,
+        labels={"role": "ai-player-batch", "game_id": game_id},
+    )
+    prompt = f"Câu hỏi: {question}\n\n"
+    for i, player in enumerate(players):
+        prompt += f"Người chơi {i + 1}: tính cách {player.style}\n"
+
+    try:
+        answers = json.loads(model.generate_plain_text(prompt, deadline=deadline)).get("answers", [])
+    except Exception as e:
+        print(f"Error answering for {len(players)} AI players: {e}")
+        answers = []
+    if not isinstance(answers, list) or len(answers) > len(players):
+        return [None] * len(players)
+    answers = [answer if isinstance(answer, str) and answer.strip() else None for answer in answers]
+    return answers + [None] * (len(players) - len(answers))
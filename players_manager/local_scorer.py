@@ -0,0 +1,173 @@
+import re
+import unicodedata
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+|[^\w\s]+")
+
+# Lowercase letters carrying Vietnamese diacritics.
+_DIACRITICS = (
+    "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ"
+)
+# Chat abbreviations, fillers and emoticons people type and models rarely do.
+_SLANG = np.array(sorted({
+    "k", "ko", "kh", "hok", "hông", "hong", "khum", "hem", "j", "z", "v", "zậy", "dzậy",
+    "đc", "dc", "bt", "bít", "ms", "mk", "mik", "mn", "nma", "nhma", "vs", "ntn",
+    "ak", "ạk", "á", "nha", "nhỉ", "hả", "ơi", "ừ", "ừm", "uh", "ờ", "ok", "oke",
+    "haha", "hihi", "hehe", "kk", "kkk", "lol", "vl", "vcl", "=))", ":))", ":)", ":v", "=)",
+}))
+
+_TABLE_SIZE = 0x1F00
+_PUNCT, _DIACRITIC, _UPPER, _LETTER = 1, 2, 4, 8
+
+
+def _char_table():
+    table = np.zeros(_TABLE_SIZE, dtype=np.uint8)
+    for code in range(_TABLE_SIZE):
+        char = chr(code)
+        if unicodedata.category(char).startswith("P"):
+            table[code] |= _PUNCT
+        if char.isalpha():
+            table[code] |= _LETTER
+        if char.isupper():
+            table[code] |= _UPPER
+        if char.lower() in _DIACRITICS:
+            table[code] |= _DIACRITIC
+    table[_TABLE_SIZE - 1] = 0  # Every code point past the table maps here
+    return table
+
+
+_CHARS = _char_table()
+
+# Weights of the features, hand tuned on the answers of past games: tidy,
+# complete and generic answers look like AI, slang and sloppy typing like a
+# human, and answers off the question like a human trying to pass as AI.
+_WEIGHTS = np.array([
+    0.6,   # log of the number of words
+    -4.0,  # punctuation per character
+    1.2,   # ends with sentence punctuation
+    0.8,   # starts with a capital letter
+    2.5,   # letters carrying diacritics, per letter
+    -6.0,  # slang words, per word
+    2.0,   # similarity to the other answers
+    1.5,   # words shared with the question, per word
+])
+_BIAS = -2.5
+
+
+def _text(answer):
+    if answer is None:
+        return ""
+    return answer if isinstance(answer, str) else str(answer)
+
+
+class LocalScorer:
+    def __init__(self, weights=_WEIGHTS, bias=_BIAS):
+        """
+        Score how AI-like answers look from their wording alone, without a
+        model call.
+
+        Lexical and stylistic features of a whole room are computed at once
+        with NumPy, then combined by a fixed logistic model. Scores are rough,
+        they give an instant ranking before the admin's and fill in when the
+        admin cannot rank in time.
+
+        Args:
+            weights: Weight of each feature, see `features`.
+            bias: Offset of the logistic model.
+        """
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = bias
+
+    def features(self, question, answers):
+        """
+        Return the feature matrix of `answers`, one row per answer.
+        """
+        n = len(answers)
+        texts = [unicodedata.normalize("NFC", _text(answer)).strip() for answer in answers]
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=n)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        # Character classes of every answer, counted per answer.
+        codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+        flags = _CHARS[np.minimum(codes, _TABLE_SIZE - 1)]
+        chars = lengths.clip(min=1)
+        punct = self._per_answer(flags & _PUNCT > 0, starts, lengths)
+        letters = self._per_answer(flags & _LETTER > 0, starts, lengths)
+        diacritics = self._per_answer(flags & _DIACRITIC > 0, starts, lengths)
+        last = codes[np.maximum(starts + lengths - 1, 0)] if codes.size else np.zeros(n, np.uint32)
+        first = codes[np.minimum(starts, max(codes.size - 1, 0))] if codes.size else last
+        ends_sentence = np.isin(last, [ord("."), ord("!"), ord("?")]) & (lengths > 0)
+        starts_upper = (_CHARS[np.minimum(first, _TABLE_SIZE - 1)] & _UPPER > 0) & (lengths > 0)
+
+        # Words of every answer, flattened with the answer each belongs to.
+        words = [_TOKEN.findall(text.lower()) for text in texts]
+        counts = np.fromiter((len(w) for w in words), dtype=np.int64, count=n)
+        owners = np.repeat(np.arange(n), counts)
+        tokens = np.array([token for w in words for token in w], dtype=str)
+        vocabulary, ids = np.unique(tokens, return_inverse=True)
+        ids = ids.ravel()
+        slang = np.bincount(owners, weights=np.isin(vocabulary, _SLANG)[ids], minlength=n)
+        question_words = _TOKEN.findall(unicodedata.normalize("NFC", question or "").lower())
+        on_topic = np.bincount(
+            owners, weights=np.isin(vocabulary, question_words)[ids], minlength=n
+        )
+
+        # Cosine similarity of each answer's bag of words to the bag of all
+        # the other answers, from the sparse (answer, word) counts.
+        pairs, pair_counts = np.unique(owners * len(vocabulary) + ids, return_counts=True)
+        pair_owners, pair_words = np.divmod(pairs, max(len(vocabulary), 1))
+        totals = np.bincount(ids, minlength=len(vocabulary))
+        dot = np.bincount(pair_owners, weights=pair_counts * totals[pair_words], minlength=n)
+        squares = np.bincount(pair_owners, weights=pair_counts ** 2, minlength=n)
+        total_squares = float(totals @ totals)
+        overlap = dot - squares  # Bag of the answer times bag of the others
+        other_squares = total_squares - 2 * dot + squares
+        similarity = overlap / np.maximum(np.sqrt(squares * other_squares), 1e-9)
+
+        word_counts = counts.clip(min=1)
+        return np.column_stack([
+            np.log1p(counts),
+            punct / chars,
+            ends_sentence,
+            starts_upper,
+            diacritics / letters.clip(min=1),
+            slang / word_counts,
+            similarity,
+            on_topic / word_counts,
+        ])
+
+    @staticmethod
+    def _per_answer(mask, starts, lengths):
+        # Differences of the running count, zero for empty answers wherever they are.
+        running = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+        return running[starts + lengths] - running[starts]
+
+    def score(self, question, answers):
+        """
+        Score `answers` to `question` from 0 (human) to 100 (AI).
+
+        Returns:
+            list: One integer score per answer, in order.
+        """
+        if not answers:
+            return []
+        logits = self.features(question, answers) @ self.weights + self.bias
+        scores = np.rint(100 / (1 + np.exp(-logits))).astype(int)
+        # Empty answers are the least AI-like of all.
+        scores[[not _text(answer).strip() for answer in answers]] = 0
+        return scores.tolist()
+
+
+def blend(model_scores, local_scores, weight, default=50):
+    """
+    Mix admin scores with local scores, `weight` being the share of the local
+    ones. Answers the admin did not score take the local score, or `default`
+    when there are no local scores.
+    """
+    if local_scores is None:
+        return [default if score is None else round(score) for score in model_scores]
+    return [
+        local if score is None else round((1 - weight) * score + weight * local)
+        for score, local in zip(model_scores, local_scores)
+    ]
@@ -0,0 +1,124 @@
+import random
+import re
+import threading
+import unicodedata
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+
+from models import config
+
+_PRIME = (1 << 61) - 1
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(text):
+    """
+    Normalize a question so trivial differences (case, punctuation, spacing,
+    Unicode composition) do not matter.
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _NON_WORD.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=None)
+def _permutations(num_perm, seed):
+    rng = random.Random(seed)
+    return tuple(
+        (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+    )
+
+
+class QuestionIndex:
+    def __init__(self, threshold=0.6, num_perm=64, bands=16, ngram=3, seed=1):
+        """
+        Index of asked questions that detects exact and near-duplicates.
+
+        Exact duplicates are caught by a set of normalized texts. Near
+        duplicates use MinHash signatures over character n-grams, bucketed by
+        LSH bands so a lookup only compares against a few candidates.
+
+        Args:
+            threshold: Estimated Jaccard similarity at which two questions
+                count as duplicates.
+            num_perm: Number of hash functions in a signature.
+            bands: Number of LSH bands, must divide `num_perm`.
+            ngram: Character n-gram size.
+            seed: Seed for the hash functions.
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self._perms = _permutations(num_perm, seed)
+        self._exact = set()
+        self._buckets = defaultdict(list)
+        self._signatures = []
+        self._lock = threading.Lock()
+
+    def _signature(self, normalized):
+        padded = f" {normalized} "
+        shingles = {
+            zlib.crc32(padded[i:i + self.ngram].encode())
+            for i in range(max(1, len(padded) - self.ngram + 1))
+        }
+        return tuple(min((a * h + b) % _PRIME for h in shingles) for a, b in self._perms)
+
+    def _band_keys(self, signature):
+        return [
+            (band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def is_duplicate(self, question):
+        """
+        Check whether the question, or a close variant, was already asked.
+        """
+        normalized = normalize_question(question)
+        signature = self._signature(normalized)
+        with self._lock:
+            return self._is_duplicate(normalized, signature)
+
+    def _is_duplicate(self, normalized, signature):
+        if normalized in self._exact:
+            return True
+        seen = set()
+        for key in self._band_keys(signature):
+            for idx in self._buckets.get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                other = self._signatures[idx]
+                same = sum(1 for x, y in zip(signature, other) if x == y)
+                if same / self.num_perm >= self.threshold:
+                    return True
+        return False
+
+    def add(self, question):
+        """
+        Add a question to the index.
+
+        Returns:
+            bool: False if the question was a duplicate and was not added.
+        """
+        normalized = normalize_question(question)
+        signature = self._signature(normalized)
+        with self._lock:
+            if self._is_duplicate(normalized, signature):
+                return False
+            self._exact.add(normalized)
+            self._signatures.append(signature)
+            idx = len(self._signatures) - 1
+            for key in self._band_keys(signature):
+                self._buckets[key].append(idx)
+        return True
+
+    def __len__(self):
+        return len(self._signatures)
+
+
+# Optional index shared by every game in the process.
+shared_question_index = QuestionIndex() if config.SHARED_QUESTION_INDEX else None
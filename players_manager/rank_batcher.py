@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from types import SimpleNamespace
+
+from models import config
+from models.groq_model import GroqModel
+from models.scheduler import PRIORITY_HIGH
+from models.usage import UsageMeter
+from players_manager.score_parser import extract_scores
+from prompts.admin import admin_rank_batch
+
+
+class RankBatcher:
+    def __init__(
+        self,
+        window=0.05,
+        max_batch=8,
+        model_name=config.ADMIN_MODEL,
+        system_prompt=admin_rank_batch,
+        max_workers=4,
+    ):
+        """
+        Group ranking requests of several games into a single completion.
+
+        Requests arriving within `window` seconds of the first pending one are
+        sent together, up to `max_batch` rooms per call.
+
+        Args:
+            window: Seconds to wait for more rooms before sending a batch.
+            max_batch: Maximum number of rooms ranked in one call.
+            model_name: The name of the model to use.
+            system_prompt: The system prompt for batched ranking.
+            max_workers: Number of batches in flight at once.
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.model_name = model_name
+        self.system_prompt = system_prompt
+        self._pending = []  # (question, answers, usage_meter, future)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rank-batch")
+
+    def rank(self, question, answers, usage_meter=None, deadline=None):
+        """
+        Rank the answers of one room as part of the next batch.
+
+        Args:
+            deadline: `time.monotonic()` time after which the batch is not
+                waited for.
+
+        Returns:
+            list: One score per answer, None where the batch had no valid score.
+        """
+        future = Future()
+        with self._cond:
+            self._pending.append((question, answers, usage_meter, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        timeout = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            print("Rank batch did not finish in time.")
+            return [None] * len(answers)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            self._executor.submit(self._rank_batch, batch)
+
+    def _rank_batch(self, batch):
+        meter = UsageMeter()
+        model = GroqModel(
+            model_name=self.model_name,
+            system_prompt=self.system_prompt,
+            temperature=0.5,
+            max_tokens=sum(8 * len(answers) for _, answers, _, _ in batch) + 32,
+            top_p=0.5,
+            response_format={"type": "json_object"},
+            usage_meter=meter,
+            priority=PRIORITY_HIGH,
+            labels={"role": "admin-rank-batch"},
+        )
+        prompt = ""
+        for k, (question, answers, _, _) in enumerate(batch):
+            prompt += f"Phòng {k + 1}\nCâu hỏi: {question}\n"
+            for i, answer in enumerate(answers):
+                prompt += f"Đáp án {i + 1}: {answer}\n"
+            prompt += "\n"
+
+        try:
+            rooms = json.loads(model.generate_plain_text(prompt)).get("rooms", [])
+        except Exception as e:
+            print(f"Error ranking batch of {len(batch)} rooms: {e}")
+            rooms = []
+
+        usage = SimpleNamespace(**meter.snapshot())
+        for k, (_, answers, usage_meter, future) in enumerate(batch):
+            if usage_meter is not None and usage.calls:
+                usage_meter.record(usage, share=1 / len(batch))
+            room = rooms[k] if k < len(rooms) and isinstance(rooms[k], list) else []
+            future.set_result(extract_scores(json.dumps(room), len(answers)))
+
+
+_rank_batcher = None
+_rank_batcher_lock = threading.Lock()
+
+
+def get_rank_batcher():
+    """
+    Return the RankBatcher shared by every game in the process.
+    """
+    global _rank_batcher
+    if _rank_batcher is None:
+        with _rank_batcher_lock:
+            if _rank_batcher is None:
+                _rank_batcher = RankBatcher(window=config.RANK_BATCH_WINDOW)
+    return _rank_batcher
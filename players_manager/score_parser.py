@@ -0,0 +1,91 @@
+import ast
+import json
+import re
+
+_FENCE = re.compile(r"```(?:\w+)?\s*(.*?)```", re.S)
+_BRACKETS = re.compile(r"\[[^\[\]]*\]|\{.*\}", re.S)
+# A dot only separates an index from its score when no digit follows it, so
+# decimals like "85.5" are not read as answer 85 scoring 5.
+_ENUMERATED = re.compile(
+    r"(?:đáp án|câu trả lời|answer)?\s*#?(\d+)\s*(?:[:)\-–]|\.(?!\d))\s*(-?\d+(?:[.,]\d+)?)", re.I
+)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_OUT_OF_100 = re.compile(r"\s*/\s*100\b")  # "80/100" is a score of 80
+
+
+def _to_score(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip().rstrip("%").replace(",", ".")
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not 0 <= score <= 100:
+        return None
+    return int(score) if score.is_integer() else score
+
+
+def _from_structure(value):
+    if isinstance(value, dict):
+        for key in ("scores", "score", "ranks", "ranking"):
+            if key in value:
+                return _from_structure(value[key])
+        if all(str(key).strip().isdigit() for key in value):
+            return {int(key) - 1: _to_score(score) for key, score in value.items()}
+        return _from_structure(list(value.values()))
+    if isinstance(value, (list, tuple)):
+        return {i: _to_score(score) for i, score in enumerate(value)}
+    return None
+
+
+def _parse_structure(text):
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            parsed = _from_structure(parse(text))
+        except Exception:
+            continue
+        if parsed:
+            return parsed
+    return None
+
+
+def extract_scores(text, expected):
+    """
+    Extract the scores from a messy model output.
+
+    Handles JSON objects and lists, Python lists, code fences, enumerated
+    prose ("Đáp án 2: 75") and bare numbers, also written as "75/100".
+
+    Args:
+        text (str): The raw model output.
+        expected (int): The number of answers that were scored.
+
+    Returns:
+        list: `expected` scores, with None for every score that is missing or
+            not within 0-100. All scores are None when the output holds more
+            scores than expected.
+    """
+    text = text or ""
+    fenced = _FENCE.findall(text)
+    candidates = fenced + [text] + _BRACKETS.findall(text)
+
+    scores = None
+    for candidate in candidates:
+        scores = _parse_structure(candidate.strip())
+        if scores:
+            break
+
+    if not scores:
+        text = _OUT_OF_100.sub("", text)
+        enumerated = _ENUMERATED.findall(text)
+        if enumerated:
+            scores = {int(idx) - 1: _to_score(score) for idx, score in enumerated}
+        else:
+            scores = {i: _to_score(score) for i, score in enumerate(_NUMBER.findall(text))}
+
+    if any(i >= expected for i in scores):
+        # More scores than answers, there is no telling which one is extra.
+        return [None] * expected
+    return [scores.get(i) for i in range(expected)]
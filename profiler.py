@@ -0,0 +1,233 @@
+import cProfile
+import os
+import pstats
+import random
+import threading
+from collections import Counter, defaultdict
+from functools import wraps
+
+try:
+    import greenlet
+except ImportError:  # Only installed with gevent
+    greenlet = None
+
+_CWD = os.getcwd()
+
+
+def _frame(func):
+    filename, line, name = func
+    if filename == "~":
+        return name.replace(";", ":")  # Built-in, e.g. <built-in method time.sleep>
+    if filename.startswith(_CWD):
+        filename = os.path.relpath(filename, _CWD)
+    else:
+        filename = os.path.basename(filename)
+    return f"{name} ({filename}:{line})".replace(";", ":")
+
+
+def folded_stacks(profile, min_seconds=1e-6):
+    """
+    Turn a cProfile profile into folded stacks, `frame;frame;frame` -> seconds.
+
+    cProfile only records caller/callee pairs, so the time of a function
+    called from several places is split between its callers in proportion to
+    the time each spent in it, the way flame graphs from cProfile data are
+    usually drawn. Recursive calls are folded into the outermost frame.
+    """
+    stats = pstats.Stats(profile).stats  # func -> (cc, nc, tt, ct, callers)
+    children = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children[caller][func] = edge[3]
+
+    stacks = Counter()
+
+    def walk(func, path, seen, seconds):
+        _, _, own, total, _ = stats[func]
+        share = seconds / total if total else 0
+        path = path + (_frame(func),)
+        if own * share >= min_seconds:
+            stacks[";".join(path)] += own * share
+        for child, through in children.get(func, {}).items():
+            if child not in seen and through * share >= min_seconds:
+                walk(child, path, seen | {child}, through * share)
+
+    for func, (_, _, _, total, callers) in stats.items():
+        if not callers:
+            walk(func, (), {func}, total)
+    return stacks
+
+
+class _GreenletSwitches:
+    """
+    Pause the profile of a greenlet while other greenlets run.
+
+    cProfile profiles a whole OS thread, and under gevent every request of a
+    worker runs on the same one. Each profiled greenlet gets its own profile,
+    disabled when the greenlet switches out and enabled again when it
+    switches back in, so the work of other requests is left out. The switch
+    hook is only installed on a thread while one of its greenlets is profiled.
+    """
+
+    def __init__(self):
+        self._profiles = {}  # greenlet -> cProfile.Profile
+        self._hooks = {}  # root greenlet of a thread -> [profiled greenlets, previous hook]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _root(current):
+        # The root greenlet stands for its OS thread, thread ids are per
+        # greenlet once gevent has patched the threading module.
+        while current.parent is not None:
+            current = current.parent
+        return current
+
+    def add(self, profile):
+        """
+        Follow the current greenlet with `profile`.
+
+        Returns:
+            bool: False if the greenlet is already profiled.
+        """
+        current = greenlet.getcurrent()
+        root = self._root(current)
+        with self._lock:
+            if current in self._profiles:
+                return False
+            self._profiles[current] = profile
+            hook = self._hooks.get(root)
+            if hook is None:
+                hook = self._hooks[root] = [0, greenlet.settrace(self._switch)]
+            hook[0] += 1
+        return True
+
+    def remove(self):
+        current = greenlet.getcurrent()
+        root = self._root(current)
+        with self._lock:
+            self._profiles.pop(current, None)
+            hook = self._hooks[root]
+            hook[0] -= 1
+            if not hook[0]:
+                del self._hooks[root]
+                greenlet.settrace(hook[1])
+
+    def _switch(self, event, args):
+        # Runs on every switch of the thread, so it takes no lock.
+        if event in ("switch", "throw"):
+            origin, target = args
+            profile = self._profiles.get(origin)
+            if profile is not None:
+                profile.disable()
+            profile = self._profiles.get(target)
+            if profile is not None:
+                try:
+                    profile.enable()
+                except ValueError:
+                    pass  # Another thread holds the only profiler, see RequestProfiler
+        hook = self._hooks.get(self._root(args[1]))
+        if hook is not None and hook[1] is not None:
+            hook[1](event, args)
+
+
+class RequestProfiler:
+    def __init__(self, sample_rate=0.0):
+        """
+        Profile single requests with cProfile and add up their stacks per
+        endpoint, ready to be drawn as flame graphs.
+
+        Only the requests chosen by the caller are profiled, the others run
+        untouched. Stacks are kept per process.
+
+        With greenlets (the gevent worker) a profile only covers the greenlet
+        of its request. Without them cProfile covers the OS thread of the
+        request, which is exact with the sync and gthread workers on Python
+        3.11 and older. From Python 3.12 cProfile is built on sys.monitoring,
+        which allows one profiler at a time and sees every thread of the
+        process: concurrent threads mix into the stacks of a profiled
+        request, and requests profiled at the same time on other threads run
+        unprofiled.
+
+        Args:
+            sample_rate: Fraction of requests profiled without being asked.
+        """
+        self.sample_rate = sample_rate
+        self.requests = Counter()  # endpoint -> requests profiled
+        self._stacks = defaultdict(Counter)  # endpoint -> folded stack -> seconds
+        self._lock = threading.Lock()
+        self._switches = _GreenletSwitches() if greenlet is not None else None
+
+    def sampled(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def run(self, endpoint, func, *args, **kwargs):
+        """
+        Call `func` under cProfile and add its stacks to `endpoint`.
+        """
+        profile = cProfile.Profile()
+        if self._switches is not None and not self._switches.add(profile):
+            return func(*args, **kwargs)  # Already inside a profiled call
+        try:
+            profile.enable()
+        except ValueError:
+            # Newer Pythons allow one profiler at a time, this call goes unprofiled.
+            if self._switches is not None:
+                self._switches.remove()
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            if self._switches is not None:
+                self._switches.remove()
+            stacks = folded_stacks(profile)
+            with self._lock:
+                self.requests[endpoint] += 1
+                self._stacks[endpoint].update(stacks)
+
+    def wrap(self, endpoint, func):
+        """
+        Return `func` profiled under `endpoint` whenever it is called, e.g.
+        for the background job of a profiled request.
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(endpoint, func, *args, **kwargs)
+        return wrapper
+
+    def summary(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": self.requests[endpoint],
+                    "stacks": len(stacks),
+                    "seconds": round(sum(stacks.values()), 6),
+                }
+                for endpoint, stacks in sorted(self._stacks.items())
+            }
+
+    def render(self, endpoint=None):
+        """
+        Render the stacks in the folded format of flamegraph.pl and speedscope,
+        in microseconds. Without `endpoint` every endpoint is rendered, under
+        a root frame named after it.
+        """
+        with self._lock:
+            if endpoint is not None:
+                stacks = Counter(self._stacks.get(endpoint, {}))
+            else:
+                stacks = Counter({
+                    f"{name};{stack}": seconds
+                    for name, endpoint_stacks in self._stacks.items()
+                    for stack, seconds in endpoint_stacks.items()
+                })
+        return "".join(
+            f"{stack} {round(seconds * 1e6)}\n"
+            for stack, seconds in sorted(stacks.items())
+            if round(seconds * 1e6)
+        )
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self._stacks.clear()
@@ -0,0 +1,85 @@
+"""
+Play simulated games against the app with a fake LLM backend and report
+endpoint latencies and throughput.
+
+    python -m simulation --games 50 --concurrency 16 --latency 0.3 --failure-rate 0.02
+
+With `--url` the games are played against a running server instead, see
+simulation/fake_server.py for pointing it at a fake LLM.
+"""
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of the game server.")
+    parser.add_argument("--games", type=int, default=20, help="Number of games to play.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Games played at once.")
+    parser.add_argument("--humans", type=int, default=2, help="Human players per game.")
+    parser.add_argument("--ai-players", type=int, default=3, help="AI players per game.")
+    parser.add_argument("--turns", type=int, default=3, help="Maximum turns per game.")
+    parser.add_argument("--skip-rate", type=float, default=0.1,
+                        help="Probability a human player does not answer a turn.")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Seconds human players take to answer a question.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean LLM latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Relative spread of the LLM latency.")
+    parser.add_argument("--latency-per-token", type=float, default=0.0,
+                        help="Extra LLM latency per prompt token, in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Probability an LLM call fails with a 429 or 5xx.")
+    parser.add_argument("--messiness", type=float, default=0.0,
+                        help="Probability an LLM output is malformed.")
+    parser.add_argument("--game-options", type=json.loads, default={},
+                        help='Extra /create_game fields as JSON, e.g. \'{"ai_answer_mode": "batched"}\'.')
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable runs.")
+    parser.add_argument("--url", default=None,
+                        help="Base URL of a running server to play against, instead of the app in process.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    from simulation.harness import HttpClient, format_report, run_load
+
+    if args.url:
+        client = None
+        make_client = lambda: HttpClient(args.url)
+    else:
+        from simulation.fake_llm import install_fake_llm
+
+        client = install_fake_llm(
+            latency=args.latency,
+            jitter=args.jitter,
+            latency_per_token=args.latency_per_token,
+            failure_rate=args.failure_rate,
+            messiness=args.messiness,
+            seed=args.seed,
+        )
+        # Imported once the fake backend is in place.
+        from app import app
+
+        make_client = app.test_client
+
+    report = run_load(
+        make_client,
+        games=args.games,
+        concurrency=args.concurrency,
+        humans=args.humans,
+        ai_players=args.ai_players,
+        turns=args.turns,
+        skip_rate=args.skip_rate,
+        think_time=args.think_time,
+        game_options=args.game_options,
+        seed=args.seed,
+    )
+    if client is not None:
+        completions = client.completions
+        report["llm"] = {
+            "calls": completions.calls,
+            "failures": completions.failures,
+            "messy": completions.messy,
+        }
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+TOPICS = [
+    "bữa sáng", "cuối tuần", "trường học", "bạn thân", "kỳ nghỉ hè", "thú cưng",
+    "món ăn", "âm nhạc", "thể thao", "điện thoại", "giấc ngủ", "mưa", "Tết",
+    "bài kiểm tra", "phim", "quà sinh nhật", "xe buýt", "trà sữa", "sách", "gia đình",
+]
+TEMPLATES = [
+    "Bạn thường làm gì với {topic} của mình?",
+    "Kỷ niệm đáng nhớ nhất của bạn về {topic} là gì?",
+    "Nếu phải bỏ {topic} một tuần, bạn sẽ thấy thế nào?",
+    "Điều gì khiến bạn khó chịu nhất về {topic}?",
+    "Bạn sẽ giới thiệu {topic} với người nước ngoài ra sao?",
+    "Lần gần nhất bạn nghĩ về {topic} là khi nào?",
+]
+ANSWERS = [
+    "tôi cũng không nhớ rõ lắm",
+    "tôi thích ngủ nướng hơn",
+    "chắc là đi chơi với bạn bè",
+    "tôi thấy bình thường thôi",
+    "tôi hay ăn phở với mẹ",
+    "tôi nghĩ là khá vui",
+    "tôi không quan tâm lắm đến chuyện đó",
+]
+
+
+def count_tokens(text):
+    """
+    Rough token count of a text, about three characters per token.
+    """
+    return len(text or "") // 3 + 1
+
+
+class FakeAPIError(Exception):
+    """
+    Transient error shaped like a Groq API error, retried by the scheduler.
+    """
+
+    def __init__(self, status_code):
+        super().__init__(f"Fake API error {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+
+class FakeCompletions:
+    def __init__(self, latency=0.2, jitter=0.5, failure_rate=0.0, messiness=0.0, seed=None,
+                 latency_per_token=0.0):
+        """
+        Stand-in for `client.chat.completions` answering the prompts of the game.
+
+        The reply is chosen from the system prompt: questions for the admin,
+        scores for ranking, rooms for batched ranking, answers for AI players.
+
+        Args:
+            latency: Mean seconds a completion takes.
+            jitter: Relative spread of the latency, 0.5 gives +-50%.
+            failure_rate: Probability a call fails with a 429 or 5xx error.
+            messiness: Probability an output is malformed the way real model
+                outputs are, e.g. prose around the JSON or missing scores.
+            seed: Seed of the random generator, for repeatable runs.
+            latency_per_token: Extra seconds per prompt token, so long
+                prompts are slower like on a real model.
+
+        Outputs are cut at the `max_tokens` of the request, and calls slower
+        than the `timeout` of the request time out.
+        """
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.messiness = messiness
+        self.calls = 0
+        self.failures = 0
+        self.messy = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self, messages):
+        """
+        Return the latency of the next call, whether it fails and whether its
+        output is messy.
+        """
+        prompt_tokens = sum(count_tokens(m.get("content")) for m in messages)
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay += self.latency_per_token * prompt_tokens
+            failed = self._random.random() < self.failure_rate
+            messy = not failed and self._random.random() < self.messiness
+            if failed:
+                self.failures += 1
+            if messy:
+                self.messy += 1
+            return max(0, delay), failed, messy, self._random.random()
+
+    def create(self, messages, stream=False, max_tokens=None, timeout=None, **kwargs):
+        delay, failed, messy, roll = self._draw(messages)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake API request timed out.")
+        time.sleep(delay)
+        return self._complete(messages, stream, failed, messy, roll, max_tokens)
+
+    def reply(self, messages, messy, roll, max_tokens=None):
+        """
+        Return the output text for `messages`, cut at `max_tokens`.
+        """
+        content = self._reply(messages, messy, roll)
+        if max_tokens and count_tokens(content) > max_tokens:
+            content = content[:max_tokens * 3]
+        return content
+
+    def _complete(self, messages, stream, failed, messy, roll, max_tokens=None):
+        if failed:
+            raise FakeAPIError(429 if roll < 0.7 else 503)
+        content = self.reply(messages, messy, roll, max_tokens)
+        usage = SimpleNamespace(
+            prompt_tokens=sum(count_tokens(m.get("content")) for m in messages),
+            completion_tokens=count_tokens(content),
+        )
+        if stream:
+            return self._chunks(content)
+        message = SimpleNamespace(content=content, tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    @staticmethod
+    def _chunks(content):
+        for i in range(0, len(content), 8):
+            delta = SimpleNamespace(content=content[i:i + 8])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    def _reply(self, messages, messy, roll):
+        system = messages[0]["content"] if messages[0]["role"] == "system" else ""
+        prompt = messages[-1]["content"] or ""
+        with self._lock:
+            pick = self._random.random
+
+            if '"rooms"' in system:
+                rooms = [
+                    [int(pick() * 100) for _ in re.findall(r"Đáp án \d+", room)]
+                    for room in prompt.split("Phòng ")[1:]
+                ]
+                if messy and rooms:
+                    rooms.pop()
+                return json.dumps({"rooms": rooms})
+
+            if '"scores"' in system:
+                scores = [int(pick() * 100) for _ in re.findall(r"Đáp án \d+", prompt)]
+                if not messy:
+                    return json.dumps({"scores": scores})
+                if roll < 0.25:
+                    return f"Đây là kết quả đánh giá:\n```json\n{json.dumps({'scores': scores})}\n```"
+                if roll < 0.5:
+                    return "\n".join(f"Đáp án {i + 1}: {s}%" for i, s in enumerate(scores))
+                if roll < 0.75:
+                    return json.dumps({"scores": scores[:-1]})
+                return "Tôi không thể đánh giá các câu trả lời này."
+
+            if '"answers"' in system:
+                answers = [
+                    ANSWERS[int(pick() * len(ANSWERS))]
+                    for _ in re.findall(r"Người chơi \d+", prompt)
+                ]
+                if messy and answers:
+                    answers.pop()
+                return json.dumps({"answers": answers}, ensure_ascii=False)
+
+            if "quản trò" in system:
+                question = TEMPLATES[int(pick() * len(TEMPLATES))].format(
+                    topic=TOPICS[int(pick() * len(TOPICS))]
+                )
+                return f'Câu hỏi: "{question}"' if messy else question
+
+            answer = ANSWERS[int(pick() * len(ANSWERS))]
+            return f'  "{answer}"\n' if messy else answer
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, messages, stream=False, max_tokens=None, timeout=None, **kwargs):
+        delay, failed, messy, roll = self._draw(messages)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise TimeoutError("Fake API request timed out.")
+        await asyncio.sleep(delay)
+        completion = self._complete(messages, stream, failed, messy, roll, max_tokens)
+        if stream:
+            return self._async_chunks(completion)
+        return completion
+
+    @staticmethod
+    async def _async_chunks(chunks):
+        for chunk in chunks:
+            yield chunk
+
+
+class FakeLLM:
+    def __init__(self, completions):
+        """
+        Client with the `chat.completions.create` interface of `groq.Groq`.
+        """
+        self.chat = SimpleNamespace(completions=completions)
+
+    @property
+    def completions(self):
+        return self.chat.completions
+
+
+def install_fake_llm(**kwargs):
+    """
+    Replace the shared Groq clients with fake ones, so the app runs offline.
+
+    Takes the arguments of FakeCompletions.
+
+    Returns:
+        FakeLLM: The sync client, its `completions` hold the call counters.
+    """
+    from models.clients import set_client
+
+    client = FakeLLM(FakeCompletions(**kwargs))
+    set_client(client, FakeLLM(FakeAsyncCompletions(**kwargs)))
+    return client
@@ -0,0 +1,140 @@
+"""
+OpenAI-compatible HTTP server answering like the fake LLM backend, so the app
+can be load tested in its real serving setup:
+
+    python -m simulation.fake_server --port 8400 --latency 0.3
+    GROQ_BASE_URL=http://127.0.0.1:8400 gunicorn -c gunicorn.conf.py app:app
+    python -m simulation --url http://127.0.0.1:5000 --games 50 --concurrency 50
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from simulation.fake_llm import FakeCompletions, count_tokens
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once, the default backlog of 5
+    # makes the extra ones wait for a SYN retry.
+    request_queue_size = 1024
+
+
+def make_handler(completions, chunk_delay=0.0):
+    """
+    Build the request handler of a server answering with `completions`.
+
+    Args:
+        completions: The FakeCompletions drawing latencies and outputs.
+        chunk_delay: Seconds between streamed chunks of 8 characters, the
+            time the model takes to generate them. Non-streamed replies take
+            as long in total.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            if not self.path.endswith("/chat/completions"):
+                return self._send(404, {"error": {"message": "Not found."}})
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            messages = request["messages"]
+            delay, failed, messy, roll = completions._draw(messages)
+            time.sleep(delay)
+            if failed:
+                status = 429 if roll < 0.7 else 503
+                return self._send(status, {"error": {"message": f"Fake API error {status}"}})
+
+            content = completions.reply(messages, messy, roll, request.get("max_tokens"))
+            if request.get("stream"):
+                return self._stream(request["model"], content)
+            time.sleep(chunk_delay * max(0, -(-len(content) // 8) - 1))
+            prompt_tokens = sum(count_tokens(m.get("content")) for m in messages)
+            completion_tokens = count_tokens(content)
+            self._send(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+        def _send(self, status, body):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, model, content):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            for i in range(0, len(content), 8):
+                if i:
+                    time.sleep(chunk_delay)
+                chunk = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[i:i + 8]}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8400)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean LLM latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Relative spread of the LLM latency.")
+    parser.add_argument("--latency-per-token", type=float, default=0.0,
+                        help="Extra LLM latency per prompt token, in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Probability a call fails with a 429 or 5xx.")
+    parser.add_argument("--messiness", type=float, default=0.0,
+                        help="Probability an output is malformed.")
+    parser.add_argument("--chunk-delay", type=float, default=0.0,
+                        help="Seconds between streamed chunks of 8 characters.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    completions = FakeCompletions(
+        latency=args.latency,
+        jitter=args.jitter,
+        latency_per_token=args.latency_per_token,
+        failure_rate=args.failure_rate,
+        messiness=args.messiness,
+        seed=args.seed,
+    )
+    server = FakeServer((args.host, args.port), make_handler(completions, args.chunk_delay))
+    print(f"Fake LLM server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"{completions.calls} calls, {completions.failures} failed, {completions.messy} messy")
+
+
+if __name__ == "__main__":
+    main()
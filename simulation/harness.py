@@ -0,0 +1,272 @@
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from simulation.fake_llm import ANSWERS
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of a list of numbers, None when it is empty.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+class LatencyRecorder:
+    def __init__(self):
+        """
+        Collect the latency and status of every request, per endpoint.
+        """
+        self.latencies = defaultdict(list)  # endpoint -> seconds
+        self.errors = defaultdict(int)  # endpoint -> responses with status >= 500
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            if status >= 500:
+                self.errors[endpoint] += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    "count": len(values),
+                    "errors": self.errors[endpoint],
+                    "p50_ms": round(percentile(values, 50) * 1000, 2),
+                    "p95_ms": round(percentile(values, 95) * 1000, 2),
+                    "p99_ms": round(percentile(values, 99) * 1000, 2),
+                }
+                for endpoint, values in sorted(self.latencies.items())
+            }
+
+
+class HttpClient:
+    def __init__(self, base_url, timeout=300):
+        """
+        Client with the `get`/`post` interface of the Flask test client, for
+        driving a server running in another process.
+        """
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, endpoint, query_string=None):
+        return HttpResponse(
+            self.session.get(self.base_url + endpoint, params=query_string, timeout=self.timeout)
+        )
+
+    def post(self, endpoint, json=None, headers=None):
+        return HttpResponse(
+            self.session.post(
+                self.base_url + endpoint, json=json, headers=headers, timeout=self.timeout
+            )
+        )
+
+
+class HttpResponse:
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+
+    def get_json(self):
+        return self.response.json() if self.response.content else None
+
+
+class GameSimulator:
+    def __init__(self, client, recorder, humans=2, ai_players=3, turns=3, skip_rate=0.1,
+                 think_time=0.0, game_options=None, seed=None):
+        """
+        Play one complete game through the HTTP API, like a front end would.
+
+        Human players answer with canned sentences and sometimes skip a turn,
+        which gets them eliminated at ranking. After every ranking the active
+        player with the lowest AI score is voted out.
+
+        Args:
+            client: A Flask test client, or anything with `get` and `post`.
+            recorder: LatencyRecorder the requests are timed into.
+            humans: Number of human players.
+            ai_players: Number of AI players.
+            turns: Maximum number of turns.
+            skip_rate: Probability a human player does not answer a turn.
+            think_time: Seconds human players take to answer a question.
+            game_options: Extra fields sent to /create_game.
+            seed: Seed of the random generator.
+        """
+        self.client = client
+        self.recorder = recorder
+        self.humans = humans
+        self.ai_players = ai_players
+        self.turns = turns
+        self.skip_rate = skip_rate
+        self.think_time = think_time
+        self.game_options = game_options or {}
+        self.random = random.Random(seed)
+        self.game_id = None
+        self.saved_times = []  # Seconds saved by speculative AI answers, per turn
+
+    def request(self, method, endpoint, headers=None, label=None, **payload):
+        if self.game_id:
+            payload["game_id"] = self.game_id
+        started = time.perf_counter()
+        if method == "GET":
+            response = self.client.get(endpoint, query_string=payload)
+        else:
+            response = self.client.post(endpoint, json=payload, headers=headers)
+        self.recorder.record(label or endpoint, time.perf_counter() - started, response.status_code)
+        return response
+
+    def run_job(self, endpoint, wait=10):
+        """
+        Start a background job and poll it until it finishes.
+
+        The time until the job is finished is recorded as `<endpoint> (job)`.
+
+        Returns:
+            dict: The finished job, None if it could not be started.
+        """
+        started = time.perf_counter()
+        response = self.request("POST", endpoint, headers={"Idempotency-Key": str(uuid.uuid4())})
+        if response.status_code != 202:
+            return None
+        job = response.get_json()
+        while job["status"] not in ("done", "failed"):
+            job = self.request(
+                "GET", f"/jobs/{job['job_id']}", label="/jobs/<id>", wait=wait
+            ).get_json()
+        self.recorder.record(f"{endpoint} (job)", time.perf_counter() - started, 200)
+        return job
+
+    def play(self):
+        """
+        Returns:
+            int: Number of turns played.
+        """
+        self.game_id = self.request("POST", "/create_game", **self.game_options).get_json()["game_id"]
+        human_ids = [
+            self.request("POST", "/add_player", player_name=f"human-{i}").get_json()["player_id"]
+            for i in range(self.humans)
+        ]
+        for i in range(self.ai_players):
+            self.request("POST", "/add_player", player_name=f"ai-{i}", is_ai=True)
+        self.request("POST", "/start_game")
+
+        turns = 0
+        for _ in range(self.turns):
+            job = self.run_job("/next_turn")
+            if job is None or job["status"] != "done":
+                break
+            turns += 1
+            active = set(self.request("GET", "/active_players").get_json()["active_player_ids"])
+            time.sleep(self.think_time)
+            for player_id in human_ids:
+                if player_id in active and self.random.random() >= self.skip_rate:
+                    self.request(
+                        "POST", "/submit_answer",
+                        player_id=player_id, answer=self.random.choice(ANSWERS),
+                    )
+            self.run_job("/play_turn_ai")
+            ranking = (self.run_job("/rank_answers") or {}).get("result") or {}
+            state = self.request("GET", "/game_state").get_json() or {}
+            answers_report = state.get("turn_report", {}).get("answers", {})
+            if "saved_time" in answers_report:
+                self.saved_times.append(answers_report["saved_time"])
+
+            scores = [s for s in ranking.get("scores", []) if s["player_id"] in active]
+            if scores:
+                lowest = min(scores, key=lambda s: s["rank"])
+                self.request("POST", "/eliminate_player", player_id=lowest["player_id"])
+            remaining = self.request("GET", "/active_players").get_json()["active_count"]
+            if remaining < 2:
+                break
+
+        self.request("POST", "/end_game")
+        return turns
+
+
+def run_load(make_client, games=20, concurrency=8, humans=2, ai_players=3, turns=3, skip_rate=0.1,
+             think_time=0.0, game_options=None, seed=None):
+    """
+    Play `games` games, `concurrency` of them at once.
+
+    Args:
+        make_client: Callable returning a new client for each game, e.g.
+            `app.test_client` or `lambda: HttpClient(url)`.
+
+    Returns:
+        dict: Endpoint latency percentiles, error counts and throughput.
+    """
+    recorder = LatencyRecorder()
+    turns_played = []
+    saved_times = []
+
+    def play(k):
+        simulator = GameSimulator(
+            make_client(),
+            recorder,
+            humans=humans,
+            ai_players=ai_players,
+            turns=turns,
+            skip_rate=skip_rate,
+            think_time=think_time,
+            game_options=game_options,
+            seed=None if seed is None else seed + k,
+        )
+        turns_played.append(simulator.play())
+        saved_times.extend(simulator.saved_times)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(play, k) for k in range(games)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    endpoints = recorder.summary()
+    requests = sum(e["count"] for e in endpoints.values())
+    report = {
+        "games": games,
+        "turns": sum(turns_played),
+        "requests": requests,
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 2),
+        "turns_per_second": round(sum(turns_played) / elapsed, 2),
+        "endpoints": endpoints,
+    }
+    if saved_times:
+        report["speculation_saved_seconds"] = round(sum(saved_times) / len(saved_times), 3)
+    return report
+
+
+def format_report(report):
+    lines = [
+        f"{report['games']} games, {report['turns']} turns, {report['requests']} requests "
+        f"({report['errors']} errors) in {report['seconds']}s",
+        f"{report['requests_per_second']} requests/s, {report['turns_per_second']} turns/s",
+        "",
+        f"{'endpoint':<20}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for endpoint, e in report["endpoints"].items():
+        lines.append(
+            f"{endpoint:<20}{e['count']:>8}{e['errors']:>8}"
+            f"{e['p50_ms']:>10}{e['p95_ms']:>10}{e['p99_ms']:>10}"
+        )
+    if "speculation_saved_seconds" in report:
+        lines.append("")
+        lines.append(
+            f"Speculative AI answers saved {report['speculation_saved_seconds']}s per turn"
+        )
+    if "llm" in report:
+        llm = report["llm"]
+        lines.append("")
+        lines.append(f"LLM calls: {llm['calls']} ({llm['failures']} failed, {llm['messy']} messy)")
+    return "\n".join(lines)